@@ -36,11 +36,39 @@ from database import (
     update_match_type_in_series,
     update_fixture,
     update_player,
+    update_match_type_status,
     refresh_series_stats,
     refresh_matchtype_stats,
+    refresh_all_active_matchtype_stats,
     update_remaining_fixtures_by_series,
     generate_fixture_entries,
+    circle_method_rounds,
+    setup_series_leagues,
+    show_query_diagnostics,
+    update_match_result,
+    apply_walkover_to_standings,
+    sync_player_match_facts,
+    sync_completed_matches,
+    sync_remaining_fixtures,
+    delete_match_result,
+    update_completed_match_cache,
+    bump_data_version,
+    get_series_choices,
+    get_match_type_choices,
+    get_failed_ingestions,
+    dismiss_failed_ingestions,
+    enqueue_refresh,
+    get_refresh_queue,
+    process_refresh_queue,
+    get_current_series,
+    get_series_page,
+    update_series_page,
+    update_series_tabs,
+    SERIES_LAYOUT_LEAGUES,
+    SERIES_LAYOUT_SORTING,
 )
+from mail_ingest import replay_failed_ingestions
+from result_parser import clean_subject
 
 # Add a header image at the top of the page
 st.image("https://www.sabga.co.za/wp-content/uploads/2020/06/cropped-coverphoto.jpg", width='stretch')
@@ -92,63 +120,144 @@ def generate_fixtures_ui():
         key="fixture_match_type"
     )
 
-    # Player selections
-    selected_players = []
-    max_players = 12
-
-    for i in range(1, max_players + 1):
-        player = st.selectbox(
-            f"Select Player {i}",
-            options=[None] + players,
-            format_func=lambda x: x[1] if x else "None",
-            key=f"fixture_player_{i}"
-        )
-        if player:
-            selected_players.append(player[0])  # Append PlayerID
+    # Player selection (any group size)
+    selected = st.multiselect(
+        "Select Players",
+        options=players,
+        format_func=lambda x: f"{x[1]} ({x[2]})",
+        key="fixture_players"
+    )
+    selected_players = [player[0] for player in selected]  # PlayerIDs
 
     # Validation
     if len(selected_players) < 3:
         st.warning("Please select at least 3 players to generate fixtures.")
         return
 
+    rounds = circle_method_rounds(selected_players)
+    st.caption(f"{sum(len(r) for r in rounds)} fixtures over {len(rounds)} rounds.")
+
     # Generate Fixtures Button
     if st.button("Generate Fixtures"):
         generate_fixture_entries(match_type_id, selected_players)
         st.success("Fixtures generated successfully!")
 
         # Cleanly clear related session state and rerun
-        keys_to_clear = [key for key in st.session_state.keys() if key.startswith("fixture_match_type") or key.startswith("fixture_player_")]
+        keys_to_clear = [key for key in st.session_state.keys() if key.startswith("fixture_match_type") or key.startswith("fixture_players")]
         for key in keys_to_clear:
             st.session_state.pop(key, None)
 
-        st.experimental_rerun()
+        st.rerun()
+
+ALLOCATION_COLUMNS = ["League", "Identifier", "Player"]
+
+def read_league_allocation(allocation_df, players):
+    """
+    Group an allocation table (one row per player: League, Identifier, Player nickname or name)
+    into [(League, Identifier, [PlayerID, ...]), ...] in table order.
+    Returns (leagues, problems).
+    """
+    by_key = {}
+    for p_id, name, nickname in players:
+        by_key.setdefault(str(nickname).strip().lower(), p_id)
+        by_key.setdefault(str(name).strip().lower(), p_id)
+
+    leagues = {}
+    problems = []
+    for row_number, row in enumerate(allocation_df.itertuples(index=False), start=1):
+        league, identifier, player = (str(v).strip() if pd.notna(v) else "" for v in row[:3])
+        if not (league or identifier or player):
+            continue
+        if not (league and identifier and player):
+            problems.append(f"Row {row_number}: League, Identifier and Player are all required.")
+            continue
+        player_id = by_key.get(player.lower())
+        if player_id is None:
+            problems.append(f"Row {row_number}: no player with nickname or name '{player}'.")
+            continue
+        leagues.setdefault((league, identifier), []).append(player_id)
+    return [(league, identifier, ids) for (league, identifier), ids in leagues.items()], problems
+
+def setup_series_ui():
+    """
+    Admin UI to set up a whole series from a league allocation table:
+    creates the leagues, links them to the series and generates every fixture in one go.
+    """
+    st.subheader("Set Up Series from Allocation")
+    st.write("One row per player: the league title, its email identifier (the +identifier@ part) and the "
+             "player's nickname or name. Upload a CSV with these columns or edit the table directly.")
+
+    uploaded = st.file_uploader("Allocation CSV", type="csv", key="allocation_csv")
+    allocation_df = pd.read_csv(uploaded) if uploaded else pd.DataFrame(columns=ALLOCATION_COLUMNS)
+    missing = [c for c in ALLOCATION_COLUMNS if c not in allocation_df.columns]
+    if missing:
+        st.error(f"The CSV is missing the column(s): {', '.join(missing)}")
+        return
+    allocation_df = st.data_editor(allocation_df[ALLOCATION_COLUMNS], num_rows="dynamic", key="allocation_table")
+
+    series_rows = get_series_choices()
+    series_options = [None] + [sid for sid, _ in series_rows]
+    series_titles = dict(series_rows)
+    series_id = st.selectbox("Series", series_options,
+                             format_func=lambda sid: "➕ New series" if sid is None else series_titles[sid],
+                             key="allocation_series")
+    series_title = st.text_input("New series title", key="allocation_series_title") if series_id is None else None
+    start_date = st.date_input("League start date", value=datetime.date.today(), key="allocation_start_date")
+    end_date = st.date_input("Series end date (deadline)", value=None, key="allocation_end_date") if series_id is None else None
+
+    leagues, problems = read_league_allocation(allocation_df, get_players_simple())
+    for problem in problems:
+        st.warning(problem)
+    if not leagues:
+        return
+
+    summary = []
+    for league, identifier, player_ids in leagues:
+        rounds = circle_method_rounds(player_ids)
+        summary.append({"League": league, "Identifier": identifier, "Players": len(player_ids),
+                        "Fixtures": sum(len(r) for r in rounds), "Rounds": len(rounds)})
+    st.dataframe(pd.DataFrame(summary), hide_index=True)
+
+    if st.button("Create Leagues and Fixtures", disabled=bool(problems) or (series_id is None and not series_title)):
+        try:
+            series_id, match_type_ids = setup_series_leagues(
+                leagues, series_id=series_id, series_title=series_title, start_date=start_date, end_date=end_date
+            )
+            st.success(f"Created {len(match_type_ids)} leagues and "
+                       f"{sum(row['Fixtures'] for row in summary)} fixtures in SeriesID {series_id}.")
+        except ValueError as e:
+            st.error(str(e))
+        except Exception as e:
+            st.error(f"Error setting up the series (nothing was written): {e}")
 
 if 'form_updated' in st.session_state and st.session_state['form_updated']:
     del st.session_state['form_updated']
     st.rerun()
 
-current_series_id = 10
+# The newest series on the public pages, from the series registry
+current_series = get_current_series()
 non_league_id = 65  # 2025NonLeague
-matches_played = get_matchcount_by_series(current_series_id)
-total_fixtures = get_fixturescount_by_series(current_series_id)
-percentage = (matches_played / total_fixtures) * 100
-metric_value = f"{matches_played}/{total_fixtures} ({percentage:.1f}%)"
-
-st.sidebar.header("Current series: RR S1 2026 (id=10)")
-#st.sidebar.metric("Series data - players","80","1")
-st.sidebar.metric("Series data - matches",metric_value, "6")
+if current_series is None:
+    st.sidebar.warning("No series set up yet.")
+else:
+    if not current_series.listed:
+        st.sidebar.warning("No series is listed on the public pages; showing the newest series.")
+    current_series_id = current_series.series_id
+    matches_played = get_matchcount_by_series(current_series_id)
+    total_fixtures = get_fixturescount_by_series(current_series_id)
+    percentage = (matches_played / total_fixtures) * 100 if total_fixtures else 0
+    metric_value = f"{matches_played}/{total_fixtures} ({percentage:.1f}%)"
+
+    st.sidebar.header(f"Current series: {current_series.label} (id={current_series_id})")
+    #st.sidebar.metric("Series data - players","80","1")
+    st.sidebar.metric("Series data - matches",metric_value, "6")
 st.sidebar.subheader("Admin-Functions: Main")
 
 st.sidebar.subheader("Update Series Stats")
 
 # Fetch series from DB
 try:
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT SeriesID, SeriesTitle FROM Series ORDER BY SeriesID DESC")
-    series_rows = cursor.fetchall()
-    cursor.close()
-    conn.close()
+    series_rows = get_series_choices()
 
     series_dict = {title: sid for sid, title in series_rows}
     selected_series_label = st.sidebar.selectbox("Select a series:", list(series_dict.keys()), key="series_select")
@@ -158,10 +267,16 @@ try:
         refresh_series_stats(selected_series_id)
         st.sidebar.success(f"Refreshed: {selected_series_label}")
         
+    # Repair only: fixture and result writes keep the remaining-fixtures cache exact
     if st.sidebar.button("Update Remaining Series Fixtures"):
         update_remaining_fixtures_by_series(selected_series_id)
         st.sidebar.success(f"Remaining fixtures updated for: {selected_series_label}")
 
+    # Repair only: results keep the completed-match caches current as they are written
+    if st.sidebar.button("Rebuild Completed Matches Cache"):
+        update_completed_match_cache(selected_series_id)
+        st.sidebar.success(f"Completed matches rebuilt for: {selected_series_label}")
+
 except Exception as e:
     st.sidebar.error(f"Error loading series list: {e}")
 
@@ -172,12 +287,7 @@ st.sidebar.subheader("Update Match Type Stats")
 
 # Dropdown to refresh individual match types
 try:
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute("SELECT MatchTypeID, MatchTypeTitle FROM MatchType ORDER BY MatchTypeTitle")
-    matchtype_rows = cursor.fetchall()
-    cursor.close()
-    conn.close()
+    matchtype_rows = get_match_type_choices()
 
     matchtype_dict = {title: mtid for mtid, title in matchtype_rows}
     selected_label = st.sidebar.selectbox("Select a match type:", list(matchtype_dict.keys()), key="matchtype_select")
@@ -191,18 +301,19 @@ except Exception as e:
     st.sidebar.error(f"Error loading match types: {e}")
 
 
-# Button to refresh ALL active match types
+# Queued refreshes (normally run by refresh_worker.py a few seconds after a burst of results)
+pending_refreshes = get_refresh_queue()
+st.sidebar.caption(f"Refresh queue: {len(pending_refreshes)} pending")
+if pending_refreshes and st.sidebar.button("Run queued refreshes now"):
+    ran = process_refresh_queue(debounce_seconds=0, max_wait_seconds=0)
+    st.sidebar.success(f"Ran {ran} queued refresh(es).")
+
+# Button to refresh ALL active match types (one pass, one transaction)
 if st.sidebar.button("Refresh All Active MatchTypes"):
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-        cursor.execute("SELECT MatchTypeID, MatchTypeTitle FROM MatchType WHERE Active = 1 ORDER BY MatchTypeTitle")
-        active_matchtypes = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        active_matchtypes = refresh_all_active_matchtype_stats()
 
         for mt_id, mt_title in active_matchtypes:
-            refresh_matchtype_stats(mt_id)
             st.sidebar.write(f"✓ {mt_title} refreshed")
 
         st.sidebar.success("All active match types refreshed.")
@@ -246,6 +357,10 @@ edit_fixtures = st.sidebar.checkbox("Edit Fixtures")
 edit_series = st.sidebar.checkbox("Edit Series")
 red_card_player = st.sidebar.checkbox("Red card a player")
 award_walkover = st.sidebar.checkbox("Award walkover")
+show_failed_ingestions = st.sidebar.checkbox("Failed email ingestions")
+
+st.sidebar.subheader("Diagnostics")
+show_diagnostics = st.sidebar.checkbox("Query diagnostics (this run)")
 
 if email_checker_checkbox != email_checker_status:
     set_email_checker_status(email_checker_checkbox)
@@ -342,25 +457,8 @@ if generate_fixtures:
     
     st.subheader("Generate Fixtures")
     generate_fixtures_ui()
+    setup_series_ui()
     
-# Function to generate fixture entries in the database
-def generate_fixture_entries(match_type_id, player_ids):
-    conn = create_connection()
-    cursor = conn.cursor()
-
-    # Generate unique matchups between players
-    for i in range(len(player_ids)):
-        for j in range(i + 1, len(player_ids)):
-            player1_id, player2_id = player_ids[i], player_ids[j]
-            cursor.execute(
-                '''
-                INSERT INTO Fixtures (MatchTypeID, Player1ID, Player2ID, Completed)
-                VALUES (%s, %s, %s, %s)
-                ''',
-                (match_type_id, player1_id, player2_id, 0)  # Ensure 'Completed' defaults to 0
-            )
-    conn.commit()
-    conn.close()    
 # *****************************************************ADDING FORMS********************************************
 # Add Player Form
 if show_add_player_form:
@@ -711,15 +809,18 @@ if award_walkover:
                             SET Completed = 1
                             WHERE FixtureID = %s
                         """, (fixture_id,))
+                        sync_remaining_fixtures(cursor, [fixture_id])
+
+                        # Update the two players' standings in the same transaction
+                        apply_walkover_to_standings(matchtype_id, winner_id, loser_id, conn=conn)
+                        enqueue_refresh(cursor, [matchtype_id])
 
                         conn.commit()
                         st.success(f"Walkover awarded: {winner_choice} wins by default.")
-
-                        # Refresh standings automatically
-                        refresh_matchtype_stats(matchtype_id)
-                        st.info(f"MatchType standings for '{matchtype_title}' refreshed.")
+                        st.info(f"MatchType standings for '{matchtype_title}' updated.")
 
                     except Exception as e:
+                        conn.rollback()
                         st.error(f"Error awarding walkover: {e}")
                     finally:
                         cursor.close()
@@ -777,14 +878,29 @@ if red_card_player:
                         cursor = conn.cursor()
                         try:
                             # Move all completed matches of this player to Non-League
+                            cursor.execute("""
+                                SELECT MatchResultID FROM MatchResults
+                                WHERE MatchTypeID = %s
+                                  AND (Player1ID = %s OR Player2ID = %s)
+                            """, (match_type_id, player_id, player_id))
+                            moved_result_ids = [row[0] for row in cursor.fetchall()]
                             cursor.execute("""
                                 UPDATE MatchResults mr
                                 SET mr.MatchTypeID = %s
                                 WHERE mr.MatchTypeID = %s
                                   AND (mr.Player1ID = %s OR mr.Player2ID = %s)
                             """, (non_league_id, match_type_id, player_id, player_id))
+                            sync_player_match_facts(cursor, moved_result_ids)
+                            sync_completed_matches(cursor, moved_result_ids)
 
                             # Mark remaining fixtures as completed (but leave MatchTypeID unchanged)
+                            cursor.execute("""
+                                SELECT FixtureID FROM Fixtures
+                                WHERE MatchTypeID = %s
+                                  AND Completed = 0
+                                  AND (Player1ID = %s OR Player2ID = %s)
+                            """, (match_type_id, player_id, player_id))
+                            closed_fixture_ids = [row[0] for row in cursor.fetchall()]
                             cursor.execute("""
                                 UPDATE Fixtures
                                 SET Completed = 1
@@ -792,14 +908,13 @@ if red_card_player:
                                   AND Completed = 0
                                   AND (Player1ID = %s OR Player2ID = %s)
                             """, (match_type_id, player_id, player_id))
+                            sync_remaining_fixtures(cursor, closed_fixture_ids)
+                            bump_data_version(cursor, [match_type_id, non_league_id])
+                            enqueue_refresh(cursor, [match_type_id, non_league_id])
 
                             conn.commit()
                             st.success(f"Red card applied to {selected_player_display} for MatchType {selected_matchtype_display}!")
-
-                            # Refresh stats automatically
-                            refresh_matchtype_stats(match_type_id)
-                            update_remaining_fixtures_by_series(current_series_id)
-                            st.info("MatchType standings refreshed automatically.")
+                            st.info("MatchType and series standings refresh queued.")
 
                         except Exception as e:
                             st.error(f"Error applying red card: {e}")
@@ -862,6 +977,46 @@ if edit_series:
 
                 st.success("Match Types updated in series!")
                 st.rerun()
+
+            # Page settings read by the public pages through the series registry
+            page = get_series_page(series_id)
+            if page is not None:
+                st.write("Series page:")
+                with st.form(key='edit_series_page_form'):
+                    page_title = st.text_input("Page title (as listed, e.g. 2026 - Series 3)", value=page.page_title or "")
+                    col1, col2 = st.columns(2)
+                    start_date = col1.date_input("Start date", value=page.start_date)
+                    end_date = col2.date_input("End date (deadline)", value=page.end_date)
+                    rules_url = st.text_input("Rules PDF URL", value=page.rules_url or "")
+                    rules_label = st.text_input("Rules link text", value=page.rules_label or "")
+                    overview = st.text_area("Overview", value=page.overview or "")
+                    layouts = [SERIES_LAYOUT_LEAGUES, SERIES_LAYOUT_SORTING]
+                    layout = st.selectbox("Layout", layouts, index=layouts.index(page.layout) if page.layout in layouts else 0)
+                    listed = st.checkbox("Listed on the public pages", value=page.listed)
+
+                    st.write("League tabs (order, tab name, shown):")
+                    linked = get_series_match_types(series_id)
+                    tab_names = {league.match_type_id: league.tab_name for league in page.leagues}
+                    tab_orders = {league.match_type_id: order for order, league in enumerate(page.leagues, start=1)}
+                    tabs_df = st.data_editor(pd.DataFrame(
+                        [{"MatchTypeID": mt[0], "MatchType": mt[1],
+                          "TabOrder": tab_orders.get(mt[0]), "TabName": tab_names.get(mt[0], ""),
+                          "Show": mt[0] in tab_names} for mt in linked],
+                        columns=["MatchTypeID", "MatchType", "TabOrder", "TabName", "Show"]
+                    ), disabled=["MatchTypeID", "MatchType"], hide_index=True)
+
+                    if st.form_submit_button("Update Series Page"):
+                        try:
+                            update_series_page(series_id, page_title, start_date, end_date, rules_url,
+                                               rules_label, overview, layout, listed)
+                            update_series_tabs(series_id, [
+                                (int(row.MatchTypeID), row.TabName,
+                                 None if pd.isna(row.TabOrder) else int(row.TabOrder), bool(row.Show))
+                                for row in tabs_df.itertuples(index=False)
+                            ])
+                            st.success("Series page updated!")
+                        except Exception as e:
+                            st.error(f"Error updating the series page: {e}")
                     
 # Editing Players
 if edit_players:
@@ -924,18 +1079,6 @@ if edit_match_types:
                     st.success("Match Type updated successfully!")
                     st.rerun()
 
-# Add this function to update match type in database
-def update_match_type(match_type_id, match_type_title, active_status):
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        UPDATE MatchType
-        SET MatchTypeTitle = %s, Active = %s
-        WHERE MatchTypeID = %s
-    ''', (match_type_title, active_status, match_type_id))
-    conn.commit()
-    conn.close()
-
 
 # Editing Fixtures
 if edit_fixtures:
@@ -1059,32 +1202,69 @@ if edit_match_results:
                     )
                     st.success("Match result updated successfully!")
                     st.rerun()
+
+            # Deleting reopens the fixture, so it shows as remaining again
+            confirm_delete = st.checkbox(f"Confirm deleting Match ID {match_result_id}")
+            if st.button("Delete Match Result", disabled=not confirm_delete):
+                if delete_match_result(match_result_id):
+                    st.success("Match result deleted and fixture reopened.")
+                    st.rerun()
+                else:
+                    st.warning("That match result no longer exists.")
     else:
         st.warning("No match results available to edit.")
         
-# Add this function to update match result in database
-def update_match_result(match_result_id, date, time_completed, match_type_id, player1_id, player2_id,
-                        player1_points, player2_points, player1_pr, player2_pr, player1_luck, player2_luck):
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        UPDATE MatchResults
-        SET Date = %s, TimeCompleted = %s, MatchTypeID = %s, Player1ID = %s, Player2ID = %s,
-            Player1Points = %s, Player2Points = %s, Player1PR = %s, Player2PR = %s, Player1Luck = %s, Player2Luck = %s
-        WHERE MatchResultID = %s
-    ''', (date, time_completed, match_type_id, player1_id, player2_id, player1_points, player2_points,
-          player1_pr, player2_pr, player1_luck, player2_luck, match_result_id))
-    conn.commit()
-    conn.close()
+# **********************************FAILED EMAIL INGESTIONS ***********************************
+if show_failed_ingestions:
+    st.subheader("Failed Email Ingestions")
+    st.write("Result emails that could not be parsed or matched to a fixture. Fix the nickname, identifier "
+             "or fixture, then replay them all.")
+
+    # The outcome of the last "Replay all", kept across the rerun that refreshes the list below
+    replay_report = st.session_state.pop("replay_report", None)
+    if replay_report:
+        for line in replay_report["log"]:
+            st.write(line)
+        for line in replay_report["errors"]:
+            st.warning(line)
+        st.success(replay_report["summary"])
+
+    failures = get_failed_ingestions()
+    if not failures:
+        st.success("No failed ingestions.")
+    else:
+        failures_df = pd.DataFrame(failures)
+        failures_df["Subject"] = failures_df["Subject"].map(clean_subject)
+
+        summary_df = failures_df.groupby("Reason").agg(
+            Emails=("FailedIngestionID", "count"),
+            LastFailed=("LastFailedAt", "max"),
+        ).reset_index()
+        st.dataframe(summary_df, hide_index=True)
+
+        if st.button("Replay all"):
+            replay_log, replay_errors = [], []
+            with st.spinner("Replaying failed emails..."):
+                inserted, still_failing = replay_failed_ingestions(log=replay_log.append, error=replay_errors.append)
+                if inserted:
+                    process_refresh_queue(debounce_seconds=0, max_wait_seconds=0)
+            st.session_state["replay_report"] = {
+                "log": replay_log,
+                "errors": replay_errors,
+                "summary": f"{inserted} result(s) added; {still_failing} email(s) still failing.",
+            }
+            st.rerun()
 
-# Add this function to update player in database
-def update_player(player_id, name, nickname, email):
-    conn = create_connection()
-    cursor = conn.cursor()
-    cursor.execute('''
-        UPDATE Players
-        SET Name = %s, Nickname = %s, Email = %s
-        WHERE PlayerID = %s
-    ''', (name, nickname, email, player_id))
-    conn.commit()
-    conn.close()
+        for reason, group in failures_df.groupby("Reason"):
+            with st.expander(f"{reason} ({len(group)})"):
+                st.dataframe(
+                    group[["FailedIngestionID", "Subject", "ToAddress", "Detail", "Attempts", "LastFailedAt"]],
+                    hide_index=True
+                )
+                if st.button(f"Dismiss these {len(group)}", key=f"dismiss_{reason}"):
+                    dismiss_failed_ingestions(group["FailedIngestionID"].tolist())
+                    st.rerun()
+
+# Rendered last so it covers every query this run made
+if show_diagnostics:
+    show_query_diagnostics()
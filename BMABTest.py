@@ -13,7 +13,6 @@ from database import (
     display_matchtype_standings_with_points,
     get_matchcount_by_matchtype,
     get_fixturescount_by_matchtype,
-    display_match_gridd,
     smccc,
     get_matchcount_by_date,
     get_matchcount_by_series,
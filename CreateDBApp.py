@@ -1,6 +1,8 @@
 import streamlit as st
 import pandas as pd
 from database import get_crontest2, crontest2_table, empty_all_tables, reset_fixtures_completed, reset_match_results, print_table_structure, create_players_table, create_series_table, create_match_results_table, create_match_type_table, create_appsettings_table, create_fixtures_table
+from database import backfill_player_match_facts
+from migrations import run_migrations
 st.title("Create Backgammon Database")
 
 if st.button("Create Players Table"):
@@ -27,6 +29,25 @@ if st.button("Create fixtures Table"):
     create_fixtures_table()
     st.success("Fixtures table created.")
 
+if st.button("Dry run schema migrations"):
+    output = []
+    run_migrations(dry_run=True, log=output.append)
+    st.code("\n".join(output))
+
+if st.button("Run schema migrations"):
+    output = []
+    applied = run_migrations(explain=True, log=output.append)
+    st.code("\n".join(output))
+    st.success(f"Applied migrations: {applied}" if applied else "Schema already up to date.")
+
+if st.button("Backfill PlayerMatchFacts"):
+    inserted = backfill_player_match_facts()
+    st.success(f"PlayerMatchFacts backfilled: {inserted} rows added.")
+
+if st.button("Rebuild PlayerMatchFacts"):
+    inserted = backfill_player_match_facts(full=True)
+    st.success(f"PlayerMatchFacts rebuilt: {inserted} rows.")
+
 if st.button("Show MatchResults format:"):
     print_table_structure()
     st.success("table printed")
@@ -1,10 +1,10 @@
 import imaplib
-import email
-import re
 import streamlit as st
 import pandas as pd
 from database import get_remaining_fixtures, get_match_results_for_grid, get_player_stats_with_fixtures, get_player_stats_by_matchtype, get_players_by_match_type, get_fixtures_with_names_by_match_type, get_match_results_nicely_formatted, print_table_structure, get_player_id_by_nickname, get_match_type_id_by_identifier, check_result_exists, insert_match_result, get_fixture, get_standings, get_match_types, get_match_results, check_tables, create_connection, insert_match_result, check_result_exists, get_email_checker_status 
 from datetime import datetime, timedelta, timezone
+from functools import partial
+from mail_ingest import ingest_new_messages, process_result_batch
 
 # Add a header image at the top of the page
 st.image("https://www.sabga.co.za/wp-content/uploads/2020/06/cropped-coverphoto.jpg", use_column_width=True)  # The image will resize to the width of the page
@@ -27,104 +27,16 @@ def check_for_new_emails():
     try:
         mail = imaplib.IMAP4_SSL('mail.sabga.co.za', 993)
         mail.login(EMAIL, PASSWORD)
-        mail.select('inbox')
         #st.write("Login to Inbox successful")
     except imaplib.IMAP4.error as e:
         st.error(f"IMAP login failed: {str(e)}")
         return
 
-    status, messages = mail.search(None, '(SUBJECT "Admin: A league match was played" SUBJECT "Fwd: Admin: A league match was played")')
-    email_ids = messages[0].split()
-
-    for email_id in email_ids:
-        status, msg_data = mail.fetch(email_id, '(RFC822)')
-
-        for response_part in msg_data:
-            if isinstance(response_part, tuple):
-                msg = email.message_from_bytes(response_part[1])
-                subject = msg['subject']
-                cleaned_subject = re.sub(r"^(Fwd:|Re:)\s*", "", subject).strip()
-                #st.write(f"Cleaned Subject: {cleaned_subject}")
-
-                body = ""
-                if msg.is_multipart():
-                    for part in msg.walk():
-                        if part.get_content_type() == "text/plain":
-                            body = part.get_payload(decode=True).decode('utf-8')
-                            break
-                else:
-                    body = msg.get_payload(decode=True).decode('utf-8')
-
-                forwarded_to = re.search(r"To:.*<(.+?)>", body)
-                if forwarded_to:
-                    forwarded_email = forwarded_to.group(1)
-                    #st.write(f"Forwarded email address: {forwarded_email}")
-
-                    match_type_identifier = re.search(r"\+([^@]+)@", forwarded_email)
-                    if match_type_identifier:
-                        match_type_text = match_type_identifier.group(1)
-                        #st.write(f"MatchType Identifier: {match_type_text}")
-
-                        match_type_id = get_match_type_id_by_identifier(match_type_text)
-                        if not match_type_id:
-                            st.error("MatchTypeID not found for identifier.")
-                            continue
-
-                match = re.search(r"between (\w+) \(([^)]+)\) and (\w+) \(([^)]+)\)", cleaned_subject)
-                if match:
-                    player_1_nickname, player_2_nickname = match.group(1), match.group(3)
-                    player_1_stats, player_2_stats = match.group(2).split(), match.group(4).split()
-
-                    if len(player_1_stats) == 4 and len(player_2_stats) == 4:
-                        player_1_points, player_1_length, player_1_pr, player_1_luck = player_1_stats
-                        player_2_points, player_2_length, player_2_pr, player_2_luck = player_2_stats
-
-                        # Ensure the stats are in the right format
-                        player_1_points = float(player_1_points) if '.' in player_1_points else int(player_1_points)
-                        player_1_length = float(player_1_length) if '.' in player_1_length else int(player_1_length)
-                        player_1_pr = float(player_1_pr)
-                        player_1_luck = float(player_1_luck)
-
-                        player_2_points = float(player_2_points) if '.' in player_2_points else int(player_2_points)
-                        player_2_length = float(player_2_length) if '.' in player_2_length else int(player_2_length)
-                        player_2_pr = float(player_2_pr)
-                        player_2_luck = float(player_2_luck)
-
-                        player_1_id = get_player_id_by_nickname(player_1_nickname)
-                        player_2_id = get_player_id_by_nickname(player_2_nickname)
-                        if not player_1_id or not player_2_id:
-                            st.error("Player ID not found for one or both nicknames.")
-                            continue
-
-                        # Call get_fixture to retrieve fixture and completion status
-                        fixture = get_fixture(match_type_id, player_1_id, player_2_id)
-                        if fixture is None or fixture.get("Completed") == 1:
-                            # Check if fixture was not found or is already marked as completed
-                            #st.error("No matching fixture found or fixture is already completed. Skipping.")
-                            continue
-
-                        fixture_id = fixture["FixtureID"]
-                        st.write(f"Fixture content: {fixture}")
-
-                        # Calculate the lower value for each player's points
-                        player_1_points = min(player_1_points, player_1_length)
-                        player_2_points = min(player_2_points, player_2_length)
-
-                        # Now call the insert function with the correct data
-                        insert_match_result(
-                            fixture_id,
-                            player_1_points, player_1_pr, player_1_luck,
-                            player_2_points, player_2_pr, player_2_luck,
-                            match_type_id, player_1_id, player_2_id
-                        )
-                        st.success("Match result added to the database!")
-                    else:
-                        st.error("Player data format is incorrect. Expected 4 values for each player.")
-                else:
-                    st.write(f"No match data found for email {email_id} - Subject: {subject}")
-
-    # Ensure this line is properly indented to run after the loop is complete
-    mail.logout()
+    try:
+        # Only UIDs above the stored watermark are searched and fetched
+        ingest_new_messages(mail, EMAIL, partial(process_result_batch, log=st.write, error=st.error), log=st.write)
+    finally:
+        mail.logout()
 
 # Check if the email checker is enabled
 #if get_email_checker_status():
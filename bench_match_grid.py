@@ -0,0 +1,108 @@
+"""
+Offline check and benchmark for build_match_grid() in database.py.
+
+Builds grids for random leagues (plus a few hand-written edge cases) and
+compares each with the per-cell .loc loop display_match_grid used before,
+then times both on one large league. Needs no database:
+
+    python bench_match_grid.py                # check, then benchmark
+    python bench_match_grid.py --check        # check only (exit code 1 on a mismatch)
+    python bench_match_grid.py --leagues 500  # random leagues to check
+"""
+import argparse
+import random
+import sys
+import time
+
+import pandas as pd
+
+from database import MATCH_GRID_EMPTY, build_match_grid
+
+# (Player1ID, Player1Name, Player2ID, Player2Name, Player1Points, Player2Points), as from get_match_results_for_grid()
+EDGE_CASES = {
+    "single result": [(1, "Alice", 2, "Bob", 11, 7)],
+    "unplayed points": [(1, "Alice", 2, "Bob", None, 5), (2, "Bob", 3, "Carol", 9, None)],
+    "missing name": [(1, None, 2, "Bob", 11, 4), (2, "Bob", 3, "Carol", 3, 11)],
+    "both orders": [(1, "Alice", 2, "Bob", 11, 2), (2, "Bob", 1, "Alice", 11, 6)],
+}
+
+
+def reference_grid(match_results):
+    """The per-cell loop build_match_grid replaced (names of None shown blank, as before)."""
+    if not match_results:
+        return None
+    player_names = sorted({(r[1] or "") for r in match_results} | {(r[3] or "") for r in match_results})
+    score_df = pd.DataFrame(MATCH_GRID_EMPTY, index=player_names, columns=player_names)
+    for result in match_results:
+        player1_name, player2_name = result[1] or "", result[3] or ""
+        if result[4] is not None:
+            score_df.loc[player2_name, player1_name] = str(result[4])
+        if result[5] is not None:
+            score_df.loc[player1_name, player2_name] = str(result[5])
+    return score_df
+
+
+def random_league(rng, players, played=0.7):
+    names = [f"Player {n:03d}" for n in rng.sample(range(1000), players)]
+    rows = []
+    for i in range(players):
+        for j in range(i + 1, players):
+            if rng.random() < played:
+                p1, p2 = (i, j) if rng.random() < 0.5 else (j, i)
+                points = [rng.choice([None, *range(12)]) if rng.random() < 0.05 else rng.randrange(12) for _ in range(2)]
+                rows.append((p1, names[p1], p2, names[p2], *points))
+    return rows
+
+
+def same(grid, expected):
+    if grid is None or expected is None:
+        return grid is None and expected is None
+    # Labels and cell text only: newer pandas may infer a string dtype for either frame
+    return (grid.index.tolist() == expected.index.tolist()
+            and grid.columns.tolist() == expected.columns.tolist()
+            and grid.values.tolist() == expected.values.tolist())
+
+
+def check(leagues, seed=1):
+    rng = random.Random(seed)
+    cases = dict(EDGE_CASES)
+    cases["no results"] = []
+    for n in range(leagues):
+        cases[f"random league {n}"] = random_league(rng, rng.randint(2, 16))
+
+    failures = 0
+    for name, rows in cases.items():
+        grid, expected = build_match_grid(rows), reference_grid(rows)
+        if not same(grid, expected):
+            print(f"❌ {name}:\n{expected}\n   got\n{grid}")
+            failures += 1
+
+    print(f"{'✅' if not failures else '❌'} {len(cases) - failures}/{len(cases)} grids match the per-cell loop.")
+    return failures == 0
+
+
+def benchmark(players=60, runs=5):
+    rows = random_league(random.Random(2), players, played=1.0)
+    for label, build in (("build_match_grid", build_match_grid), ("per-cell loop", reference_grid)):
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            build(rows)
+            timings.append(time.perf_counter() - start)
+        print(f"📈 {label}: {players} players, {len(rows)} results, best of {runs}: {min(timings) * 1000:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check and benchmark the match results grid.")
+    parser.add_argument("--check", action="store_true", help="only compare against the per-cell loop")
+    parser.add_argument("--leagues", type=int, default=300, help="random leagues to check")
+    args = parser.parse_args(argv)
+
+    ok = check(args.leagues)
+    if not args.check:
+        benchmark()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Offline check and throughput benchmark for result_parser.py.
+
+Parses every .eml file in sample_emails/ and compares the result with
+sample_emails/expected.json, then times parse_many() over the corpus.
+Needs no database or mail server:
+
+    python bench_parser.py                 # check, then benchmark
+    python bench_parser.py --check         # check only (exit code 1 on a mismatch)
+    python bench_parser.py --repeat 5000   # corpus copies per benchmark run
+    python bench_parser.py --update        # rewrite expected.json after an intended change
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+
+from result_parser import ParseError, parse_many, parse_message
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_emails")
+EXPECTED_FILE = os.path.join(CORPUS_DIR, "expected.json")
+
+
+def load_corpus():
+    corpus = {}
+    for path in sorted(glob.glob(os.path.join(CORPUS_DIR, "*.eml"))):
+        with open(path, "rb") as f:
+            corpus[os.path.basename(path)] = f.read()
+    return corpus
+
+
+def parse_outcome(raw):
+    try:
+        return parse_message(raw)._asdict()
+    except ParseError as e:
+        return {"error": e.reason}
+
+
+def check(corpus):
+    with open(EXPECTED_FILE, encoding="utf-8") as f:
+        expected = json.load(f)
+
+    failures = 0
+    for name, raw in corpus.items():
+        outcome = parse_outcome(raw)
+        if name not in expected:
+            print(f"⚠️ {name}: no expected result (run with --update)")
+            failures += 1
+        elif outcome != expected[name]:
+            print(f"❌ {name}:\n   expected {expected[name]}\n   got      {outcome}")
+            failures += 1
+    for name in sorted(set(expected) - set(corpus)):
+        print(f"⚠️ {name}: expected result but no .eml file")
+        failures += 1
+
+    print(f"{'✅' if not failures else '❌'} {len(corpus) - failures}/{len(corpus)} sample emails as expected.")
+    return failures == 0
+
+
+def update(corpus):
+    outcomes = {name: parse_outcome(raw) for name, raw in corpus.items()}
+    with open(EXPECTED_FILE, "w", encoding="utf-8") as f:
+        json.dump(outcomes, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+    print(f"Wrote {len(outcomes)} expected results to {EXPECTED_FILE}.")
+
+
+def benchmark(corpus, repeat, runs=5):
+    messages = list(corpus.values()) * repeat
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        parsed, failed = parse_many(messages)
+        timings.append(time.perf_counter() - start)
+
+    best = min(timings)
+    print(f"📈 {len(messages)} messages ({len(parsed)} parsed, {len(failed)} failed) per run, best of {runs}: "
+          f"{best * 1000:.1f} ms, {len(messages) / best:,.0f} msg/s, {best / len(messages) * 1e6:.1f} µs/msg")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check and benchmark the result email parser.")
+    parser.add_argument("--check", action="store_true", help="only compare against expected.json")
+    parser.add_argument("--update", action="store_true", help="rewrite expected.json from the current parser")
+    parser.add_argument("--repeat", type=int, default=1000, help="corpus copies per benchmark run")
+    args = parser.parse_args(argv)
+
+    corpus = load_corpus()
+    if args.update:
+        update(corpus)
+        return 0
+
+    ok = check(corpus)
+    if not args.check:
+        benchmark(corpus, args.repeat)
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
 <?php
+// Superseded by ingest_worker.py (IMAP IDLE, no polling); kept as a fallback cron job.
 // Email server and database credentials
 $host = 'sql58.jnb2.host-h.net';
 $db_user = 'sabga_admin';
@@ -99,7 +100,13 @@ function insert_match_result($conn, $fixture_id, $player1_points, $player1_pr, $
     $stmt->bind_param("iiddiddiii", $fixture_id, $player1_points, $player1_pr, $player1_luck, 
                                        $player2_points, $player2_pr, $player2_luck, $match_type_id, 
                                        $player1_id, $player2_id);
-    $stmt->execute();
+    try {
+        $stmt->execute();
+    } catch (mysqli_sql_exception $e) {
+        // e.g. the other ingester already stored a result for this fixture (unique FixtureID)
+        log_debug("Failed to insert match result for FixtureID = $fixture_id: " . $e->getMessage());
+        return false;
+    }
 
     if ($stmt->affected_rows > 0) {
         log_debug("Match result added successfully");
@@ -110,6 +117,203 @@ function insert_match_result($conn, $fixture_id, $player1_points, $player1_pr, $
     }
 }
 
+// Bump the read-cache versions of a match type and its series (see database.py)
+function bump_data_version($conn, $match_type_id) {
+    $stmt = $conn->prepare("
+        INSERT INTO DataVersion (Scope, ScopeID, Version)
+        SELECT * FROM (
+            SELECT 'matchtype' AS Scope, ? AS ScopeID, 1 AS Version
+            UNION ALL SELECT 'series', SeriesID, 1 FROM SeriesMatchTypes WHERE MatchTypeID = ?
+        ) AS bumped
+        ON DUPLICATE KEY UPDATE Version = DataVersion.Version + 1
+    ");
+    if (!$stmt) {
+        log_debug("DataVersion not available: " . $conn->error);
+        return;
+    }
+    $stmt->bind_param("ii", $match_type_id, $match_type_id);
+    $stmt->execute();
+}
+
+// True if this Message-ID was already ingested (by this script or ingest_worker.py)
+function already_ingested($conn, $message_id) {
+    if (!$message_id) {
+        return false;
+    }
+    try {
+        $stmt = $conn->prepare("SELECT 1 FROM IngestedMessages WHERE MessageID = ? LIMIT 1");
+    } catch (mysqli_sql_exception $e) {
+        $stmt = false;
+    }
+    if (!$stmt) {
+        return false; // table not created yet (migration 6)
+    }
+    $stmt->bind_param("s", $message_id);
+    $stmt->execute();
+    return $stmt->get_result()->fetch_row() !== null;
+}
+
+// Record an ingested email so neither ingester processes it again
+function record_ingested_message($conn, $message_id, $fixture_id, $match_result_id) {
+    if (!$message_id) {
+        return;
+    }
+    try {
+        $stmt = $conn->prepare("
+            INSERT IGNORE INTO IngestedMessages (MessageID, FixtureID, MatchResultID, Source)
+            VALUES (?, ?, ?, 'php')
+        ");
+    } catch (mysqli_sql_exception $e) {
+        $stmt = false;
+    }
+    if (!$stmt) {
+        log_debug("IngestedMessages not available: " . $conn->error);
+        return;
+    }
+    $stmt->bind_param("sii", $message_id, $fixture_id, $match_result_id);
+    $stmt->execute();
+}
+
+// Dedup key: the Message-ID, or a digest of the email for ones without (same as message_key in result_parser.py)
+function message_key($message_id, $subject, $to, $body) {
+    if ($message_id && trim($message_id) !== '') {
+        return substr(trim($message_id), 0, 255);
+    }
+    return '<sha1:' . sha1("$subject|$to|$body") . '>';
+}
+
+// Keep an email that could not be ingested in FailedIngestions for the admin page to replay.
+// $reason uses the same values as mail_ingest.py (see result_parser.py and database.py).
+function record_failed_ingestion($conn, $message_key, $subject, $to, $body, $reason, $detail) {
+    log_debug("Could not ingest '$subject': $reason, $detail");
+    try {
+        $stmt = $conn->prepare("
+            INSERT INTO FailedIngestions (MessageID, Subject, ToAddress, Body, Reason, Detail, LastFailedAt)
+            VALUES (?, ?, ?, ?, ?, ?, NOW())
+            ON DUPLICATE KEY UPDATE Reason = VALUES(Reason), Detail = VALUES(Detail),
+                Attempts = Attempts + 1, LastFailedAt = NOW(), ResolvedAt = NULL
+        ");
+    } catch (mysqli_sql_exception $e) {
+        $stmt = false;
+    }
+    if (!$stmt) {
+        log_debug("FailedIngestions not available: " . $conn->error);
+        return; // table not created yet (migration 7)
+    }
+    $to = substr($to, 0, 255);
+    $detail = substr((string)$detail, 0, 512);
+    $stmt->bind_param("ssssss", $message_key, $subject, $to, $body, $reason, $detail);
+    $stmt->execute();
+}
+
+// Resolve the dead letter of an email that has now gone in, or needs nothing more
+function resolve_failed_ingestion($conn, $message_key) {
+    try {
+        $stmt = $conn->prepare("UPDATE FailedIngestions SET ResolvedAt = NOW() WHERE MessageID = ? AND ResolvedAt IS NULL");
+    } catch (mysqli_sql_exception $e) {
+        $stmt = false;
+    }
+    if (!$stmt) {
+        return; // table not created yet (migration 7)
+    }
+    $stmt->bind_param("s", $message_key);
+    $stmt->execute();
+}
+
+// Queue a standings refresh for a match type and its series (run by refresh_worker.py)
+function enqueue_refresh($conn, $match_type_id) {
+    try {
+        $stmt = $conn->prepare("
+            INSERT INTO RefreshQueue (Kind, TargetID)
+            SELECT * FROM (
+                SELECT 'matchtype' AS Kind, ? AS TargetID
+                UNION ALL SELECT 'series', SeriesID FROM SeriesMatchTypes WHERE MatchTypeID = ?
+            ) AS queued
+            ON DUPLICATE KEY UPDATE LastEnqueuedAt = CURRENT_TIMESTAMP(3)
+        ");
+    } catch (mysqli_sql_exception $e) {
+        $stmt = false;
+    }
+    if (!$stmt) {
+        log_debug("RefreshQueue not available: " . $conn->error);
+        return;
+    }
+    $stmt->bind_param("ii", $match_type_id, $match_type_id);
+    $stmt->execute();
+}
+
+// Unpivot a new result into its two PlayerMatchFacts rows (same rows as sync_player_match_facts in database.py).
+// Runs in the caller's transaction; a failure throws so the result insert is rolled back with it.
+function insert_player_match_facts($conn, $match_result_id) {
+    $side = "
+        SELECT mr.Player{me}ID, mr.Player{opp}ID, mr.MatchResultID, mr.MatchTypeID,
+               smt.SeriesID, ss.SeasonID, mr.Date,
+               mr.Player{me}Points, mr.Player{opp}Points, mr.Player{me}PR, mr.Player{opp}PR, mr.Player{me}Luck,
+               mr.Player{me}Points > mr.Player{opp}Points,
+               COALESCE(mr.Player{me}PR < mr.Player{opp}PR, 0)
+        FROM MatchResults mr
+        LEFT JOIN (SELECT MatchTypeID, MIN(SeriesID) AS SeriesID
+                   FROM SeriesMatchTypes GROUP BY MatchTypeID) smt ON smt.MatchTypeID = mr.MatchTypeID
+        LEFT JOIN (SELECT SeriesID, MIN(SeasonID) AS SeasonID
+                   FROM SeasonSeries GROUP BY SeriesID) ss ON ss.SeriesID = smt.SeriesID
+        WHERE mr.MatchResultID = ?
+    ";
+    $sql = "INSERT INTO PlayerMatchFacts (PlayerID, OpponentID, MatchResultID, MatchTypeID, SeriesID, SeasonID,
+                                          Date, Points, OppPoints, PR, OppPR, Luck, Won, PRWon) "
+         . strtr($side, ['{me}' => 1, '{opp}' => 2]) . " UNION ALL " . strtr($side, ['{me}' => 2, '{opp}' => 1]);
+    try {
+        $stmt = $conn->prepare($sql);
+    } catch (mysqli_sql_exception $e) {
+        $stmt = false;
+    }
+    if (!$stmt) {
+        log_debug("PlayerMatchFacts not available: " . $conn->error);
+        return; // table not created yet (migration 3)
+    }
+    $stmt->bind_param("ii", $match_result_id, $match_result_id);
+    $stmt->execute();
+}
+
+// Append the completed-match cache rows for a new result (same rows as append_completed_matches in database.py).
+// Runs in the caller's transaction; a failure throws so the result insert is rolled back with it.
+function append_completed_matches($conn, $match_result_id) {
+    $select = "
+        SELECT %smr.MatchTypeID, mr.FixtureID, mr.Player1ID, mr.Player2ID, p1.Name, p2.Name,
+               mr.Player1Points, mr.Player2Points, mr.Player1PR, mr.Player2PR,
+               mr.Player1Luck, mr.Player2Luck,
+               CASE WHEN mr.Player1Points > mr.Player2Points THEN p1.Name
+                    WHEN mr.Player2Points > mr.Player1Points THEN p2.Name
+                    ELSE 'Draw' END,
+               mr.Date, mr.TimeCompleted, NOW()%s
+        FROM MatchResults mr
+        JOIN Players p1 ON p1.PlayerID = mr.Player1ID
+        JOIN Players p2 ON p2.PlayerID = mr.Player2ID%s
+        WHERE mr.FixtureID IS NOT NULL AND mr.MatchResultID = ?
+    ";
+    $columns = "MatchTypeID, FixtureID, Player1ID, Player2ID, Player1Name, Player2Name,
+                Player1Points, Player2Points, Player1PR, Player2PR, Player1Luck, Player2Luck,
+                Winner, Date, TimeCompleted, LastUpdated";
+    $statements = [
+        "INSERT INTO MatchTypeCompletedCache ($columns) " . sprintf($select, "", "", ""),
+        "INSERT INTO CompletedMatchesCache (SeriesID, $columns, MatchTypeTitle) " . sprintf($select,
+            "smt.SeriesID, ", ", mt.MatchTypeTitle",
+            " JOIN SeriesMatchTypes smt ON smt.MatchTypeID = mr.MatchTypeID JOIN MatchType mt ON mt.MatchTypeID = mr.MatchTypeID"),
+    ];
+    foreach ($statements as $sql) {
+        $stmt = $conn->prepare($sql);
+        $stmt->bind_param("i", $match_result_id);
+        $stmt->execute();
+    }
+}
+
+// Drop a completed fixture from SeriesRemainingFixturesCache (see sync_remaining_fixtures in database.py).
+// Runs in the caller's transaction like append_completed_matches.
+function remove_remaining_fixture($conn, $fixture_id) {
+    $stmt = $conn->prepare("DELETE FROM SeriesRemainingFixturesCache WHERE FixtureID = ?");
+    $stmt->bind_param("i", $fixture_id);
+    $stmt->execute();
+}
+
 // Main email processing logic
 try {
     $inbox = imap_open("{{$email_host}:$email_port/imap/ssl}INBOX", $email_user, $email_password);
@@ -138,9 +342,15 @@ try {
             $msg = imap_fetchbody($inbox, $email_id, 1);
             $subject = imap_headerinfo($inbox, $email_id)->subject;
             $email_header = imap_headerinfo($inbox, $email_id);
+            $message_id = isset($email_header->message_id) ? substr(trim($email_header->message_id), 0, 255) : null;
+            if (already_ingested($conn, $message_id)) {
+                log_debug("Email $message_id already ingested. Skipping.");
+                continue;
+            }
             
             // Extract the 'To:' field (recipient)
-            $to_field = $email_header->to[0]->mailbox . '@' . $email_header->to[0]->host;
+            $to_field = !empty($email_header->to) ? $email_header->to[0]->mailbox . '@' . $email_header->to[0]->host : '';
+            $failed_key = message_key($message_id, $subject, $to_field, $msg);
 
             // Log the subject and the recipient
             log_debug("Original email subject: $subject");
@@ -172,27 +382,36 @@ try {
                             log_debug("Match type identifier extracted: $identifier");
                         } else {
                             log_debug("No match type identifier in Fwd part either.");
+                            record_failed_ingestion($conn, $failed_key, $subject, $to_field, $msg, 'no_identifier',
+                                                    "no '+identifier@' address in To ($to_field) or body");
                             continue; // Skip this email
                         }
                     } else {
                         log_debug("No forwarded email address found.");
+                        record_failed_ingestion($conn, $failed_key, $subject, $to_field, $msg, 'no_identifier',
+                                                "no '+identifier@' address in To ($to_field) or body");
                         continue; // Skip this email
                     }
                 }
             } else {
                 log_debug("No To address found.");
+                record_failed_ingestion($conn, $failed_key, $subject, $to_field, $msg, 'no_identifier',
+                                        "no '+identifier@' address in To () or body");
+                continue; // Skip this email
             }
             
              $match_type_id = get_match_type_id_by_identifier($conn, $identifier);
              if (!$match_type_id) {
                 log_debug("Failed to retrieve MatchTypeID for identifier: $identifier");
+                record_failed_ingestion($conn, $failed_key, $subject, $to_field, $msg, 'unknown_identifier', $identifier);
                 continue; // Skip this email
             } else {
                 log_debug("No forwarded email address found.");
             }
 
             // Extract player nicknames and match data
-            preg_match('/between ([\w\s]+) \((\d+ \d+ [\d.]+ [\-\d.]+)\) and ([\w\s]+) \((\d+ \d+ [\d.]+ [\-\d.]+)\)/', $cleaned_subject, $match);
+            // Same nickname pattern as result_parser.py
+            preg_match('/between\s+([^()]+?)\s*\((\d+ \d+ [\d.]+ [\-\d.]+)\)\s*and\s+([^()]+?)\s*\((\d+ \d+ [\d.]+ [\-\d.]+)\)/', $cleaned_subject, $match);
             if ($match) {
                 log_debug("Extracted match details: " . json_encode($match));
 
@@ -201,6 +420,8 @@ try {
 
                 if (!$player1_id || !$player2_id) {
                     log_debug("Failed to find PlayerIDs for players: $match[1], $match[3]");
+                    $missing = array_merge($player1_id ? [] : [$match[1]], $player2_id ? [] : [$match[3]]);
+                    record_failed_ingestion($conn, $failed_key, $subject, $to_field, $msg, 'unknown_nickname', implode(', ', $missing));
                     continue; // Skip this email
                 }
 
@@ -214,22 +435,46 @@ try {
         if ($fixture) {
             log_debug("Fixture found: " . json_encode($fixture));
             if ($fixture['Completed'] == 0) {
-                $success = insert_match_result($conn, $fixture['FixtureID'], min($p1_points, $p1_length), (float)$p1_pr, (float)$p1_luck,
-                                               min($p2_points, $p2_length), (float)$p2_pr, (float)$p2_luck, $match_type_id, $player1_id, $player2_id);
-                if ($success) {
-                    $update_stmt = $conn->prepare("UPDATE Fixtures SET Completed = 1 WHERE FixtureID = ?");
-                    $update_stmt->bind_param("i", $fixture['FixtureID']);
-                    $update_stmt->execute();
-                    log_debug("Fixture marked as completed");
+                // The result, its facts, caches and the fixture update are written together or not at all
+                $conn->begin_transaction();
+                try {
+                    $success = insert_match_result($conn, $fixture['FixtureID'], min($p1_points, $p1_length), (float)$p1_pr, (float)$p1_luck,
+                                                   min($p2_points, $p2_length), (float)$p2_pr, (float)$p2_luck, $match_type_id, $player1_id, $player2_id);
+                    if ($success) {
+                        $match_result_id = $conn->insert_id;
+                        insert_player_match_facts($conn, $match_result_id);
+                        record_ingested_message($conn, $message_id, $fixture['FixtureID'], $match_result_id);
+                        append_completed_matches($conn, $match_result_id);
+                        $update_stmt = $conn->prepare("UPDATE Fixtures SET Completed = 1 WHERE FixtureID = ?");
+                        $update_stmt->bind_param("i", $fixture['FixtureID']);
+                        $update_stmt->execute();
+                        remove_remaining_fixture($conn, $fixture['FixtureID']);
+                        log_debug("Fixture marked as completed");
+                        bump_data_version($conn, $match_type_id);
+                        enqueue_refresh($conn, $match_type_id);
+                        resolve_failed_ingestion($conn, $failed_key);
+                        $conn->commit();
+                    } else {
+                        $conn->rollback();
+                    }
+                } catch (mysqli_sql_exception $e) {
+                    $conn->rollback();
+                    log_debug("Rolled back result for FixtureID = " . $fixture['FixtureID'] . ": " . $e->getMessage());
+                    record_failed_ingestion($conn, $failed_key, $subject, $to_field, $msg, 'insert_failed',
+                                            "FixtureID " . $fixture['FixtureID'] . ": " . $e->getMessage());
                 }
             } else {
                 log_debug("Fixture already completed. Skipping.");
+                resolve_failed_ingestion($conn, $failed_key);
             }
         } else {
             log_debug("No matching fixture found for MatchTypeID: $match_type_id, Player1ID: $player1_id, Player2ID: $player2_id");
+            record_failed_ingestion($conn, $failed_key, $subject, $to_field, $msg, 'no_fixture',
+                                    "MatchTypeID $match_type_id, players $player1_id and $player2_id");
         }
     } else {
-        log_debug("No match details for extraction.")
+        log_debug("No match details for extraction.");
+        record_failed_ingestion($conn, $failed_key, $subject, $to_field, $msg, 'no_match_data', $cleaned_subject);
       } 
       
       } else {
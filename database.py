@@ -1,39 +1,774 @@
 import mysql.connector
+import mysql.connector.pooling
 import email
+import functools
 import imaplib
 import sys
+import threading
+import time
+import weakref
 import streamlit as st
+try:
+    from streamlit.runtime.scriptrunner import get_script_run_ctx
+except ImportError:
+    get_script_run_ctx = None
 import datetime
 import plotly.express as px
+import numpy as np
 import pandas as pd
+from collections import namedtuple
 from decimal import Decimal
-from datetime import datetime
+from datetime import date as date_type, datetime, timedelta, timezone
 
 def log_debug(message):
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     with open("sabga_debug_log.txt", "a") as f:
         f.write(f"[{timestamp}] {message}\n")
 
-# Global query counter
+# Global query counter (process-wide; the per-rerun breakdown lives in get_query_profile())
 query_count = 0
 
+# Queries slower than this are written to the debug log (override with st.secrets["diagnostics"]["slow_query_ms"])
+DEFAULT_SLOW_QUERY_MS = 500
+
+# Default number of pooled connections if st.secrets["database"]["pool_size"] is not set
+DEFAULT_POOL_SIZE = 5
+
+# Rows per multi-row INSERT in bulk_insert() (override with st.secrets["database"]["insert_chunk_size"])
+DEFAULT_INSERT_CHUNK_SIZE = 500
+
+# Holds the connection shared by every create_connection() call in the current rerun
+_rerun_state = threading.local()
+
+@st.cache_resource
+def get_connection_pool():
+    """
+    Process-wide MySQL connection pool, built once and shared by all sessions.
+    Pool size is read from st.secrets["database"]["pool_size"].
+    """
+    db = st.secrets["database"]
+    return mysql.connector.pooling.MySQLConnectionPool(
+        pool_name="sabga_pool",
+        pool_size=int(db.get("pool_size", DEFAULT_POOL_SIZE)),
+        pool_reset_session=True,
+        host=db["host"],
+        user=db["user"],
+        password=db["password"],
+        database=db["database"]
+    )
+
+def get_slow_query_threshold_ms():
+    try:
+        return float(st.secrets.get("diagnostics", {}).get("slow_query_ms", DEFAULT_SLOW_QUERY_MS))
+    except Exception:
+        return DEFAULT_SLOW_QUERY_MS
+
+class ProfiledCursor:
+    """
+    Cursor wrapper that records every statement run through it:
+    SQL, calling function, wall time (execute + fetch) and rows returned.
+    """
+    def __init__(self, cursor, query_log, connection=None):
+        self._cursor = cursor
+        self._query_log = query_log
+        self._connection = connection
+        self._entry = None
+
+    def __getattr__(self, name):
+        return getattr(self._cursor, name)
+
+    def __iter__(self):
+        return iter(self._cursor)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _run(self, method, operation, args, kwargs):
+        global query_count
+        caller = sys._getframe(2).f_code.co_name
+        sql = " ".join(str(operation).split())
+        if self._connection is not None and not _is_read_statement(sql):
+            self._connection.dirty = True
+        start = time.perf_counter()
+        try:
+            return method(operation, *args, **kwargs)
+        finally:
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            rows = self._cursor.rowcount if self._cursor.rowcount and self._cursor.rowcount > 0 else 0
+            self._entry = {
+                "Caller": caller,
+                "SQL": sql,
+                "Ms": elapsed_ms,
+                "Rows": rows,
+            }
+            self._query_log.append(self._entry)
+            query_count += 1
+            # Statements with a result set are checked once it has been fetched
+            if not getattr(self._cursor, "with_rows", False):
+                self._check_slow()
+
+    def _fetched(self, start, rows, done=True):
+        if self._entry is not None:
+            self._entry["Ms"] += (time.perf_counter() - start) * 1000
+            self._entry["Rows"] = max(self._entry["Rows"], rows)
+            if done:
+                self._check_slow()
+
+    def _check_slow(self):
+        if self._entry.get("Logged") or self._entry["Ms"] < get_slow_query_threshold_ms():
+            return
+        self._entry["Logged"] = True
+        log_debug(f"SLOW QUERY {self._entry['Ms']:.0f} ms, {self._entry['Rows']} rows, in {self._entry['Caller']}: {self._entry['SQL'][:500]}")
+
+    def execute(self, operation, *args, **kwargs):
+        return self._run(self._cursor.execute, operation, args, kwargs)
+
+    def executemany(self, operation, *args, **kwargs):
+        return self._run(self._cursor.executemany, operation, args, kwargs)
+
+    def fetchall(self):
+        start = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self._fetched(start, len(rows))
+        return rows
+
+    def fetchmany(self, *args, **kwargs):
+        start = time.perf_counter()
+        rows = self._cursor.fetchmany(*args, **kwargs)
+        if self._entry is not None:
+            self._fetched(start, self._entry["Rows"] + len(rows), done=not rows)
+        return rows
+
+    def fetchone(self):
+        start = time.perf_counter()
+        row = self._cursor.fetchone()
+        if self._entry is not None:
+            self._fetched(start, self._entry["Rows"] + (1 if row is not None else 0), done=row is None)
+        return row
+
+def _is_read_statement(sql):
+    return sql.lstrip("(").upper().startswith(("SELECT", "SHOW", "EXPLAIN", "DESCRIBE", "SET ", "WITH"))
+
+# Ping the server on checkout only if the connection has been idle at least this long
+HEALTH_CHECK_IDLE_SECONDS = 30
+
+# A rerun connection nobody has used for this long goes back to the pool
+IDLE_RELEASE_SECONDS = 5
+
+# Every RerunConnection not yet released, across all threads
+_open_connections = set()
+_open_connections_lock = threading.Lock()
+
+class RerunConnection:
+    """
+    Wraps one pooled connection shared by every create_connection() call in a rerun.
+
+    close() only ends the caller's scope. A nested caller (one that checks the connection
+    out while an outer caller has uncommitted writes) runs inside a SAVEPOINT: its commit()
+    is left to the outer caller and its rollback() undoes only its own writes.
+    The connection goes back to the pool when the next rerun starts, when it has sat
+    idle for IDLE_RELEASE_SECONDS, or when the script thread finishes.
+    """
+    def __init__(self, cnx, query_log):
+        self._cnx = cnx
+        self._scopes = []
+        self._lock = threading.Lock()
+        self._finalizer = None
+        self.query_log = query_log
+        self.dirty = False
+        self.released = False
+        self.last_used = time.monotonic()
+
+    def __getattr__(self, name):
+        return getattr(self._cnx, name)
+
+    def cursor(self, *args, **kwargs):
+        # Buffered by default: callers share this connection, so a half-read
+        # result set in one function must not block queries in the next
+        if not args:
+            kwargs.setdefault("buffered", True)
+        return ProfiledCursor(self._cnx.cursor(*args, **kwargs), self.query_log, self)
+
+    def _execute(self, statement):
+        cursor = self._cnx.cursor()
+        cursor.execute(statement)
+        cursor.close()
+
+    def checkout(self):
+        with self._lock:
+            if self.released:
+                return None
+            outermost = not self._scopes
+            savepoint = f"rerun_scope_{len(self._scopes)}" if self._scopes and self.dirty else None
+            self._scopes.append({"savepoint": savepoint, "committed": False})
+
+        # Health check (a server round trip) only after the connection sat idle
+        if outermost and time.monotonic() - self.last_used > HEALTH_CHECK_IDLE_SECONDS:
+            if not self._cnx.is_connected():
+                self._cnx.reconnect(attempts=2, delay=0)
+                _prepare_session(self._cnx)
+        if savepoint:
+            self._execute(f"SAVEPOINT {savepoint}")
+        self.last_used = time.monotonic()
+        return self
+
+    def commit(self):
+        scope = self._scopes[-1] if self._scopes else None
+        if scope and scope["savepoint"]:
+            # Part of the outer caller's transaction, which commits everything
+            scope["committed"] = True
+            return
+        self._cnx.commit()
+        self.dirty = False
+
+    def rollback(self):
+        scope = self._scopes[-1] if self._scopes else None
+        if scope and scope["savepoint"]:
+            self._execute(f"ROLLBACK TO SAVEPOINT {scope['savepoint']}")
+            return
+        self._cnx.rollback()
+        self.dirty = False
+
+    def close(self):
+        with self._lock:
+            scope = self._scopes.pop() if self._scopes else None
+        self.last_used = time.monotonic()
+        if self.released or scope is None:
+            return
+        if scope["savepoint"]:
+            # Closing without commit discards this caller's writes, as on a connection of its own
+            if not scope["committed"]:
+                self._execute(f"ROLLBACK TO SAVEPOINT {scope['savepoint']}")
+            self._execute(f"RELEASE SAVEPOINT {scope['savepoint']}")
+        elif not self._scopes and self._cnx.in_transaction:
+            # Match the old behaviour of closing without commit
+            self._cnx.rollback()
+            self.dirty = False
+
+    def release(self, idle_for=None):
+        """
+        Roll back anything uncommitted and return the connection to the pool; safe to call twice.
+        With idle_for (seconds), only if no caller holds it and it has been unused that long.
+        """
+        with self._lock:
+            if self.released:
+                return False
+            if idle_for is not None and (self._scopes or time.monotonic() - self.last_used < idle_for):
+                return False
+            self.released = True
+            self._scopes = []
+        if self._finalizer is not None:
+            self._finalizer.detach()
+        with _open_connections_lock:
+            _open_connections.discard(self)
+        try:
+            if self._cnx.in_transaction:
+                self._cnx.rollback()
+            self._cnx.close()
+        except mysql.connector.Error:
+            pass
+        return True
+
+def release_idle_connections(idle_for=IDLE_RELEASE_SECONDS):
+    """Return rerun connections that no caller holds and that sat unused for idle_for seconds to the pool."""
+    with _open_connections_lock:
+        candidates = list(_open_connections)
+    return sum(1 for shared in candidates if shared.release(idle_for=idle_for))
+
+def _prepare_session(cnx):
+    # Each statement sees the latest committed data even if a caller leaves a transaction open
+    cursor = cnx.cursor()
+    cursor.execute("SET SESSION TRANSACTION ISOLATION LEVEL READ COMMITTED")
+    cursor.close()
+
+def _checkout_pooled_connection():
+    pool = get_connection_pool()
+    try:
+        cnx = pool.get_connection()
+    except mysql.connector.errors.PoolError:
+        cnx = None
+        # Pool exhausted: take back connections of finished reruns before giving up on it
+        if release_idle_connections(idle_for=0):
+            try:
+                cnx = pool.get_connection()
+            except mysql.connector.errors.PoolError:
+                cnx = None
+    if cnx is None:
+        # Still exhausted: fall back to a one-off connection rather than failing the page
+        db = st.secrets["database"]
+        cnx = mysql.connector.connect(
+            host=db["host"],
+            user=db["user"],
+            password=db["password"],
+            database=db["database"]
+        )
+    cnx.ping(reconnect=True, attempts=2, delay=0)
+    _prepare_session(cnx)
+    return cnx
+
+def _current_run_marker():
+    """An object Streamlit replaces at the start of every rerun (None outside a script run)."""
+    if get_script_run_ctx is None:
+        return None
+    ctx = get_script_run_ctx(suppress_warning=True)
+    return getattr(ctx, "cursors", None) if ctx is not None else None
+
+def begin_run_if_new():
+    """
+    Reset this thread's per-rerun state (connection, query log, DataVersion counters)
+    if a new rerun has started since it was last used. Streamlit runs successive
+    reruns of a session on the same script thread, so thread-local state alone
+    would carry over from one rerun to the next.
+    """
+    marker = _current_run_marker()
+    if hasattr(_rerun_state, "query_log") and getattr(_rerun_state, "run_marker", None) is marker:
+        return
+    release_rerun_connection()
+    _rerun_state.data_versions = None
+    _rerun_state.query_log = []
+    _rerun_state.run_marker = marker
+
+def release_rerun_connection():
+    """Return this thread's connection to the pool now, rolling back anything uncommitted."""
+    shared = getattr(_rerun_state, "connection", None)
+    if shared is not None:
+        shared.release()
+    _rerun_state.connection = None
+
 def create_connection():
     """
     Return a live MySQL connection.
-    Auto-reconnects on cursor creation via execute_query helper.
+    All calls within one rerun share a single pooled connection, so
+    conn.close() in callers is cheap and does not drop the TCP session.
     """
     try:
-        conn = mysql.connector.connect(
-            host=st.secrets["database"]["host"],
-            user=st.secrets["database"]["user"],
-            password=st.secrets["database"]["password"],
-            database=st.secrets["database"]["database"]
-        )
-        return conn
+        begin_run_if_new()
+        shared = getattr(_rerun_state, "connection", None)
+        checked_out = shared.checkout() if shared is not None else None
+        if checked_out is None:
+            release_idle_connections()
+            shared = RerunConnection(_checkout_pooled_connection(), _rerun_state.query_log)
+            _rerun_state.connection = shared
+            with _open_connections_lock:
+                _open_connections.add(shared)
+            # Return the connection to the pool if this script thread ends first
+            shared._finalizer = weakref.finalize(threading.current_thread(), shared.release)
+            checked_out = shared.checkout()
+        return checked_out
     except mysql.connector.Error as e:
+        _rerun_state.connection = None
         st.error(f"Error connecting to MySQL: {e}")
         return None
 
+def get_query_profile():
+    """
+    Return the statements recorded so far in this rerun as a DataFrame
+    with columns Caller, SQL, Ms and Rows.
+    """
+    begin_run_if_new()
+    return pd.DataFrame(_rerun_state.query_log, columns=["Caller", "SQL", "Ms", "Rows"])
+
+def show_query_diagnostics():
+    """
+    Sidebar panel summarising the queries run during this rerun, grouped by calling function.
+    Call it at the end of a page so it covers everything that page rendered.
+    """
+    df = get_query_profile()
+    with st.sidebar.expander(f"Query diagnostics ({len(df)} queries)"):
+        if df.empty:
+            st.write("No queries recorded in this run.")
+            return
+
+        st.metric("Total DB time (ms)", f"{df['Ms'].sum():.0f}")
+        st.caption(f"Slow-query threshold: {get_slow_query_threshold_ms():.0f} ms (logged to sabga_debug_log.txt)")
+
+        by_caller = (
+            df.groupby("Caller")
+            .agg(Queries=("SQL", "count"), Ms=("Ms", "sum"), Rows=("Rows", "sum"))
+            .sort_values("Ms", ascending=False)
+            .reset_index()
+        )
+        st.write("By function:")
+        st.dataframe(by_caller.style.format({"Ms": "{:.1f}"}), hide_index=True)
+
+        st.write("Slowest statements:")
+        slowest = df.sort_values("Ms", ascending=False).head(10)
+        st.dataframe(slowest.style.format({"Ms": "{:.1f}"}), hide_index=True)
+
+def get_insert_chunk_size():
+    try:
+        return int(st.secrets["database"].get("insert_chunk_size", DEFAULT_INSERT_CHUNK_SIZE))
+    except Exception:
+        return DEFAULT_INSERT_CHUNK_SIZE
+
+def bulk_insert(cursor, table, columns, rows, chunk_size=None):
+    """
+    Insert many rows with multi-row INSERT ... VALUES statements, chunk_size rows per round trip.
+    rows is a list of tuples in the same order as columns. Does not commit.
+    Returns the number of rows written.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+
+    chunk_size = chunk_size or get_insert_chunk_size()
+    column_sql = ", ".join(columns)
+    row_placeholders = "(" + ", ".join(["%s"] * len(columns)) + ")"
+
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        query = f"INSERT INTO {table} ({column_sql}) VALUES " + ", ".join([row_placeholders] * len(chunk))
+        params = [value for row in chunk for value in row]
+        cursor.execute(query, params)
+
+    return len(rows)
+
+# ------------------------------------------------------------------
+# Data versions
+# DataVersion holds a counter per match type, per series and one global
+# counter. Every write path bumps the counters it touches in the same
+# transaction as the write; read functions decorated with
+# cached_by_data_version() are cached under (function, args, version),
+# so unchanged data is served from memory and a write is visible on
+# the next read. The table is created by migration 4 in migrations.py.
+# ------------------------------------------------------------------
+_VERSIONED_READERS = {}
+
+# MySQL error number for "Table doesn't exist"
+ER_NO_SUCH_TABLE = 1146
+
+def get_data_versions():
+    """
+    All DataVersion counters as {(Scope, ScopeID): Version}, read once per rerun.
+    Returns None if the table is not there yet (caching is then bypassed).
+    """
+    begin_run_if_new()
+    versions = getattr(_rerun_state, "data_versions", None)
+    if versions is None:
+        conn = create_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT Scope, ScopeID, Version FROM DataVersion")
+            versions = {(scope, scope_id): version for scope, scope_id, version in cursor.fetchall()}
+            # The global scope is never written: it changes whenever any other counter does
+            versions[("global", 0)] = sum(version for (scope, _), version in versions.items() if scope != "global")
+        except mysql.connector.Error as e:
+            log_debug(f"DataVersion unavailable, reads are not cached: {e}")
+            versions = False
+        finally:
+            cursor.close()
+            conn.close()
+        _rerun_state.data_versions = versions
+    return versions or None
+
+def get_data_version(scope, scope_id=0):
+    """Current version of one scope ("matchtype", "series" or "global"), or None if unavailable."""
+    versions = get_data_versions()
+    if versions is None:
+        return None
+    return versions.get((scope, int(scope_id)), 0)
+
+def reset_data_versions():
+    """
+    Forget the DataVersion counters and the query log of this rerun and hand its connection back to the pool.
+    Long-running workers call this at the start of each cycle to see writes from other processes.
+    """
+    begin_run_if_new()
+    release_rerun_connection()
+    _rerun_state.data_versions = None
+    _rerun_state.query_log.clear()
+
+def bump_data_version(cursor, match_type_ids=(), series_ids=(), reference=False):
+    """
+    Bump the counters of the given match types, every series containing them
+    and the given series; with reference=True also the reference-data scope
+    (Players, MatchType, Series, AppSettings). The global version is derived from
+    these in get_data_versions(), so writers never contend on one shared row.
+    Runs in the caller's transaction; does not commit.
+    """
+    match_type_ids = sorted({int(mt_id) for mt_id in match_type_ids if mt_id is not None})
+    series_ids = {int(s_id) for s_id in series_ids if s_id is not None}
+    try:
+        if match_type_ids:
+            placeholders = ", ".join(["%s"] * len(match_type_ids))
+            cursor.execute(
+                f"SELECT DISTINCT SeriesID FROM SeriesMatchTypes WHERE MatchTypeID IN ({placeholders})",
+                tuple(match_type_ids)
+            )
+            series_ids.update(row[0] for row in cursor.fetchall())
+
+        # Always in the same order, so concurrent writers lock the rows in the same order
+        keys = [("matchtype", mt_id) for mt_id in match_type_ids] + [("series", s_id) for s_id in sorted(series_ids)]
+        if reference:
+            keys.append(("reference", 0))
+        if not keys:
+            return
+        cursor.execute(
+            "INSERT INTO DataVersion (Scope, ScopeID, Version) VALUES "
+            + ", ".join(["(%s, %s, 1)"] * len(keys))
+            + " ON DUPLICATE KEY UPDATE Version = Version + 1",
+            [value for key in keys for value in key]
+        )
+    except mysql.connector.Error as e:
+        # A missing DataVersion table must not block the write itself; lock waits and deadlocks must
+        if e.errno != ER_NO_SUCH_TABLE:
+            raise
+        log_debug(f"Could not bump DataVersion: {e}")
+    finally:
+        _rerun_state.data_versions = None
+
+def _is_plain(value):
+    return value is None or isinstance(value, (int, float, str, bool, Decimal, datetime, date_type, tuple))
+
+@st.cache_data(max_entries=1000, show_spinner=False)
+def _cached_read(reader_name, version, args, kwargs):
+    return _VERSIONED_READERS[reader_name](*args, **dict(kwargs))
+
+def cached_by_data_version(scope, id_arg=0, fallback=None, error_message=None):
+    """
+    Decorator for read functions: cache the result under (function, args, data_version).
+    scope is "matchtype" or "series" (the ID is positional argument id_arg), or an unkeyed
+    scope such as "global" or "reference" (pass id_arg=None).
+    Calls with non-plain arguments (e.g. a SeriesSnapshot) run uncached.
+    Readers let their errors escape, so a failed read is never cached. With fallback (a
+    callable), the wrapper logs the error, shows error_message (if given) with st.error and
+    returns fallback() instead of raising.
+    The undecorated function is available as .uncached, and its cache key as .reader_name.
+    """
+    def decorator(func):
+        reader_name = f"{func.__module__}.{func.__qualname__}"
+        _VERSIONED_READERS[reader_name] = func
+
+        def read(args, kwargs):
+            if not all(_is_plain(value) for value in list(args) + list(kwargs.values())):
+                return func(*args, **kwargs)
+            scope_id = 0 if scope == "global" or id_arg is None else args[id_arg]
+            version = get_data_version(scope, scope_id)
+            if version is None:
+                return func(*args, **kwargs)
+            return _cached_read(reader_name, version, tuple(args), tuple(sorted(kwargs.items())))
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if fallback is None:
+                return read(args, kwargs)
+            try:
+                return read(args, kwargs)
+            except Exception as e:
+                log_debug(f"❌ Error in {func.__name__}: {e}")
+                if error_message:
+                    st.error(f"{error_message}: {e}")
+                return fallback()
+
+        wrapper.uncached = func
+        wrapper.reader_name = reader_name
+        return wrapper
+    return decorator
+
+@cached_by_data_version("series")
+def fetch_series_rows(series_id, query, params):
+    """fetchall() of one query over a series' data, cached until that series' data version changes."""
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+# ------------------------------------------------------------------
+# Reference data
+# Players, MatchType, Series and AppSettings change rarely but are
+# looked up on almost every page. load_reference_data() reads all four
+# into id -> name/nickname/identifier maps, shared by every session and
+# reloaded only after a write bumps the "reference" data version.
+# ------------------------------------------------------------------
+@cached_by_data_version("reference", id_arg=None)
+def load_reference_data():
+    """
+    Returns a dict of lookup maps:
+        players:      {PlayerID: (Name, Nickname)}
+        match_types:  {MatchTypeID: (MatchTypeTitle, Identifier, Active)}
+        series:       {SeriesID: SeriesTitle}
+        email_checker_enabled: AppSettings.EmailCheckerEnabled, or None if AppSettings is empty
+    """
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT PlayerID, Name, Nickname FROM Players")
+        players = {pid: (name, nickname) for pid, name, nickname in cursor.fetchall()}
+
+        cursor.execute("SELECT MatchTypeID, MatchTypeTitle, Identifier, Active FROM MatchType")
+        match_types = {mt_id: (title, identifier, active) for mt_id, title, identifier, active in cursor.fetchall()}
+
+        cursor.execute("SELECT SeriesID, SeriesTitle FROM Series")
+        series = {s_id: title for s_id, title in cursor.fetchall()}
+
+        cursor.execute("SELECT EmailCheckerEnabled FROM AppSettings LIMIT 1")
+        row = cursor.fetchone()
+
+        return {
+            "players": players,
+            "match_types": match_types,
+            "series": series,
+            "email_checker_enabled": row[0] if row else None,
+        }
+    finally:
+        cursor.close()
+        conn.close()
+
+def get_player_nicknames():
+    """{PlayerID: Nickname} from the reference cache."""
+    return {pid: nickname for pid, (_, nickname) in load_reference_data()["players"].items()}
+
+def get_player_choices():
+    """[(PlayerID, Name, Nickname)] ordered by Name, from the reference cache."""
+    players = load_reference_data()["players"]
+    return sorted(((pid, name, nickname) for pid, (name, nickname) in players.items()),
+                  key=lambda p: (p[1] or "", p[0]))
+
+def get_series_choices():
+    """[(SeriesID, SeriesTitle)], newest series first, from the reference cache."""
+    return sorted(load_reference_data()["series"].items(), reverse=True)
+
+def get_match_type_choices():
+    """[(MatchTypeID, MatchTypeTitle)] ordered by title, from the reference cache."""
+    match_types = load_reference_data()["match_types"]
+    return sorted(((mt_id, title) for mt_id, (title, _, _) in match_types.items()),
+                  key=lambda mt: (mt[1] or "", mt[0]))
+
+# ------------------------------------------------------------------
+# Series registry
+# Everything a series page shows besides results: its title, dates,
+# rules link, overview, layout, season and leagues in tab order. Kept
+# in Series and SeriesMatchTypes (columns added by migration 12) and
+# read for every series with one query, cached until a write bumps the
+# "reference" data version, so adding a series is a data change.
+# ------------------------------------------------------------------
+SERIES_LAYOUT_LEAGUES = "leagues"
+SERIES_LAYOUT_SORTING = "sorting"
+
+SeriesLeague = namedtuple("SeriesLeague", ["tab_name", "match_type_id", "match_type_title", "identifier"])
+
+class SeriesPage(namedtuple("SeriesPage", [
+    "series_id", "title", "page_title", "start_date", "end_date", "rules_url", "rules_label",
+    "overview", "layout", "listed", "season_id", "leagues",
+])):
+    __slots__ = ()
+
+    @property
+    def label(self):
+        """Name shown in the series pickers, e.g. "2026 - Series 3"."""
+        return self.page_title or self.title
+
+    @property
+    def short_label(self):
+        return self.label.split(" - ", 1)[-1]
+
+    @property
+    def match_type_ids(self):
+        """{tab name: MatchTypeID} in tab order."""
+        return {league.tab_name: league.match_type_id for league in self.leagues}
+
+    def days_left(self, today=None):
+        if self.end_date is None:
+            return 0
+        return max((self.end_date - (today or date_type.today())).days, 0)
+
+@cached_by_data_version("reference", id_arg=None)
+def load_series_registry():
+    """
+    Every series with its page settings, season and shown leagues, from one query:
+        series:  {SeriesID: SeriesPage}, leagues in tab order
+        seasons: {SeasonID: (label, [SeriesID, ...])}; the label is the year of the season's last EndDate
+    """
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT s.SeriesID, s.SeriesTitle, s.PageTitle, s.StartDate, s.EndDate, s.RulesUrl, s.RulesLabel,
+                   s.Overview, s.PageLayout, s.Listed, ss.SeasonID,
+                   smt.MatchTypeID, smt.TabName, mt.MatchTypeTitle, mt.Identifier
+            FROM Series s
+            LEFT JOIN (SELECT SeriesID, MIN(SeasonID) AS SeasonID
+                       FROM SeasonSeries GROUP BY SeriesID) ss ON ss.SeriesID = s.SeriesID
+            LEFT JOIN SeriesMatchTypes smt ON smt.SeriesID = s.SeriesID AND smt.ShowTab = 1
+            LEFT JOIN MatchType mt ON mt.MatchTypeID = smt.MatchTypeID
+            ORDER BY s.SeriesID, smt.TabOrder IS NULL, smt.TabOrder, smt.MatchTypeID
+        """)
+        rows = cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+    series = {}
+    leagues = {}
+    for row in rows:
+        series_id = row[0]
+        if series_id not in series:
+            series[series_id] = row[:11]
+            leagues[series_id] = []
+        match_type_id, tab_name, match_type_title, identifier = row[11:]
+        if match_type_id is not None:
+            leagues[series_id].append(SeriesLeague(tab_name or match_type_title, match_type_id, match_type_title, identifier))
+
+    series = {
+        series_id: SeriesPage(series_id, title, page_title, start_date, end_date, rules_url, rules_label,
+                              overview, layout or SERIES_LAYOUT_LEAGUES, bool(listed), season_id,
+                              tuple(leagues[series_id]))
+        for series_id, (_, title, page_title, start_date, end_date, rules_url, rules_label,
+                        overview, layout, listed, season_id) in series.items()
+    }
+
+    by_season = {}
+    for page in series.values():
+        if page.season_id is not None:
+            by_season.setdefault(page.season_id, []).append(page)
+    seasons = {}
+    for season_id, pages in by_season.items():
+        end_dates = [page.end_date for page in pages if page.end_date]
+        label = str(max(end_dates).year) if end_dates else f"Season {season_id}"
+        seasons[season_id] = (label, sorted(page.series_id for page in pages))
+    return {"series": series, "seasons": seasons}
+
+def get_series_page(series_id):
+    """The SeriesPage for series_id from the registry, or None."""
+    return load_series_registry()["series"].get(series_id)
+
+def get_listed_series():
+    """The SeriesPages shown on the public pages, newest series first."""
+    pages = load_series_registry()["series"].values()
+    return sorted((page for page in pages if page.listed), key=lambda page: page.series_id, reverse=True)
+
+def get_current_series():
+    """
+    The newest listed SeriesPage, else the newest series in the database (before any
+    series has been listed, e.g. right after migration 12), or None if there are none.
+    """
+    listed = get_listed_series()
+    if listed:
+        return listed[0]
+    pages = load_series_registry()["series"]
+    return pages[max(pages)] if pages else None
+
+def get_series_page_by_label(label):
+    return next((page for page in load_series_registry()["series"].values() if page.label == label), None)
+
+def get_season_choices():
+    """[(label, SeasonID)], newest season first."""
+    seasons = load_series_registry()["seasons"]
+    return sorted(((label, season_id) for season_id, (label, _) in seasons.items()),
+                  key=lambda season: season[1], reverse=True)
+
+def get_season_series_ids(label):
+    """SeriesIDs of the season(s) with this label, e.g. "2025"."""
+    return [series_id for season_label, series_ids in load_series_registry()["seasons"].values()
+            if season_label == label for series_id in series_ids]
+
 def safe_float(value):
     """Convert Decimal or string to float safely and format to 2 decimal places."""
     try:
@@ -43,56 +778,24 @@ def safe_float(value):
     except (ValueError, TypeError):
         return "-"
 
+@cached_by_data_version("global", fallback=pd.DataFrame)
 def get_player_pr_for_season(season_id):
     conn = create_connection()
     cursor = conn.cursor()
 
     try:
         cursor.execute("""
-            WITH PlayerPR AS (
-                -- Player1 rows
-                SELECT 
-                    mr.MatchResultID,
-                    mr.MatchTypeID,
-                    smt.SeriesID,
-                    s.SeriesTitle,
-                    ss.SeasonID,
-                    mr.Player1ID AS PlayerID,
-                    mr.Player1PR AS PlayerPR
-                FROM MatchResults mr
-                JOIN SeriesMatchTypes smt ON smt.MatchTypeID = mr.MatchTypeID
-                JOIN SeasonSeries ss ON ss.SeriesID = smt.SeriesID
-                JOIN Series s ON s.SeriesID = smt.SeriesID
-                WHERE mr.Player1PR IS NOT NULL
-
-                UNION ALL
-
-                -- Player2 rows
-                SELECT 
-                    mr.MatchResultID,
-                    mr.MatchTypeID,
-                    smt.SeriesID,
-                    s.SeriesTitle,
-                    ss.SeasonID,
-                    mr.Player2ID AS PlayerID,
-                    mr.Player2PR AS PlayerPR
-                FROM MatchResults mr
-                JOIN SeriesMatchTypes smt ON smt.MatchTypeID = mr.MatchTypeID
-                JOIN SeasonSeries ss ON ss.SeriesID = smt.SeriesID
-                JOIN Series s ON s.SeriesID = smt.SeriesID
-                WHERE mr.Player2PR IS NOT NULL
-            )
-
             SELECT
                 p.Name AS PlayerName,
-                pp.SeriesID,
-                pp.SeriesTitle,
-                pp.PlayerPR,
-                pp.SeasonID
-            FROM PlayerPR pp
-            JOIN Players p ON p.PlayerID = pp.PlayerID
-            WHERE pp.SeasonID = %s
-            ORDER BY p.Name, pp.SeriesID;
+                f.SeriesID,
+                s.SeriesTitle,
+                f.PR AS PlayerPR,
+                f.SeasonID
+            FROM PlayerMatchFacts f
+            JOIN Players p ON p.PlayerID = f.PlayerID
+            JOIN Series s ON s.SeriesID = f.SeriesID
+            WHERE f.SeasonID = %s AND f.PR IS NOT NULL
+            ORDER BY p.Name, f.SeriesID;
         """, (season_id,))
 
         rows = cursor.fetchall()
@@ -103,10 +806,6 @@ def get_player_pr_for_season(season_id):
         ])
         return df
 
-    except Exception as e:
-        print("Error fetching Player PR for Season:", e)
-        return pd.DataFrame()
-
     finally:
         cursor.close()
         conn.close()
@@ -209,6 +908,9 @@ def insert_match_result_admin(
             None,
             fixture_id
         ))
+        match_result_id = cursor.lastrowid
+        sync_player_match_facts(cursor, [match_result_id])
+        append_completed_matches(cursor, [match_result_id])
 
         # Mark fixture completed
         update_query = """
@@ -218,6 +920,9 @@ def insert_match_result_admin(
         """
 
         cursor.execute(update_query, (fixture_id,))
+        sync_remaining_fixtures(cursor, [fixture_id])
+        bump_data_version(cursor, [match_type_id])
+        enqueue_refresh(cursor, [match_type_id])
 
         conn.commit()
 
@@ -351,6 +1056,8 @@ def get_average_pr_by_league_and_seriess():
         cursor.close()
         conn.close()
 
+@cached_by_data_version("global", fallback=lambda: (pd.DataFrame(), pd.DataFrame(), pd.DataFrame()),
+                        error_message="❌ Error loading award leaders")
 def get_annual_pr_and_luck_leaders(min_matches=5):
     conn = create_connection()
     cursor = conn.cursor()
@@ -358,16 +1065,11 @@ def get_annual_pr_and_luck_leaders(min_matches=5):
     try:
         # Player of the Year - lowest average PR
         cursor.execute("""
-            SELECT PlayerName, COUNT(*) as Matches, AVG(
-                CASE 
-                    WHEN Player1ID = p.PlayerID THEN Player1PR 
-                    WHEN Player2ID = p.PlayerID THEN Player2PR 
-                END
-            ) as AvgPR
-            FROM CompletedMatchesCache c
-            JOIN Players p ON p.PlayerID IN (c.Player1ID, c.Player2ID)
-            WHERE (p.PlayerID = c.Player1ID OR p.PlayerID = c.Player2ID)
-            GROUP BY PlayerName
+            SELECT p.Name, COUNT(*) as Matches, AVG(f.PR) as AvgPR
+            FROM PlayerMatchFacts f
+            JOIN Players p ON p.PlayerID = f.PlayerID
+            WHERE f.SeriesID IS NOT NULL
+            GROUP BY f.PlayerID, p.Name
             HAVING Matches >= %s
             ORDER BY AvgPR ASC
             LIMIT 10
@@ -376,16 +1078,11 @@ def get_annual_pr_and_luck_leaders(min_matches=5):
 
         # Unluckiest Player - lowest average Luck
         cursor.execute("""
-            SELECT PlayerName, COUNT(*) as Matches, AVG(
-                CASE 
-                    WHEN Player1ID = p.PlayerID THEN Player1Luck 
-                    WHEN Player2ID = p.PlayerID THEN Player2Luck 
-                END
-            ) as AvgLuck
-            FROM CompletedMatchesCache c
-            JOIN Players p ON p.PlayerID IN (c.Player1ID, c.Player2ID)
-            WHERE (p.PlayerID = c.Player1ID OR p.PlayerID = c.Player2ID)
-            GROUP BY PlayerName
+            SELECT p.Name, COUNT(*) as Matches, AVG(f.Luck) as AvgLuck
+            FROM PlayerMatchFacts f
+            JOIN Players p ON p.PlayerID = f.PlayerID
+            WHERE f.SeriesID IS NOT NULL
+            GROUP BY f.PlayerID, p.Name
             HAVING Matches >= %s
             ORDER BY AvgLuck ASC
             LIMIT 10
@@ -396,17 +1093,11 @@ def get_annual_pr_and_luck_leaders(min_matches=5):
         A_LEAGUE_IDS = [19, 30, 39]  # Update based on actual MatchTypeIDs for A-League
         format_ids = ','.join(str(mid) for mid in A_LEAGUE_IDS)
         cursor.execute(f"""
-            SELECT PlayerName, COUNT(*) as Matches, AVG(
-                CASE 
-                    WHEN Player1ID = p.PlayerID THEN Player1PR 
-                    WHEN Player2ID = p.PlayerID THEN Player2PR 
-                END
-            ) as AvgPR
-            FROM CompletedMatchesCache c
-            JOIN Players p ON p.PlayerID IN (c.Player1ID, c.Player2ID)
-            WHERE MatchTypeID IN ({format_ids})
-              AND (p.PlayerID = c.Player1ID OR p.PlayerID = c.Player2ID)
-            GROUP BY PlayerName
+            SELECT p.Name, COUNT(*) as Matches, AVG(f.PR) as AvgPR
+            FROM PlayerMatchFacts f
+            JOIN Players p ON p.PlayerID = f.PlayerID
+            WHERE f.MatchTypeID IN ({format_ids})
+            GROUP BY f.PlayerID, p.Name
             HAVING Matches >= %s
             ORDER BY AvgPR ASC
             LIMIT 10
@@ -415,9 +1106,6 @@ def get_annual_pr_and_luck_leaders(min_matches=5):
 
         return pr_leaders, luck_leaders, aleague_champion
 
-    except Exception as e:
-        st.error(f"❌ Error loading award leaders: {e}")
-        return pd.DataFrame(), pd.DataFrame(), pd.DataFrame()
     finally:
         cursor.close()
         conn.close()
@@ -488,12 +1176,8 @@ def show_season_statistics_page(season_choice):
     st.write("PR trend columns:", pr_trend_df.columns.tolist())
     st.write(pr_trend_df.head())
 
-    # Map of which series (by SeriesID) belong to which season year
-    relevant_series_ids = {
-        "2025": [5, 6, 7],   # Series 1, 2, 3
-        "2024": [4]          # Sorting League
-    }
-    selected_ids = relevant_series_ids.get(str(season_year), [])
+    # Series of this season, from the series registry
+    selected_ids = get_season_series_ids(str(season_year))
 
     if not selected_ids:
         st.warning(f"No Series found for Season {season_year}")
@@ -540,20 +1224,11 @@ def show_season_statistics_page(season_choice):
     st.dataframe(pivot_df, width="stretch")
 
 def show_series_statistics_page(series_choice):
-    series_map = {
-        "2026 - Series 2": 11,
-        "2026 - Series 1": 10,
-        "2025 - Series 4": 8,
-        "2025 - Series 3": 7,
-        "2025 - Series 2": 6,
-        "2025 - Series 1": 5,
-        "2024 - Sorting League": 4
-    }
-    series_id = series_map.get(series_choice)
-
-    if series_id is None:
+    series = get_series_page_by_label(series_choice)
+    if series is None:
         st.error("Invalid series selected.")
         return
+    series_id = series.series_id
 
     st.subheader(f"📊 Series Statistics for {series_choice}")
     conn = create_connection()
@@ -578,16 +1253,14 @@ def show_series_statistics_page(series_choice):
 
         # 2️⃣ Top 10 Avg PR
         cursor.execute("""
-            SELECT p.Name, mt.MatchTypeTitle, COUNT(mr.MatchResultID) AS Games, ROUND(AVG(CASE WHEN mr.Player1ID = p.PlayerID THEN mr.Player1PR
-                                          WHEN mr.Player2ID = p.PlayerID THEN mr.Player2PR ELSE NULL END), 2) AS AvgPR
-            FROM MatchResults mr
-            JOIN MatchType mt ON mr.MatchTypeID = mt.MatchTypeID
-            JOIN Fixtures f ON mr.FixtureID = f.FixtureID
-            JOIN Players p ON (p.PlayerID = f.Player1ID OR p.PlayerID = f.Player2ID)
+            SELECT p.Name, mt.MatchTypeTitle, COUNT(*) AS Games, ROUND(AVG(f.PR), 2) AS AvgPR
+            FROM PlayerMatchFacts f
+            JOIN MatchType mt ON f.MatchTypeID = mt.MatchTypeID
+            JOIN Players p ON p.PlayerID = f.PlayerID
             WHERE f.MatchTypeID IN (
                 SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s
             )
-            GROUP BY p.PlayerID
+            GROUP BY f.PlayerID
             HAVING COUNT(*) >= 2
             ORDER BY AvgPR ASC
             LIMIT 10;
@@ -600,16 +1273,14 @@ def show_series_statistics_page(series_choice):
 
         # 3️⃣ Top 10 individual PRs (best single-game performance)
         cursor.execute("""
-            SELECT p.Name, mt.MatchTypeTitle, mr.Date,
-                   CASE WHEN p.PlayerID = mr.Player1ID THEN mr.Player1PR ELSE mr.Player2PR END AS PR
-            FROM MatchResults mr
-            JOIN Fixtures f ON mr.FixtureID = f.FixtureID
-            JOIN Players p ON (p.PlayerID = mr.Player1ID OR p.PlayerID = mr.Player2ID)
+            SELECT p.Name, mt.MatchTypeTitle, f.Date, f.PR
+            FROM PlayerMatchFacts f
+            JOIN Players p ON p.PlayerID = f.PlayerID
             JOIN MatchType mt ON f.MatchTypeID = mt.MatchTypeID
             WHERE f.MatchTypeID IN (
                 SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s
             )
-            ORDER BY PR ASC
+            ORDER BY f.PR ASC
             LIMIT 10
         """, (series_id,))
         df_top_pr = pd.DataFrame(cursor.fetchall(), columns=["Player", "League", "Date", "PR"])
@@ -619,16 +1290,14 @@ def show_series_statistics_page(series_choice):
 
         # 4️⃣ Luckiest players
         cursor.execute("""
-            SELECT p.Name, mt.MatchTypeTitle, count(mr.MatchResultID) as Played, ROUND(AVG(CASE WHEN p.PlayerID = mr.Player1ID THEN mr.Player1Luck
-                                          WHEN p.PlayerID = mr.Player2ID THEN mr.Player2Luck ELSE NULL END), 2) AS AvgLuck
-            FROM MatchResults mr
-            JOIN Fixtures f ON mr.FixtureID = f.FixtureID
-            JOIN Players p ON (p.PlayerID = f.Player1ID OR p.PlayerID = f.Player2ID)
+            SELECT p.Name, mt.MatchTypeTitle, COUNT(*) AS Played, ROUND(AVG(f.Luck), 2) AS AvgLuck
+            FROM PlayerMatchFacts f
+            JOIN Players p ON p.PlayerID = f.PlayerID
             JOIN MatchType mt ON f.MatchTypeID = mt.MatchTypeID
             WHERE f.MatchTypeID IN (
                 SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s
             )
-            GROUP BY p.PlayerID
+            GROUP BY f.PlayerID
             HAVING COUNT(*) >= 2
             ORDER BY AvgLuck DESC
             LIMIT 10
@@ -640,16 +1309,14 @@ def show_series_statistics_page(series_choice):
 
         # 5️⃣ Unluckiest players
         cursor.execute("""
-            SELECT p.Name, mt.MatchTypeTitle, count(mr.MatchResultID) as Played, ROUND(AVG(CASE WHEN p.PlayerID = mr.Player1ID THEN mr.Player1Luck
-                                          WHEN p.PlayerID = mr.Player2ID THEN mr.Player2Luck ELSE NULL END), 2) AS AvgLuck
-            FROM MatchResults mr
-            JOIN Fixtures f ON mr.FixtureID = f.FixtureID
-            JOIN Players p ON (p.PlayerID = f.Player1ID OR p.PlayerID = f.Player2ID)
+            SELECT p.Name, mt.MatchTypeTitle, COUNT(*) AS Played, ROUND(AVG(f.Luck), 2) AS AvgLuck
+            FROM PlayerMatchFacts f
+            JOIN Players p ON p.PlayerID = f.PlayerID
             JOIN MatchType mt ON f.MatchTypeID = mt.MatchTypeID
             WHERE f.MatchTypeID IN (
                 SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s
             )
-            GROUP BY p.PlayerID
+            GROUP BY f.PlayerID
             HAVING COUNT(*) >= 2
             ORDER BY AvgLuck ASC
             LIMIT 10
@@ -662,12 +1329,8 @@ def show_series_statistics_page(series_choice):
 
         # 6️⃣ Visual: Average PR per MatchType (Group)
         cursor.execute("""
-            SELECT mt.MatchTypeTitle,
-                   ROUND(AVG(CASE WHEN p.PlayerID = mr.Player1ID THEN mr.Player1PR
-                                  WHEN p.PlayerID = mr.Player2ID THEN mr.Player2PR ELSE NULL END), 2) AS AvgPR
-            FROM MatchResults mr
-            JOIN Fixtures f ON mr.FixtureID = f.FixtureID
-            JOIN Players p ON (p.PlayerID = mr.Player1ID OR p.PlayerID = mr.Player2ID)
+            SELECT mt.MatchTypeTitle, ROUND(AVG(f.PR), 2) AS AvgPR
+            FROM PlayerMatchFacts f
             JOIN MatchType mt ON f.MatchTypeID = mt.MatchTypeID
             WHERE f.MatchTypeID IN (
                 SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s
@@ -703,24 +1366,19 @@ def show_player_summary_tab():
         cursor = conn.cursor()
 
         # Player selector
-        cursor.execute("SELECT PlayerID, Name, Nickname FROM Players ORDER BY Name")
-        players = cursor.fetchall()
+        players = get_player_choices()
         player_options = {f"{name} ({nickname})": pid for pid, name, nickname in players}
         selected_player = st.selectbox("Select a player:", list(player_options.keys()))
         player_id = player_options[selected_player]
 
         # 1️⃣ Current Form (Last 5)
         cursor.execute("""
-            SELECT
-                CASE WHEN Player1ID = %s THEN Player1PR ELSE Player2PR END,
-                CASE WHEN Player1ID = %s THEN Player1Luck ELSE Player2Luck END,
-                CASE WHEN (Player1ID = %s AND Player1Points > Player2Points) OR
-                          (Player2ID = %s AND Player2Points > Player1Points) THEN 1 ELSE 0 END
-            FROM MatchResults
-            WHERE Player1ID = %s OR Player2ID = %s
+            SELECT PR, Luck, Won
+            FROM PlayerMatchFacts
+            WHERE PlayerID = %s
             ORDER BY Date DESC, MatchResultID DESC
             LIMIT 5
-        """, (player_id, player_id, player_id, player_id, player_id, player_id))
+        """, (player_id,))
         last5 = cursor.fetchall()
         pr_last5 = [float(row[0]) for row in last5 if isinstance(row[0], (int, float))]
         luck_last5 = [float(row[1]) for row in last5 if isinstance(row[1], (int, float))]
@@ -738,14 +1396,10 @@ def show_player_summary_tab():
 
         # 2️⃣ This Year Summary
         cursor.execute("""
-            SELECT COUNT(*),
-                   SUM(CASE WHEN (Player1ID = %s AND Player1Points > Player2Points) OR
-                                 (Player2ID = %s AND Player2Points > Player1Points) THEN 1 ELSE 0 END),
-                   AVG(CASE WHEN Player1ID = %s THEN Player1PR WHEN Player2ID = %s THEN Player2PR END),
-                   AVG(CASE WHEN Player1ID = %s THEN Player1Luck WHEN Player2ID = %s THEN Player2Luck END)
-            FROM MatchResults
-            WHERE (Player1ID = %s OR Player2ID = %s) AND YEAR(Date) = YEAR(CURDATE())
-        """, (player_id, player_id, player_id, player_id, player_id, player_id, player_id, player_id))
+            SELECT COUNT(*), SUM(Won), AVG(PR), AVG(Luck)
+            FROM PlayerMatchFacts
+            WHERE PlayerID = %s AND Date >= MAKEDATE(YEAR(CURDATE()), 1)
+        """, (player_id,))
         year_matches, year_wins, year_avg_pr, year_avg_luck = cursor.fetchone()
         year_matches = int(year_matches or 0)
         year_wins = int(year_wins or 0)
@@ -763,14 +1417,10 @@ def show_player_summary_tab():
 
         # 3️⃣ Career Summary
         cursor.execute("""
-            SELECT COUNT(*),
-                   SUM(CASE WHEN (Player1ID = %s AND Player1Points > Player2Points) OR
-                                 (Player2ID = %s AND Player2Points > Player1Points) THEN 1 ELSE 0 END),
-                   AVG(CASE WHEN Player1ID = %s THEN Player1PR WHEN Player2ID = %s THEN Player2PR END),
-                   AVG(CASE WHEN Player1ID = %s THEN Player1Luck WHEN Player2ID = %s THEN Player2Luck END)
-            FROM MatchResults
-            WHERE Player1ID = %s OR Player2ID = %s
-        """, (player_id, player_id, player_id, player_id, player_id, player_id, player_id, player_id))
+            SELECT COUNT(*), SUM(Won), AVG(PR), AVG(Luck)
+            FROM PlayerMatchFacts
+            WHERE PlayerID = %s
+        """, (player_id,))
         career_matches, career_wins, career_avg_pr, career_avg_luck = cursor.fetchone()
         career_matches = int(career_matches or 0)
         career_wins = int(career_wins or 0)
@@ -789,21 +1439,18 @@ def show_player_summary_tab():
         # 5️⃣ Per MatchType Summary Table
         cursor.execute("""
             SELECT mt.StartDate, mt.MatchTypeTitle, 
-                   COUNT(mr.MatchResultID) AS Games,
-                   SUM(CASE WHEN (mr.Player1ID = %s AND mr.Player1Points > mr.Player2Points) OR
-                                (mr.Player2ID = %s AND mr.Player2Points > mr.Player1Points) THEN 1 ELSE 0 END) AS Wins,
-                   SUM(CASE WHEN (mr.Player1ID = %s AND mr.Player1Points < mr.Player2Points) OR
-                                (mr.Player2ID = %s AND mr.Player2Points < mr.Player1Points) THEN 1 ELSE 0 END) AS Losses,
-                   ROUND(AVG(CASE WHEN mr.Player1ID = %s THEN mr.Player1PR WHEN mr.Player2ID = %s THEN mr.Player2PR END), 2) AS AvgPR,
-                   ROUND(AVG(CASE WHEN mr.Player1ID = %s THEN mr.Player1Luck WHEN mr.Player2ID = %s THEN mr.Player2Luck END), 2) AS AvgLuck,
-                   SUM(CASE WHEN (mr.Player1ID = %s AND mr.Player1PR < mr.Player2PR) OR
-                                (mr.Player2ID = %s AND mr.Player2PR < mr.Player1PR) THEN 1 ELSE 0 END) AS PRWins
-            FROM MatchResults mr
-            JOIN MatchType mt ON mr.MatchTypeID = mt.MatchTypeID
-            WHERE mr.Player1ID = %s OR mr.Player2ID = %s
+                   COUNT(*) AS Games,
+                   SUM(f.Won) AS Wins,
+                   SUM(CASE WHEN f.Points < f.OppPoints THEN 1 ELSE 0 END) AS Losses,
+                   ROUND(AVG(f.PR), 2) AS AvgPR,
+                   ROUND(AVG(f.Luck), 2) AS AvgLuck,
+                   SUM(f.PRWon) AS PRWins
+            FROM PlayerMatchFacts f
+            JOIN MatchType mt ON f.MatchTypeID = mt.MatchTypeID
+            WHERE f.PlayerID = %s
             GROUP BY mt.MatchTypeTitle
             ORDER BY mt.StartDate DESC 
-        """, (player_id,) * 12)
+        """, (player_id,))
         per_mt = cursor.fetchall()
         if per_mt:
             per_mt_df = pd.DataFrame(per_mt, columns=[
@@ -822,12 +1469,11 @@ def show_player_summary_tab():
             
         # 6️⃣ PR Over Time with Rolling Avg
         cursor.execute("""
-            SELECT Date, MatchResultID,
-                   CASE WHEN Player1ID = %s THEN Player1PR ELSE Player2PR END
-            FROM MatchResults
-            WHERE (Player1ID = %s OR Player2ID = %s) AND Date IS NOT NULL
+            SELECT Date, MatchResultID, PR
+            FROM PlayerMatchFacts
+            WHERE PlayerID = %s AND Date IS NOT NULL
             ORDER BY Date ASC, MatchResultID ASC
-        """, (player_id, player_id, player_id))
+        """, (player_id,))
         pr_data = cursor.fetchall()
         if pr_data:
             pr_df = pd.DataFrame([
@@ -853,32 +1499,22 @@ def show_player_summary_tab():
 
 
         # 4️⃣ Completed Matches Table
-        params = (player_id,) * 9   # <- corrected to 9, because the query has 9 %s placeholders
-        assert len(params) == 9, f"Expected 9 params, got {len(params)}: {params}"
         cursor.execute("""
             SELECT
-                mr.Date,
+                f.Date,
                 mt.MatchTypeTitle,
-                CASE WHEN (mr.Player1ID = %s AND mr.Player1Points > mr.Player2Points) OR
-                          (mr.Player2ID = %s AND mr.Player2Points > mr.Player1Points) THEN 'Won' ELSE 'Lost' END AS Result,
-                CASE WHEN mr.Player1ID = %s THEN p2.Name ELSE p1.Name END AS Opponent,
-                CONCAT(
-                    '11-',
-                    CASE WHEN (mr.Player1ID = %s AND mr.Player1Points > mr.Player2Points) THEN mr.Player2Points
-                         WHEN (mr.Player2ID = %s AND mr.Player2Points > mr.Player1Points) THEN mr.Player1Points
-                         ELSE LEAST(mr.Player1Points, mr.Player2Points) END
-                ) AS Score,
-                ROUND(CASE WHEN mr.Player1ID = %s THEN mr.Player1PR ELSE mr.Player2PR END, 2) AS PR,
-                ROUND(CASE WHEN mr.Player1ID = %s THEN mr.Player1Luck ELSE mr.Player2Luck END, 2) AS Luck
-            FROM MatchResults mr
-            JOIN Fixtures f ON mr.FixtureID = f.FixtureID
+                CASE WHEN f.Won = 1 THEN 'Won' ELSE 'Lost' END AS Result,
+                opp.Name AS Opponent,
+                CONCAT('11-', CASE WHEN f.Won = 1 THEN f.OppPoints ELSE LEAST(f.Points, f.OppPoints) END) AS Score,
+                ROUND(f.PR, 2) AS PR,
+                ROUND(f.Luck, 2) AS Luck
+            FROM PlayerMatchFacts f
             JOIN MatchType mt ON f.MatchTypeID = mt.MatchTypeID
-            JOIN Players p1 ON mr.Player1ID = p1.PlayerID
-            JOIN Players p2 ON mr.Player2ID = p2.PlayerID
-            WHERE mr.Player1ID = %s OR mr.Player2ID = %s
-            ORDER BY mr.Date DESC
+            JOIN Players opp ON f.OpponentID = opp.PlayerID
+            WHERE f.PlayerID = %s
+            ORDER BY f.Date DESC
             LIMIT 50
-        """, params)
+        """, (player_id,))
 
         matches = cursor.fetchall()
         if matches:
@@ -1508,46 +2144,71 @@ def show_player_summary_tab1():
     except Exception as e:
         st.error(f"Error loading player stats: {e}")
 
+# Column lists for the stats/cache tables rebuilt by the refresh functions
+MATCHTYPE_STATS_COLUMNS = [
+    "MatchTypeID", "PlayerID", "GamesPlayed", "Wins", "Losses", "Points",
+    "WinPercentage", "PRWins", "AveragePR", "AverageLuck", "HeadToHeadScore"
+]
+SERIES_STATS_COLUMNS = ["SeriesID"] + MATCHTYPE_STATS_COLUMNS[1:]
+MATCHTYPE_COMPLETED_CACHE_COLUMNS = [
+    "MatchTypeID", "FixtureID", "Player1ID", "Player2ID",
+    "Player1Name", "Player2Name",
+    "Player1Points", "Player2Points",
+    "Player1PR", "Player2PR",
+    "Player1Luck", "Player2Luck",
+    "Winner", "Date", "TimeCompleted", "LastUpdated"
+]
+SERIES_COMPLETED_CACHE_COLUMNS = ["SeriesID"] + MATCHTYPE_COMPLETED_CACHE_COLUMNS
+
+# SeriesRemainingFixturesCache holds one row per open fixture per series of its match type.
+# Every write that opens or closes a fixture calls sync_remaining_fixtures in its own
+# transaction, so the cache is always exact; update_remaining_fixtures_by_series is a repair.
+def remaining_fixtures_insert_sql(where):
+    """INSERT ... SELECT of the cache rows for the open Fixtures rows matching `where` (alias f)."""
+    return f"""
+        INSERT INTO SeriesRemainingFixturesCache
+            (SeriesID, MatchTypeID, FixtureID, Player1Name, Player2Name, LastUpdated)
+        SELECT smt.SeriesID, f.MatchTypeID, f.FixtureID, p1.Name, p2.Name, NOW()
+        FROM Fixtures f
+        JOIN SeriesMatchTypes smt ON smt.MatchTypeID = f.MatchTypeID
+        JOIN Players p1 ON f.Player1ID = p1.PlayerID
+        JOIN Players p2 ON f.Player2ID = p2.PlayerID
+        WHERE f.Completed = 0 AND {where}
+    """
+
+def sync_remaining_fixtures(cursor, fixture_ids):
+    """
+    Rewrites the SeriesRemainingFixturesCache rows of the given FixtureIDs: completed fixtures
+    drop out, open (new, reopened or edited) ones are inserted. Call it in the same transaction
+    as the Fixtures write; it does not commit.
+    """
+    fixture_ids = [int(f_id) for f_id in fixture_ids if f_id is not None]
+    if not fixture_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(fixture_ids))
+    cursor.execute(f"DELETE FROM SeriesRemainingFixturesCache WHERE FixtureID IN ({placeholders})",
+                   tuple(fixture_ids))
+    cursor.execute(remaining_fixtures_insert_sql(f"f.FixtureID IN ({placeholders})"), tuple(fixture_ids))
+
 def update_remaining_fixtures_by_series(series_id):
-    import datetime
+    """Repair command: rebuild SeriesRemainingFixturesCache for one series from Fixtures."""
     conn = create_connection()
     cursor = conn.cursor()
     try:
-        print(f"[{datetime.datetime.now()}] Updating SeriesRemainingFixturesCache for SeriesID {series_id}...")
+        log_debug(f"Rebuilding SeriesRemainingFixturesCache for SeriesID {series_id}...")
 
         cursor.execute("DELETE FROM SeriesRemainingFixturesCache WHERE SeriesID = %s", (series_id,))
+        cursor.execute(remaining_fixtures_insert_sql("smt.SeriesID = %s"), (series_id,))
+        rebuilt = cursor.rowcount
 
-        cursor.execute("SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s", (series_id,))
-        matchtypes = cursor.fetchall()
-
-        if not matchtypes:
-            print(f"No match types found for SeriesID {series_id}.")
-            return
-
-        insert_query = """
-            INSERT INTO SeriesRemainingFixturesCache (
-                SeriesID, MatchTypeID, Player1Name, Player2Name, LastUpdated
-            ) VALUES (%s, %s, %s, %s, NOW())
-        """
-
-        for (matchtype_id,) in matchtypes:
-            cursor.execute("""
-                SELECT p1.Name, p2.Name
-                FROM Fixtures f
-                JOIN Players p1 ON f.Player1ID = p1.PlayerID
-                JOIN Players p2 ON f.Player2ID = p2.PlayerID
-                WHERE f.MatchTypeID = %s AND f.Completed = 0
-            """, (matchtype_id,))
-            fixtures = cursor.fetchall()
-
-            for row in fixtures:
-                cursor.execute(insert_query, (series_id, matchtype_id, row[0], row[1]))
-
+        bump_data_version(cursor, series_ids=[series_id])
         conn.commit()
-        print(f"✅ SeriesRemainingFixturesCache updated for SeriesID {series_id}.")
+        log_debug(f"✅ SeriesRemainingFixturesCache rebuilt for SeriesID {series_id} ({rebuilt} fixtures).")
 
     except Exception as e:
-        print(f"❌ Error in update_remaining_fixtures_by_series: {e}")
+        conn.rollback()
+        log_debug(f"❌ Error in update_remaining_fixtures_by_series: {e}")
+        raise
     finally:
         cursor.close()
         conn.close()
@@ -1558,9 +2219,6 @@ def show_cached_remaining_fixtures_by_series(series_id):
     Groups fixtures by MatchTypeTitle.
     """
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-
         query = """
             SELECT 
                 srf.MatchTypeID,
@@ -1572,10 +2230,7 @@ def show_cached_remaining_fixtures_by_series(series_id):
             WHERE srf.SeriesID = %s
             ORDER BY mt.MatchTypeTitle, srf.Player1Name, srf.Player2Name
         """
-        cursor.execute(query, (series_id,))
-        rows = cursor.fetchall()
-        cursor.close()
-        conn.close()
+        rows = fetch_series_rows(series_id, query, (series_id,))
 
         if not rows:
             st.subheader("No remaining fixtures for this series.")
@@ -1622,51 +2277,58 @@ def show_cached_remaining_fixtures_by_series(series_id):
     except Exception as e:
         st.error(f"Error displaying cached remaining fixtures: {e}")
 
-def show_cached_matches_completed(match_type_id):
-    """
-    Displays completed matches for a given MatchTypeID using the MatchTypeCompletedCache table.
-    Uses the Winner field to determine match orientation accurately.
-    """
+@cached_by_data_version("matchtype")
+def _query_matchtype_completed_matches(match_type_id):
+    """MatchTypeCompletedCache rows for show_cached_matches_completed(), newest first."""
     conn = create_connection()
     cursor = conn.cursor()
-
-    query = """
-        SELECT 
-            Date,
-            Player1Name,
-            Player1ID,
-            Player2Name,
-            Player2ID,
-            Player1Points,
-            Player2Points,
-            Player1PR,
-            Player1Luck,
-            Player2PR,
-            Player2Luck,
-            Winner
-        FROM MatchTypeCompletedCache
-        WHERE MatchTypeID = %s
-        ORDER BY Date DESC
+    try:
+        cursor.execute("""
+            SELECT 
+                Date,
+                Player1Name,
+                Player1ID,
+                Player2Name,
+                Player2ID,
+                Player1Points,
+                Player2Points,
+                Player1PR,
+                Player1Luck,
+                Player2PR,
+                Player2Luck,
+                Winner
+            FROM MatchTypeCompletedCache
+            WHERE MatchTypeID = %s
+            ORDER BY Date DESC
+        """, (match_type_id,))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+def show_cached_matches_completed(match_type_id, snapshot=None):
     """
-    cursor.execute(query, (match_type_id,))
-    rows = cursor.fetchall()
-    conn.close()
+    Displays completed matches for a given MatchTypeID using the MatchTypeCompletedCache table
+    (or the results in snapshot, if given).
+    Uses the Winner field to determine match orientation accurately.
+    """
+    if snapshot is not None:
+        _render_completed_matches(snapshot.completed_matches(match_type_id),
+                                  {pid: nick for pid, (_, nick) in snapshot.players.items()})
+        return
 
+    rows = _query_matchtype_completed_matches(match_type_id)
     if not rows:
         st.warning("No completed matches found for this match type.")
         return
 
-    # Fetch nicknames once
-    nickname_lookup = {}
-    try:
-        conn = create_connection()
-        cur = conn.cursor()
-        cur.execute("SELECT PlayerID, Nickname FROM Players")
-        for pid, nick in cur.fetchall():
-            nickname_lookup[pid] = nick
-    finally:
-        cur.close()
-        conn.close()
+    _render_completed_matches(rows, get_player_nicknames())
+
+def _render_completed_matches(rows, nickname_lookup):
+    """Completed-matches table for show_cached_matches_completed()."""
+    if not rows:
+        st.warning("No completed matches found for this match type.")
+        return
 
     data = []
     for row in rows:
@@ -1929,209 +2591,302 @@ def refresh_matchtype_statsz(match_type_id):
         cursor.close()
         conn.close()
 
-def refresh_matchtype_stats(match_type_id,conn = None):
-    import datetime, sys
+# ------------------------------------------------------------------
+# Head-to-head tiebreak engine
+# Clusters of players level on (Points, Wins, PRWins) are separated by a
+# mini-league over the results between them, recursing into sub-groups
+# that are still level. Works on an in-memory result list, so a whole
+# refresh needs one results query instead of one per pair.
+# ------------------------------------------------------------------
+
+def _mini_league_order(results, player_ids):
+    """
+    Order player_ids by wins against each other, best first, as a list of groups.
+    A group that is still level (and smaller than the whole set) is re-resolved
+    using only the results between its own members.
+    """
     from collections import defaultdict
 
-    # ✅ Detect whether we were given a connection
-    close_conn = False
+    members = set(player_ids)
+    wins = {pid: 0 for pid in player_ids}
+    own_results = []
+    for p1, p2, p1_pts, p2_pts in results:
+        if p1 in members and p2 in members:
+            own_results.append((p1, p2, p1_pts, p2_pts))
+            if p1_pts > p2_pts:
+                wins[p1] += 1
+            elif p2_pts > p1_pts:
+                wins[p2] += 1
+
+    groups = defaultdict(list)
+    for pid in player_ids:
+        groups[wins[pid]].append(pid)
+
+    ordered = []
+    for w in sorted(groups, reverse=True):
+        group = groups[w]
+        if 1 < len(group) < len(player_ids):
+            ordered.extend(_mini_league_order(own_results, group))
+        else:
+            ordered.append(group)
+    return ordered
 
-    if conn is None:
-        conn = create_connection()
-        close_conn = True
+def resolve_h2h_tiebreak(results, player_ids):
+    """
+    H2H scores for one tied cluster.
+    results is an iterable of (Player1ID, Player2ID, Player1Points, Player2Points).
+    Each player's score is the number of cluster members they finish ahead of
+    (for a two-way tie: 1 for the winner of their match, 0 for the loser).
+    """
+    player_ids = list(player_ids)
+    if len(player_ids) < 2:
+        return {pid: 0 for pid in player_ids}
+
+    scores = {}
+    remaining = len(player_ids)
+    for group in _mini_league_order(results, player_ids):
+        remaining -= len(group)
+        for pid in group:
+            scores[pid] = remaining
+    return scores
+
+def resolve_all_h2h_clusters(stats_dict, results):
+    """
+    Fill HeadToHeadScore in stats_dict (PlayerID -> stats) for every tied
+    (Points, Wins, PRWins) cluster, using the already loaded results.
+    Returns the number of tied clusters.
+    """
+    from collections import defaultdict
 
-    cursor = conn.cursor()
+    clusters = defaultdict(list)
+    for pid, stats in stats_dict.items():
+        clusters[(stats["Points"], stats["Wins"], stats["PRWins"])].append(pid)
 
-    try:
-        print(f"⚡ Refreshing MatchType stats for MatchTypeID {match_type_id}...")
+    tied = [pids for pids in clusters.values() if len(pids) >= 2]
+    for pids in tied:
+        for pid, score in resolve_h2h_tiebreak(results, pids).items():
+            stats_dict[pid]["HeadToHeadScore"] = score
+    return len(tied)
 
-        # Clear existing stats
-        cursor.execute("DELETE FROM MatchTypePlayerStats WHERE MatchTypeID = %s", (match_type_id,))
+def compute_h2h_scores(cursor, match_type_ids, player_ids):
+    """
+    H2H scores for one cluster, fetching only the results between its members in a single query.
+    """
+    player_ids = list(player_ids)
+    if len(player_ids) < 2 or not match_type_ids:
+        return {pid: 0 for pid in player_ids}
+
+    mt_placeholders = ", ".join(["%s"] * len(match_type_ids))
+    p_placeholders = ", ".join(["%s"] * len(player_ids))
+    cursor.execute(f"""
+        SELECT Player1ID, Player2ID, Player1Points, Player2Points
+        FROM MatchResults
+        WHERE MatchTypeID IN ({mt_placeholders})
+          AND Player1ID IN ({p_placeholders})
+          AND Player2ID IN ({p_placeholders})
+    """, (*match_type_ids, *player_ids, *player_ids))
+    return resolve_h2h_tiebreak(cursor.fetchall(), player_ids)
 
-        # Step 1: Calculate base stats for all players with Fixtures in this MatchType
-        base_query = """
-            SELECT
-                p.PlayerID,
-                COUNT(DISTINCT mr.MatchResultID) AS GamesPlayed,
-                SUM(CASE WHEN (p.PlayerID = mr.Player1ID AND mr.Player1Points > mr.Player2Points)
-                          OR (p.PlayerID = mr.Player2ID AND mr.Player2Points > mr.Player1Points)
-                         THEN 1 ELSE 0 END) AS Wins,
-                SUM(CASE WHEN (p.PlayerID = mr.Player1ID AND mr.Player1Points < mr.Player2Points)
-                          OR (p.PlayerID = mr.Player2ID AND mr.Player2Points < mr.Player1Points)
-                         THEN 1 ELSE 0 END) AS Losses,
-                AVG(CASE WHEN p.PlayerID = mr.Player1ID THEN mr.Player1PR
-                         WHEN p.PlayerID = mr.Player2ID THEN mr.Player2PR ELSE NULL END) AS AvgPR,
-                AVG(CASE WHEN p.PlayerID = mr.Player1ID THEN mr.Player1Luck
-                         WHEN p.PlayerID = mr.Player2ID THEN mr.Player2Luck ELSE NULL END) AS AvgLuck,
-                SUM(CASE WHEN (p.PlayerID = mr.Player1ID AND mr.Player1PR < mr.Player2PR)
-                          OR (p.PlayerID = mr.Player2ID AND mr.Player2PR < mr.Player1PR)
-                         THEN 1 ELSE 0 END) AS PRWins
-            FROM Players p
-            JOIN Fixtures f ON (f.Player1ID = p.PlayerID OR f.Player2ID = p.PlayerID)
-            LEFT JOIN MatchResults mr ON f.FixtureID = mr.FixtureID AND f.MatchTypeID = mr.MatchTypeID
-            WHERE f.MatchTypeID = %s
-            GROUP BY p.PlayerID
-        """
-        cursor.execute(base_query, (match_type_id,))
-        player_stats = cursor.fetchall()
+def aggregate_player_stats(player_ids, results, walkovers=()):
+    """
+    Build the standings dict (PlayerID -> stats) for one league from raw rows.
+    results: (Player1ID, Player2ID, Player1Points, Player2Points, Player1PR, Player2PR, Player1Luck, Player2Luck)
+    walkovers: (WinnerID, LoserID)
+    AvgPR/AvgLuck are weighted by games (NULLs skipped, like SQL AVG). HeadToHeadScore is left at 0.
+    """
+    sums = {}
+
+    def entry(pid):
+        if pid not in sums:
+            sums[pid] = {"GamesPlayed": 0, "Wins": 0, "Losses": 0, "PRWins": 0,
+                         "WalkoverGames": 0, "WalkoverPoints": 0,
+                         "PRSum": 0.0, "PRCount": 0, "LuckSum": 0.0, "LuckCount": 0}
+        return sums[pid]
+
+    for pid in player_ids:
+        entry(pid)
+
+    for p1, p2, p1_pts, p2_pts, p1_pr, p2_pr, p1_luck, p2_luck in results:
+        for me, pts, opp_pts, pr, opp_pr, luck in (
+            (p1, p1_pts, p2_pts, p1_pr, p2_pr, p1_luck),
+            (p2, p2_pts, p1_pts, p2_pr, p1_pr, p2_luck),
+        ):
+            e = entry(me)
+            e["GamesPlayed"] += 1
+            if pts > opp_pts:
+                e["Wins"] += 1
+            elif pts < opp_pts:
+                e["Losses"] += 1
+            if pr is not None and opp_pr is not None and pr < opp_pr:
+                e["PRWins"] += 1
+            if pr is not None:
+                e["PRSum"] += float(pr)
+                e["PRCount"] += 1
+            if luck is not None:
+                e["LuckSum"] += float(luck)
+                e["LuckCount"] += 1
+
+    for winner_id, loser_id in walkovers:
+        entry(winner_id)["WalkoverGames"] += 1
+        entry(winner_id)["WalkoverPoints"] += 2
+        entry(loser_id)["WalkoverGames"] += 1
+
+    stats_dict = {}
+    for pid, e in sums.items():
+        games = e["GamesPlayed"]
+        stats_dict[pid] = {
+            "GamesPlayed": games + e["WalkoverGames"],
+            "Wins": e["Wins"],
+            "Losses": e["Losses"],
+            "AvgPR": e["PRSum"] / e["PRCount"] if e["PRCount"] else None,
+            "AvgLuck": e["LuckSum"] / e["LuckCount"] if e["LuckCount"] else None,
+            "PRWins": e["PRWins"],
+            "Points": e["Wins"] * 2 + e["PRWins"] + e["WalkoverPoints"],
+            "WinPct": (e["Wins"] / games) * 100 if games > 0 else 0,
+            "HeadToHeadScore": 0
+        }
+    return stats_dict
 
-        # Build stats dictionary
-        stats_dict = {}
-        for row in player_stats:
-            player_id, games, wins, losses, avg_pr, avg_luck, pr_wins = row
-            points = (wins * 2) + (pr_wins or 0)
-            win_pct = (wins / games) * 100 if games > 0 else 0
-            stats_dict[player_id] = {
-                "GamesPlayed": games,
-                "Wins": wins,
-                "Losses": losses,
-                "AvgPR": avg_pr,
-                "AvgLuck": avg_luck,
-                "PRWins": pr_wins,
-                "Points": points,
-                "WinPct": win_pct,
-                "HeadToHeadScore": 0
-            }
+def _scan_league_rows(cursor, match_type_ids):
+    """
+    One scan of Fixtures and one of MatchResults for all match_type_ids.
+    Returns (players_by_mt, result_rows): the set of PlayerIDs with a fixture in each
+    match type, and every result joined to its fixture, player names and MatchTypeTitle.
+    """
+    from collections import defaultdict
 
-        print(f"✅ Calculated base stats for {len(stats_dict)} players.")
+    placeholders = ", ".join(["%s"] * len(match_type_ids))
 
-        # Step 1b: Include walkovers
-        cursor.execute("""
-            SELECT WinnerID, LoserID
-            FROM Walkovers
-            WHERE MatchTypeID = %s
-        """, (match_type_id,))
-        walkovers = cursor.fetchall()
+    # Every player with a fixture gets a row, even before their first match
+    cursor.execute(f"""
+        SELECT MatchTypeID, Player1ID, Player2ID
+        FROM Fixtures
+        WHERE MatchTypeID IN ({placeholders})
+    """, tuple(match_type_ids))
+    players_by_mt = defaultdict(set)
+    for mt_id, p1, p2 in cursor.fetchall():
+        players_by_mt[mt_id].update((p1, p2))
+
+    # One scan of the results feeds the stats and the H2H tiebreaks
+    cursor.execute(f"""
+        SELECT
+            mr.MatchTypeID, mr.FixtureID, mr.Player1ID, mr.Player2ID,
+            mr.Player1Points, mr.Player2Points,
+            mr.Player1PR, mr.Player2PR,
+            mr.Player1Luck, mr.Player2Luck,
+            f.Player1ID, f.Player2ID, p1.Name, p2.Name,
+            mr.Date, mr.TimeCompleted, mt.MatchTypeTitle
+        FROM MatchResults mr
+        JOIN Fixtures f ON mr.FixtureID = f.FixtureID AND mr.MatchTypeID = f.MatchTypeID
+        JOIN Players p1 ON f.Player1ID = p1.PlayerID
+        JOIN Players p2 ON f.Player2ID = p2.PlayerID
+        JOIN MatchType mt ON mt.MatchTypeID = mr.MatchTypeID
+        WHERE mr.MatchTypeID IN ({placeholders})
+    """, tuple(match_type_ids))
+    return players_by_mt, cursor.fetchall()
+
+def _rebuild_matchtype_stats(cursor, match_type_ids):
+    """
+    Rebuild MatchTypePlayerStats for all match_type_ids from one scan each of
+    Fixtures, MatchResults and Walkovers. Does not commit.
+    Returns {MatchTypeID: number of players written}.
+    """
+    from collections import defaultdict
 
-        for winner_id, loser_id in walkovers:
-            # Ensure winner entry exists
-            if winner_id not in stats_dict:
-                stats_dict[winner_id] = {
-                    "GamesPlayed": 0, "Wins": 0, "Losses": 0,
-                    "AvgPR": None, "AvgLuck": None, "PRWins": 0,
-                    "Points": 0, "WinPct": 0, "HeadToHeadScore": 0
-                }
-            stats_dict[winner_id]["Points"] += 2
-            stats_dict[winner_id]["GamesPlayed"] += 1
+    match_type_ids = list(match_type_ids)
+    if not match_type_ids:
+        return {}
+    placeholders = ", ".join(["%s"] * len(match_type_ids))
+
+    players_by_mt, result_rows = _scan_league_rows(cursor, match_type_ids)
+
+    results_by_mt = defaultdict(list)
+    for row in result_rows:
+        results_by_mt[row[0]].append(row[2:10])
+
+    cursor.execute(f"""
+        SELECT MatchTypeID, WinnerID, LoserID
+        FROM Walkovers
+        WHERE MatchTypeID IN ({placeholders})
+    """, tuple(match_type_ids))
+    walkovers_by_mt = defaultdict(list)
+    for mt_id, winner_id, loser_id in cursor.fetchall():
+        walkovers_by_mt[mt_id].append((winner_id, loser_id))
+
+    stats_rows = []
+    written = {}
+    for mt_id in match_type_ids:
+        results = results_by_mt[mt_id]
+        stats_dict = aggregate_player_stats(players_by_mt[mt_id], results, walkovers_by_mt[mt_id])
+        resolve_all_h2h_clusters(stats_dict, [r[:4] for r in results])
+        for player_id, s in stats_dict.items():
+            stats_rows.append((
+                mt_id, player_id, s["GamesPlayed"], s["Wins"], s["Losses"], s["Points"],
+                s["WinPct"], s["PRWins"], s["AvgPR"], s["AvgLuck"], s["HeadToHeadScore"]
+            ))
+        written[mt_id] = len(stats_dict)
 
-            # Ensure loser entry exists
-            if loser_id not in stats_dict:
-                stats_dict[loser_id] = {
-                    "GamesPlayed": 0, "Wins": 0, "Losses": 0,
-                    "AvgPR": None, "AvgLuck": None, "PRWins": 0,
-                    "Points": 0, "WinPct": 0, "HeadToHeadScore": 0
-                }
-            stats_dict[loser_id]["GamesPlayed"] += 1
+    cursor.execute(f"DELETE FROM MatchTypePlayerStats WHERE MatchTypeID IN ({placeholders})", tuple(match_type_ids))
+    bulk_insert(cursor, "MatchTypePlayerStats", MATCHTYPE_STATS_COLUMNS, stats_rows)
 
-        # Step 2: Identify clusters for H2H tiebreaking
-        clusters = defaultdict(list)
-        for pid, stats in stats_dict.items():
-            key = (stats["Points"], stats["Wins"], stats["PRWins"])
-            clusters[key].append(pid)
+    bump_data_version(cursor, match_type_ids)
+    return written
 
-        tied_clusters = {k: v for k, v in clusters.items() if len(v) >= 2}
-        print(f"🎯 {len(tied_clusters)} clusters have ties requiring H2H calculation")
+def refresh_matchtype_stats(match_type_id,conn = None):
+    # ✅ Given a connection: join the caller's transaction, no commit here, errors propagate
+    if conn is not None:
+        cursor = conn.cursor()
+        try:
+            _rebuild_matchtype_stats(cursor, [match_type_id])
+        finally:
+            cursor.close()
+        return
 
-        # Step 3: Calculate H2H Scores (Python-only, robust)
-        for key, player_ids in tied_clusters.items():
-            print(f"🔍 Calculating H2H for tied cluster: {key} | Players: {player_ids}")
-            for player_id in player_ids:
-                h2h_score = 0
-                for opponent_id in player_ids:
-                    if player_id == opponent_id:
-                        continue  # skip self
-        
-                    # Get the match between these two players, if it exists
-                    cursor.execute("""
-                        SELECT Player1ID, Player2ID, Player1Points, Player2Points
-                        FROM MatchResults
-                        WHERE MatchTypeID = %s
-                          AND ((Player1ID = %s AND Player2ID = %s)
-                               OR (Player1ID = %s AND Player2ID = %s))
-                    """, (match_type_id, player_id, opponent_id, opponent_id, player_id))
-        
-                    rows = cursor.fetchall()
-        
-                    # Sum wins for player_id
-                    for p1, p2, p1_pts, p2_pts in rows:
-                        if (p1 == player_id and p1_pts > p2_pts) or \
-                           (p2 == player_id and p2_pts > p1_pts):
-                            h2h_score += 1
-        
-                stats_dict[player_id]["HeadToHeadScore"] = h2h_score
-                print(f"🧮 Player {player_id} H2H Score: {h2h_score}")
+    conn = create_connection()
+    cursor = conn.cursor()
 
-        # Step 4: Insert into MatchTypePlayerStats
-        insert_query = """
-            INSERT INTO MatchTypePlayerStats (
-                MatchTypeID, PlayerID, GamesPlayed, Wins, Losses, Points,
-                WinPercentage, PRWins, AveragePR, AverageLuck, HeadToHeadScore
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        for player_id, s in stats_dict.items():
-            cursor.execute(insert_query, (
-                match_type_id, player_id, s["GamesPlayed"], s["Wins"], s["Losses"], s["Points"],
-                s["WinPct"], s["PRWins"], s["AvgPR"], s["AvgLuck"], s["HeadToHeadScore"]
-            ))
+    try:
+        log_debug(f"⚡ Refreshing MatchType stats for MatchTypeID {match_type_id}...")
 
-        # Step 5: Refresh MatchTypeCompletedCache
-        cursor.execute("DELETE FROM MatchTypeCompletedCache WHERE MatchTypeID = %s", (match_type_id,))
-        match_query = """
-            SELECT 
-                mr.FixtureID, f.Player1ID, f.Player2ID, p1.Name, p2.Name,
-                mr.Player1Points, mr.Player2Points,
-                mr.Player1PR, mr.Player2PR,
-                mr.Player1Luck, mr.Player2Luck,
-                mr.Date, mr.TimeCompleted
-            FROM MatchResults mr
-            JOIN Fixtures f ON mr.FixtureID = f.FixtureID AND mr.MatchTypeID = f.MatchTypeID
-            JOIN Players p1 ON f.Player1ID = p1.PlayerID
-            JOIN Players p2 ON f.Player2ID = p2.PlayerID
-            WHERE mr.MatchTypeID = %s
-        """
-        cursor.execute(match_query, (match_type_id,))
-        completed_matches = cursor.fetchall()
-
-        insert_completed_query = """
-            INSERT INTO MatchTypeCompletedCache (
-                MatchTypeID, FixtureID, Player1ID, Player2ID,
-                Player1Name, Player2Name,
-                Player1Points, Player2Points,
-                Player1PR, Player2PR,
-                Player1Luck, Player2Luck,
-                Winner, Date, TimeCompleted, LastUpdated
-            ) VALUES (
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW()
-            )
-        """
-        for row in completed_matches:
-            (
-                fixture_id, p1_id, p2_id, p1_name, p2_name,
-                p1_pts, p2_pts, p1_pr, p2_pr, p1_luck, p2_luck,
-                date, time_completed
-            ) = row
-            winner = p1_name if p1_pts > p2_pts else p2_name if p2_pts > p1_pts else "Draw"
-            cursor.execute(insert_completed_query, (
-                match_type_id, fixture_id, p1_id, p2_id,
-                p1_name, p2_name,
-                p1_pts, p2_pts,
-                p1_pr, p2_pr,
-                p1_luck, p2_luck,
-                winner, date, time_completed
-            ))
+        written = _rebuild_matchtype_stats(cursor, [match_type_id])
 
         conn.commit()
-        print(f"✅ MatchTypePlayerStats and MatchTypeCompletedCache updated for MatchTypeID {match_type_id}.")
+        log_debug(f"✅ MatchTypePlayerStats ({written.get(match_type_id, 0)} players) updated for MatchTypeID {match_type_id}.")
 
     except Exception as e:
-        print(f"❌ Error in refresh_matchtype_stats({match_type_id}): {e}")
+        conn.rollback()
+        log_debug(f"❌ Error in refresh_matchtype_stats({match_type_id}): {e}")
+        raise
 
     finally:
         cursor.close()
-        
-        # ✅ Only close if we created it
-        if close_conn:
-            conn.close()
+        conn.close()
+
+def refresh_all_active_matchtype_stats():
+    """
+    Rebuild the standings for every active match type
+    in one pass and one transaction. Returns [(MatchTypeID, MatchTypeTitle), ...] refreshed.
+    """
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT MatchTypeID, MatchTypeTitle FROM MatchType WHERE Active = 1 ORDER BY MatchTypeTitle")
+        active_matchtypes = cursor.fetchall()
+
+        log_debug(f"⚡ Refreshing stats for {len(active_matchtypes)} active MatchTypes in one pass...")
+        _rebuild_matchtype_stats(cursor, [mt_id for mt_id, _ in active_matchtypes])
+
+        conn.commit()
+        log_debug("✅ All active MatchTypes refreshed.")
+        return active_matchtypes
+
+    except Exception:
+        conn.rollback()
+        raise
+
+    finally:
+        cursor.close()
+        conn.close()
 
 def refresh_matchtype_stats0210(match_type_id):
     import datetime, sys
@@ -2982,22 +3737,35 @@ def refresh_matchtype_stats1(match_type_id):
         cursor.close()
         conn.close()
 
-def list_cached_remaining_fixtures(match_type_id):
+@cached_by_data_version("matchtype")
+def _query_matchtype_remaining_fixtures(match_type_id):
+    """(Player1Name, Player2Name) of the open fixtures of a match type, read from Fixtures."""
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT p1.Name, p2.Name
+            FROM Fixtures f
+            JOIN Players p1 ON f.Player1ID = p1.PlayerID
+            JOIN Players p2 ON f.Player2ID = p2.PlayerID
+            WHERE f.MatchTypeID = %s AND f.Completed = 0
+            ORDER BY p1.Name, p2.Name
+        """, (match_type_id,))
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+def list_cached_remaining_fixtures(match_type_id, snapshot=None):
     """
-    Display remaining fixtures for a given match type using cached data.
+    Display remaining fixtures for a given match type using cached data
+    (or the fixtures in snapshot, if given).
     """
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-
-        query = """
-            SELECT Player1Name, Player2Name
-            FROM MatchTypeRemainingFixtures
-            WHERE MatchTypeID = %s
-            ORDER BY Player1Name, Player2Name
-        """
-        cursor.execute(query, (match_type_id,))
-        rows = cursor.fetchall()
+        if snapshot is not None:
+            rows = snapshot.remaining_fixtures(match_type_id)
+        else:
+            rows = _query_matchtype_remaining_fixtures(match_type_id)
 
         if rows:
             st.subheader("Remaining Fixtures:")
@@ -3008,284 +3776,852 @@ def list_cached_remaining_fixtures(match_type_id):
 
     except Exception as e:
         st.error(f"Error loading cached remaining fixtures: {e}")
+
+def update_completed_match_cache(series_id):
+    """Repair command: rebuild the completed-match caches for every match type in a series."""
+    conn = create_connection()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute("SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s", (series_id,))
+        match_type_ids = [row[0] for row in cursor.fetchall()]
+
+        # Also drops rows left behind by match types no longer linked to the series
+        cursor.execute("DELETE FROM CompletedMatchesCache WHERE SeriesID = %s", (series_id,))
+        written = _rebuild_completed_matches(cursor, match_type_ids)
+
+        bump_data_version(cursor, match_type_ids, series_ids=[series_id])
+        conn.commit()
+        log_debug(f"✅ Completed match cache rebuilt for Series {series_id} ({written} results).")
+
+    except Exception as e:
+        conn.rollback()
+        log_debug(f"❌ Error in match cache refresh: {e}")
     finally:
-        if cursor:
+        cursor.close()
+        conn.close()
+
+def _rebuild_series_stats(cursor, series_id):
+    """Replace SeriesPlayerStats for one series on the caller's cursor. Returns the number of players written."""
+    # Get all MatchTypes in this Series
+    cursor.execute("SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s", (series_id,))
+    match_type_ids = [row[0] for row in cursor.fetchall()]
+    if not match_type_ids:
+        log_debug(f"⚠️ No MatchTypes found for SeriesID {series_id}. Aborting refresh.")
+        return 0
+
+    # Step 1: One scan of fixtures and results for the whole series
+    players_by_mt, result_rows = _scan_league_rows(cursor, match_type_ids)
+    series_players = set().union(*players_by_mt.values()) if players_by_mt else set()
+    results = [row[2:10] for row in result_rows]
+
+    # Games-weighted totals across every league in the series (walkovers are not counted here)
+    stats_dict = aggregate_player_stats(series_players, results)
+    log_debug(f"📊 Base stats collected for {len(stats_dict)} players.")
+
+    # Step 2: Resolve H2H for tied clusters from the same result rows
+    tied_count = resolve_all_h2h_clusters(stats_dict, [r[:4] for r in results])
+    log_debug(f"🎯 {tied_count} clusters had ties resolved by H2H")
+
+    # Step 3: Replace SeriesPlayerStats
+    cursor.execute("DELETE FROM SeriesPlayerStats WHERE SeriesID = %s", (series_id,))
+    bulk_insert(cursor, "SeriesPlayerStats", SERIES_STATS_COLUMNS, [
+        (
+            series_id, player_id, s["GamesPlayed"], s["Wins"], s["Losses"], s["Points"],
+            s["WinPct"], s["PRWins"], s["AvgPR"], s["AvgLuck"], s["HeadToHeadScore"]
+        )
+        for player_id, s in stats_dict.items()
+    ])
+
+    bump_data_version(cursor, series_ids=[series_id])
+    return len(stats_dict)
+
+def refresh_series_stats(series_id, conn=None):
+    """
+    Rebuild SeriesPlayerStats for one series.
+    When conn is passed in the rebuild joins the caller's transaction: nothing is
+    committed here and errors propagate to the caller.
+    """
+    if conn is not None:
+        cursor = conn.cursor()
+        try:
+            _rebuild_series_stats(cursor, series_id)
+        finally:
             cursor.close()
-        if conn:
+        return
+
+    conn = create_connection()
+    cursor = conn.cursor()
+
+    try:
+        log_debug(f"⚡ Refreshing Series stats for SeriesID {series_id}...")
+        _rebuild_series_stats(cursor, series_id)
+        conn.commit()
+        log_debug(f"✅ SeriesPlayerStats updated for SeriesID {series_id}.")
+
+    except Exception as e:
+        conn.rollback()
+        log_debug(f"❌ Error in refresh_series_stats({series_id}): {e}")
+        raise
+
+    finally:
+        cursor.close()
+        conn.close()
+
+# ------------------------------------------------------------------
+# Incremental standings maintenance
+# Applies one match (or walkover) to the two affected players' rows in
+# MatchTypePlayerStats / SeriesPlayerStats instead of rebuilding everything.
+# ------------------------------------------------------------------
+
+def match_result_deltas(result):
+    """
+    Per-player standings delta for one MatchResults row.
+    result is a dict with Player1ID, Player2ID, Player1Points, Player2Points,
+    Player1PR, Player2PR, Player1Luck and Player2Luck.
+    """
+    p1_pts, p2_pts = result["Player1Points"], result["Player2Points"]
+    p1_pr, p2_pr = result["Player1PR"], result["Player2PR"]
+    pr_known = p1_pr is not None and p2_pr is not None
+
+    deltas = {}
+    for me, pts, opp_pts, pr, opp_pr, luck in (
+        ("Player1ID", p1_pts, p2_pts, p1_pr, p2_pr, result["Player1Luck"]),
+        ("Player2ID", p2_pts, p1_pts, p2_pr, p1_pr, result["Player2Luck"]),
+    ):
+        won = 1 if pts > opp_pts else 0
+        lost = 1 if pts < opp_pts else 0
+        pr_won = 1 if pr_known and pr < opp_pr else 0
+        deltas[result[me]] = {
+            "GamesPlayed": 1, "Wins": won, "Losses": lost, "PRWins": pr_won,
+            "Points": won * 2 + pr_won, "PR": pr, "Luck": luck
+        }
+    return deltas
+
+def walkover_deltas(winner_id, loser_id):
+    """Walkovers add a game and 2 points to the winner, but no Wins/Losses or PR."""
+    return {
+        winner_id: {"GamesPlayed": 1, "Wins": 0, "Losses": 0, "PRWins": 0, "Points": 2, "PR": None, "Luck": None},
+        loser_id: {"GamesPlayed": 1, "Wins": 0, "Losses": 0, "PRWins": 0, "Points": 0, "PR": None, "Luck": None},
+    }
+
+def _apply_player_delta(row, delta, sign):
+    """
+    Add (sign=1) or remove (sign=-1) one match's counts and points from a standings row.
+    AveragePR, AverageLuck and WinPercentage are filled in by _result_averages().
+    """
+    for key in ("GamesPlayed", "Wins", "Losses", "PRWins", "Points"):
+        row[key] = (row[key] or 0) + sign * delta[key]
+
+def _result_averages(cursor, match_type_ids, player_ids):
+    """
+    AVG(PR), AVG(Luck) and the number of result games (walkovers excluded) per player
+    across match_type_ids, read from MatchResults the same way the full refresh counts them:
+    each average is over the games that carry that value. Returns {PlayerID: (AvgPR, AvgLuck, Games)}.
+    """
+    mt_placeholders = ", ".join(["%s"] * len(match_type_ids))
+    player_placeholders = ", ".join(["%s"] * len(player_ids))
+    cursor.execute(f"""
+        SELECT PlayerID, AVG(PR), AVG(Luck), COUNT(*)
+        FROM (
+            SELECT Player1ID AS PlayerID, Player1PR AS PR, Player1Luck AS Luck
+            FROM MatchResults
+            WHERE MatchTypeID IN ({mt_placeholders}) AND Player1ID IN ({player_placeholders})
+            UNION ALL
+            SELECT Player2ID, Player2PR, Player2Luck
+            FROM MatchResults
+            WHERE MatchTypeID IN ({mt_placeholders}) AND Player2ID IN ({player_placeholders})
+        ) AS sides
+        GROUP BY PlayerID
+    """, (*match_type_ids, *player_ids, *match_type_ids, *player_ids))
+    return {r[0]: (r[1], r[2], r[3]) for r in cursor.fetchall()}
+
+def _apply_deltas_to_table(cursor, table, key_column, key_value, league_match_type_ids, deltas, sign):
+    player_ids = list(deltas.keys())
+    placeholders = ", ".join(["%s"] * len(player_ids))
+    cursor.execute(f"""
+        SELECT PlayerID, GamesPlayed, Wins, Losses, Points, WinPercentage,
+               PRWins, AveragePR, AverageLuck, HeadToHeadScore
+        FROM {table}
+        WHERE {key_column} = %s AND PlayerID IN ({placeholders})
+        FOR UPDATE
+    """, (key_value, *player_ids))
+    columns = ["PlayerID", "GamesPlayed", "Wins", "Losses", "Points", "WinPercentage",
+               "PRWins", "AveragePR", "AverageLuck", "HeadToHeadScore"]
+    rows = {r[0]: dict(zip(columns, r)) for r in cursor.fetchall()}
+
+    touched_clusters = set()
+    for player_id, delta in deltas.items():
+        row = rows.get(player_id)
+        if row is None:
+            row = {"PlayerID": player_id, "GamesPlayed": 0, "Wins": 0, "Losses": 0, "Points": 0,
+                   "WinPercentage": 0, "PRWins": 0, "AveragePR": None, "AverageLuck": None,
+                   "HeadToHeadScore": 0}
+            cursor.execute(f"""
+                INSERT INTO {table} ({key_column}, PlayerID, GamesPlayed, Wins, Losses, Points,
+                                     WinPercentage, PRWins, AveragePR, AverageLuck, HeadToHeadScore)
+                VALUES (%s, %s, 0, 0, 0, 0, 0, 0, NULL, NULL, 0)
+            """, (key_value, player_id))
+
+        touched_clusters.add((row["Points"], row["Wins"], row["PRWins"]))
+        _apply_player_delta(row, delta, sign)
+        touched_clusters.add((row["Points"], row["Wins"], row["PRWins"]))
+        rows[player_id] = row
+
+    # MatchResults already holds the change, so the averages can be read back for just these players
+    averages = _result_averages(cursor, league_match_type_ids, player_ids)
+    for player_id in player_ids:
+        row = rows[player_id]
+        avg_pr, avg_luck, games = averages.get(player_id, (None, None, 0))
+        row["AveragePR"], row["AverageLuck"] = avg_pr, avg_luck
+        row["WinPercentage"] = (row["Wins"] / games) * 100 if games > 0 else 0
+
+        cursor.execute(f"""
+            UPDATE {table}
+            SET GamesPlayed = %s, Wins = %s, Losses = %s, Points = %s, WinPercentage = %s,
+                PRWins = %s, AveragePR = %s, AverageLuck = %s
+            WHERE {key_column} = %s AND PlayerID = %s
+        """, (row["GamesPlayed"], row["Wins"], row["Losses"], row["Points"], row["WinPercentage"],
+              row["PRWins"], row["AveragePR"], row["AverageLuck"], key_value, player_id))
+
+    # Re-resolve H2H only for the tie clusters the change moved players into or out of
+    for points, wins, pr_wins in touched_clusters:
+        cursor.execute(f"""
+            SELECT PlayerID FROM {table}
+            WHERE {key_column} = %s AND Points = %s AND Wins = %s AND PRWins = %s
+        """, (key_value, points, wins, pr_wins))
+        members = [r[0] for r in cursor.fetchall()]
+        scores = compute_h2h_scores(cursor, league_match_type_ids, members)
+        for player_id, score in scores.items():
+            cursor.execute(f"""
+                UPDATE {table} SET HeadToHeadScore = %s
+                WHERE {key_column} = %s AND PlayerID = %s
+            """, (score, key_value, player_id))
+
+def _standings_exist(cursor, table, key_column, key_value):
+    cursor.execute(f"SELECT 1 FROM {table} WHERE {key_column} = %s LIMIT 1", (key_value,))
+    return cursor.fetchone() is not None
+
+def apply_standings_deltas(match_type_id, deltas, sign=1, include_series=True, conn=None):
+    """
+    Apply per-player deltas (from match_result_deltas / walkover_deltas) to the
+    MatchType standings and, if include_series, to every Series containing the match type.
+    Falls back to a full refresh when a table has never been built for that key;
+    the refresh runs in the same transaction. Commits only if it opened the
+    connection itself; with conn passed in, errors propagate and the caller rolls back.
+    """
+    close_conn = False
+    if conn is None:
+        conn = create_connection()
+        close_conn = True
+    cursor = conn.cursor()
+
+    try:
+        if _standings_exist(cursor, "MatchTypePlayerStats", "MatchTypeID", match_type_id):
+            _apply_deltas_to_table(cursor, "MatchTypePlayerStats", "MatchTypeID", match_type_id,
+                                   [match_type_id], deltas, sign)
+        else:
+            refresh_matchtype_stats(match_type_id, conn)
+
+        if include_series:
+            cursor.execute("SELECT SeriesID FROM SeriesMatchTypes WHERE MatchTypeID = %s", (match_type_id,))
+            series_ids = [r[0] for r in cursor.fetchall()]
+            for series_id in series_ids:
+                if not _standings_exist(cursor, "SeriesPlayerStats", "SeriesID", series_id):
+                    refresh_series_stats(series_id, conn)
+                    continue
+                cursor.execute("SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s", (series_id,))
+                series_match_type_ids = [r[0] for r in cursor.fetchall()]
+                _apply_deltas_to_table(cursor, "SeriesPlayerStats", "SeriesID", series_id,
+                                       series_match_type_ids, deltas, sign)
+
+        bump_data_version(cursor, [match_type_id])
+        if close_conn:
+            conn.commit()
+
+    except Exception as e:
+        log_debug(f"❌ Error in apply_standings_deltas({match_type_id}): {e}")
+        if close_conn:
+            conn.rollback()
+        raise
+
+    finally:
+        cursor.close()
+        if close_conn:
             conn.close()
 
-def update_completed_match_cache(series_id):
-    import datetime
+def apply_match_result_to_standings(match_type_id, result, sign=1, conn=None):
+    """Add (sign=1) or remove (sign=-1) one match result from the cached standings."""
+    apply_standings_deltas(match_type_id, match_result_deltas(result), sign, include_series=True, conn=conn)
+
+def apply_walkover_to_standings(match_type_id, winner_id, loser_id, sign=1, conn=None):
+    """Walkovers only count towards MatchType standings (refresh_series_stats ignores them)."""
+    apply_standings_deltas(match_type_id, walkover_deltas(winner_id, loser_id), sign, include_series=False, conn=conn)
+
+# ------------------------------------------------------------------
+# Player match facts
+# PlayerMatchFacts holds one row per player per match result, so
+# per-player readers can range-scan (PlayerID, Date) instead of
+# OR-ing Player1ID/Player2ID and picking columns with CASE WHEN.
+# The table is created by migration 3 in migrations.py.
+# ------------------------------------------------------------------
+PLAYER_MATCH_FACTS_COLUMNS = [
+    "PlayerID", "OpponentID", "MatchResultID", "MatchTypeID", "SeriesID", "SeasonID",
+    "Date", "Points", "OppPoints", "PR", "OppPR", "Luck", "Won", "PRWon"
+]
+
+# One SELECT per side of the match; {where} filters MatchResults (alias mr).
+# A MatchType linked to several series is filed under the lowest SeriesID/SeasonID.
+_PLAYER_MATCH_FACTS_SIDE = """
+    SELECT mr.Player{me}ID, mr.Player{opp}ID, mr.MatchResultID, mr.MatchTypeID,
+           smt.SeriesID, ss.SeasonID, mr.Date,
+           mr.Player{me}Points, mr.Player{opp}Points, mr.Player{me}PR, mr.Player{opp}PR, mr.Player{me}Luck,
+           mr.Player{me}Points > mr.Player{opp}Points,
+           COALESCE(mr.Player{me}PR < mr.Player{opp}PR, 0)
+    FROM MatchResults mr
+    LEFT JOIN (SELECT MatchTypeID, MIN(SeriesID) AS SeriesID
+               FROM SeriesMatchTypes GROUP BY MatchTypeID) smt ON smt.MatchTypeID = mr.MatchTypeID
+    LEFT JOIN (SELECT SeriesID, MIN(SeasonID) AS SeasonID
+               FROM SeasonSeries GROUP BY SeriesID) ss ON ss.SeriesID = smt.SeriesID
+    WHERE {where}
+"""
+
+def player_match_facts_insert_sql(where):
+    """INSERT ... SELECT that unpivots the MatchResults rows matching `where` into PlayerMatchFacts."""
+    return (
+        f"INSERT INTO PlayerMatchFacts ({', '.join(PLAYER_MATCH_FACTS_COLUMNS)})"
+        + _PLAYER_MATCH_FACTS_SIDE.format(me=1, opp=2, where=where)
+        + " UNION ALL "
+        + _PLAYER_MATCH_FACTS_SIDE.format(me=2, opp=1, where=where)
+    )
+
+def sync_player_match_facts(cursor, match_result_ids):
+    """
+    Rewrites the PlayerMatchFacts rows for the given MatchResultIDs from MatchResults.
+    Call it in the same transaction as the MatchResults write; it does not commit.
+    """
+    match_result_ids = [int(mr_id) for mr_id in match_result_ids if mr_id is not None]
+    if not match_result_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(match_result_ids))
+    cursor.execute(f"DELETE FROM PlayerMatchFacts WHERE MatchResultID IN ({placeholders})",
+                   tuple(match_result_ids))
+    cursor.execute(player_match_facts_insert_sql(f"mr.MatchResultID IN ({placeholders})"),
+                   tuple(match_result_ids) * 2)
+
+def sync_match_type_facts(cursor, match_type_ids):
+    """
+    Rewrites the PlayerMatchFacts rows of every result in the given MatchTypeIDs, so they
+    pick up the match type's current SeriesID/SeasonID. Call it in the same transaction as
+    the SeriesMatchTypes write; it does not commit.
+    """
+    match_type_ids = [int(mt_id) for mt_id in match_type_ids if mt_id is not None]
+    if not match_type_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(match_type_ids))
+    cursor.execute(f"DELETE FROM PlayerMatchFacts WHERE MatchTypeID IN ({placeholders})",
+                   tuple(match_type_ids))
+    cursor.execute(player_match_facts_insert_sql(f"mr.MatchTypeID IN ({placeholders})"),
+                   tuple(match_type_ids) * 2)
+
+def backfill_player_match_facts(full=False):
+    """
+    Fills PlayerMatchFacts from MatchResults. By default only results without facts are added
+    (e.g. ones written by an older copy of the PHP email checker); full=True rebuilds the whole table,
+    which also repairs SeriesID/SeasonID after SeasonSeries is edited directly in the database.
+    Returns the number of fact rows inserted.
+    """
     conn = create_connection()
     cursor = conn.cursor()
+    try:
+        if full:
+            cursor.execute("DELETE FROM PlayerMatchFacts")
+            where = "1 = 1"
+        else:
+            where = "mr.MatchResultID NOT IN (SELECT MatchResultID FROM PlayerMatchFacts)"
+        cursor.execute(player_match_facts_insert_sql(where))
+        inserted = cursor.rowcount
+        conn.commit()
+        log_debug(f"✅ PlayerMatchFacts backfilled: {inserted} rows inserted.")
+        return inserted
+    except Exception as e:
+        conn.rollback()
+        log_debug(f"❌ Error backfilling PlayerMatchFacts: {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+# ------------------------------------------------------------------
+# Completed-match caches
+# MatchTypeCompletedCache holds one row per result and CompletedMatchesCache
+# one per result per series of its match type, with names and winner
+# denormalized. They are written alongside MatchResults: a new result
+# appends its rows, an edit or red-card move rewrites that fixture's rows.
+# The standings refreshes leave them alone; rebuild_completed_match_caches
+# and update_completed_match_cache are repair commands only.
+# ------------------------------------------------------------------
+# {series}/{title}/{joins} add the series columns; {where} filters MatchResults (alias mr).
+_COMPLETED_CACHE_SELECT = """
+    SELECT {series}mr.MatchTypeID, mr.FixtureID, mr.Player1ID, mr.Player2ID, p1.Name, p2.Name,
+           mr.Player1Points, mr.Player2Points, mr.Player1PR, mr.Player2PR,
+           mr.Player1Luck, mr.Player2Luck,
+           CASE WHEN mr.Player1Points > mr.Player2Points THEN p1.Name
+                WHEN mr.Player2Points > mr.Player1Points THEN p2.Name
+                ELSE 'Draw' END,
+           mr.Date, mr.TimeCompleted, NOW(){title}
+    FROM MatchResults mr
+    JOIN Players p1 ON p1.PlayerID = mr.Player1ID
+    JOIN Players p2 ON p2.PlayerID = mr.Player2ID{joins}
+    WHERE mr.FixtureID IS NOT NULL AND {where}
+"""
+
+def completed_cache_insert_sql(where):
+    """
+    (MatchTypeCompletedCache, CompletedMatchesCache) INSERT ... SELECT statements for the
+    MatchResults rows matching `where`. Parameters in `where` are bound once per statement.
+    """
+    matchtype_sql = (
+        f"INSERT INTO MatchTypeCompletedCache ({', '.join(MATCHTYPE_COMPLETED_CACHE_COLUMNS)})"
+        + _COMPLETED_CACHE_SELECT.format(series="", title="", joins="", where=where)
+    )
+    series_sql = (
+        f"INSERT INTO CompletedMatchesCache ({', '.join(SERIES_COMPLETED_CACHE_COLUMNS + ['MatchTypeTitle'])})"
+        + _COMPLETED_CACHE_SELECT.format(
+            series="smt.SeriesID, ", title=", mt.MatchTypeTitle",
+            joins="\n    JOIN SeriesMatchTypes smt ON smt.MatchTypeID = mr.MatchTypeID"
+                  "\n    JOIN MatchType mt ON mt.MatchTypeID = mr.MatchTypeID",
+            where=where
+        )
+    )
+    return matchtype_sql, series_sql
 
+def append_completed_matches(cursor, match_result_ids):
+    """
+    Adds the cache rows for newly inserted MatchResultIDs.
+    Call it in the same transaction as the MatchResults insert; it does not commit.
+    """
+    match_result_ids = [int(mr_id) for mr_id in match_result_ids if mr_id is not None]
+    if not match_result_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(match_result_ids))
+    for statement in completed_cache_insert_sql(f"mr.MatchResultID IN ({placeholders})"):
+        cursor.execute(statement, tuple(match_result_ids))
+
+def sync_completed_matches(cursor, match_result_ids):
+    """
+    Rewrites the cache rows of edited MatchResultIDs (scores, players or a MatchTypeID moved
+    by a red card), replacing the old rows by FixtureID. Does not commit.
+    """
+    match_result_ids = [int(mr_id) for mr_id in match_result_ids if mr_id is not None]
+    if not match_result_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(match_result_ids))
+    cursor.execute(f"""
+        SELECT FixtureID FROM MatchResults
+        WHERE MatchResultID IN ({placeholders}) AND FixtureID IS NOT NULL
+    """, tuple(match_result_ids))
+    remove_completed_matches(cursor, [row[0] for row in cursor.fetchall()])
+    append_completed_matches(cursor, match_result_ids)
+
+def remove_completed_matches(cursor, fixture_ids):
+    """Deletes the cache rows of the given FixtureIDs (e.g. when their result is deleted). Does not commit."""
+    fixture_ids = [int(f_id) for f_id in fixture_ids if f_id is not None]
+    if not fixture_ids:
+        return
+    placeholders = ", ".join(["%s"] * len(fixture_ids))
+    for table in ("MatchTypeCompletedCache", "CompletedMatchesCache"):
+        cursor.execute(f"DELETE FROM {table} WHERE FixtureID IN ({placeholders})", tuple(fixture_ids))
+
+def _rebuild_completed_matches(cursor, match_type_ids):
+    """Replace both caches' rows for match_type_ids from MatchResults. Returns the number of results cached."""
+    match_type_ids = [int(mt_id) for mt_id in match_type_ids if mt_id is not None]
+    if not match_type_ids:
+        return 0
+    placeholders = ", ".join(["%s"] * len(match_type_ids))
+    for table in ("MatchTypeCompletedCache", "CompletedMatchesCache"):
+        cursor.execute(f"DELETE FROM {table} WHERE MatchTypeID IN ({placeholders})", tuple(match_type_ids))
+    matchtype_sql, series_sql = completed_cache_insert_sql(f"mr.MatchTypeID IN ({placeholders})")
+    cursor.execute(matchtype_sql, tuple(match_type_ids))
+    written = cursor.rowcount
+    cursor.execute(series_sql, tuple(match_type_ids))
+    return written
+
+def rebuild_completed_match_caches(match_type_ids=None):
+    """
+    Repair command: rebuild MatchTypeCompletedCache and CompletedMatchesCache from MatchResults
+    for the given match types, or for everything when match_type_ids is None.
+    Returns the number of results cached.
+    """
+    conn = create_connection()
+    cursor = conn.cursor()
     try:
-        # Step 1: Clear existing cache for this series
-        cursor.execute("DELETE FROM CompletedMatchesCache WHERE SeriesID = %s", (series_id,))
+        if match_type_ids is None:
+            cursor.execute("DELETE FROM MatchTypeCompletedCache")
+            cursor.execute("DELETE FROM CompletedMatchesCache")
+            cursor.execute("SELECT DISTINCT MatchTypeID FROM MatchResults")
+            match_type_ids = [row[0] for row in cursor.fetchall()]
+        written = _rebuild_completed_matches(cursor, match_type_ids)
+        bump_data_version(cursor, match_type_ids)
+        conn.commit()
+        log_debug(f"✅ Completed-match caches rebuilt: {written} results.")
+        return written
+    except Exception as e:
+        conn.rollback()
+        log_debug(f"❌ Error rebuilding completed-match caches: {e}")
+        raise
+    finally:
+        cursor.close()
+        conn.close()
 
-        # Step 2: Fetch completed matches along with MatchTypeTitle
-        query = """
-            SELECT 
-                s.SeriesID,
-                f.MatchTypeID,
-                f.FixtureID,
-                f.Player1ID,
-                f.Player2ID,
-                p1.Name AS Player1Name,
-                p2.Name AS Player2Name,
-                mr.Player1Points,
-                mr.Player2Points,
-                mr.Player1PR,
-                mr.Player2PR,
-                mr.Player1Luck,
-                mr.Player2Luck,
-                mr.Date,
-                mr.TimeCompleted,
-                mt.MatchTypeTitle
-            FROM Fixtures f
-            JOIN MatchResults mr ON mr.FixtureID = f.FixtureID
-            JOIN SeriesMatchTypes s ON s.MatchTypeID = f.MatchTypeID
-            JOIN Players p1 ON f.Player1ID = p1.PlayerID
-            JOIN Players p2 ON f.Player2ID = p2.PlayerID
-            JOIN MatchType mt ON f.MatchTypeID = mt.MatchTypeID
-            WHERE s.SeriesID = %s
-        """
+# ------------------------------------------------------------------
+# Series snapshot
+# One bulk load of a series' fixtures, results, walkovers, players and
+# cached standings. The league-tab renderers take it via snapshot= and
+# derive their output from it instead of querying per tab. Snapshots
+# are cached across sessions, keyed by the series' data version.
+# ------------------------------------------------------------------
+class SeriesSnapshot:
+    """Read-only, in-memory view of one series for the league tabs."""
+
+    def __init__(self, series_id, match_type_ids, players, fixtures, results, walkovers, stats):
+        self.series_id = series_id
+        self.match_type_ids = list(match_type_ids)
+        self.players = players        # {PlayerID: (Name, Nickname)}
+        self.walkovers = walkovers    # [(FixtureID, MatchTypeID, WinnerID, LoserID)]
+        self.stats = stats            # {(MatchTypeID, PlayerID): MatchTypePlayerStats row}
+
+        # (FixtureID, MatchTypeID, Player1ID, Player2ID, Completed)
+        self.fixtures_by_mt = {mt_id: [] for mt_id in self.match_type_ids}
+        for fixture in fixtures:
+            self.fixtures_by_mt.setdefault(fixture[1], []).append(fixture)
+
+        # (MatchResultID, FixtureID, MatchTypeID, Player1ID, Player2ID, Player1Points, Player2Points,
+        #  Player1PR, Player2PR, Player1Luck, Player2Luck, Date)
+        self.results_by_mt = {mt_id: [] for mt_id in self.match_type_ids}
+        for result in results:
+            self.results_by_mt.setdefault(result[2], []).append(result)
+
+    def name(self, player_id):
+        return self.players.get(player_id, (None, None))[0]
+
+    def nickname(self, player_id):
+        return self.players.get(player_id, (None, None))[1]
+
+    def fixture_count(self, match_type_id):
+        return len(self.fixtures_by_mt.get(match_type_id, []))
+
+    def completed_count(self, match_type_id):
+        return sum(1 for f in self.fixtures_by_mt.get(match_type_id, []) if f[4])
+
+    def average_pr(self, match_type_id):
+        """Same as get_averagePR_by_matchtype: mean of (Player1PR + Player2PR) / 2, 0.00 if none."""
+        values = [(r[7] + r[8]) / 2 for r in self.results_by_mt.get(match_type_id, [])
+                  if r[7] is not None and r[8] is not None]
+        return round(sum(values) / len(values), 2) if values else 0.00
+
+    def grid_results(self, match_type_id):
+        """Rows shaped like get_match_results_for_grid()."""
+        rows = [
+            (r[3], self.name(r[3]), r[4], self.name(r[4]), r[5], r[6])
+            for r in self.results_by_mt.get(match_type_id, [])
+            if r[3] in self.players and r[4] in self.players
+        ]
+        return sorted(rows, key=lambda row: row[1])
 
-        cursor.execute(query, (series_id,))
-        matches = cursor.fetchall()
+    def standings_rows(self, match_type_id):
+        """Rows shaped and ordered like the display_cached_matchtype_standings() query."""
+        player_ids = set()
+        for _, _, p1, p2, _ in self.fixtures_by_mt.get(match_type_id, []):
+            player_ids.update((p1, p2))
 
-        insert_query = """
-            INSERT INTO CompletedMatchesCache (
-                SeriesID, MatchTypeID, FixtureID,
-                Player1ID, Player2ID, Player1Name, Player2Name,
-                Player1Points, Player2Points,
-                Player1PR, Player2PR,
-                Player1Luck, Player2Luck,
-                Winner, Date, TimeCompleted, LastUpdated,
-                MatchTypeTitle
-            ) VALUES (
-                %s, %s, %s,
-                %s, %s, %s, %s,
-                %s, %s,
-                %s, %s,
-                %s, %s,
-                %s, %s, %s, %s,
-                %s
-            )
-        """
+        rows = []
+        for pid in player_ids:
+            if pid not in self.players:
+                continue
+            name, nickname = self.players[pid]
+            s = self.stats.get((match_type_id, pid))
+            if s is None:
+                rows.append(((1,), (name, nickname, 0, 0, 0, 0, 0, 0, None, None, 0)))
+                continue
+            games, wins, losses, points, win_pct, pr_wins, avg_pr, avg_luck, h2h = s
+            # Points, Wins, PRWins, H2H DESC; AveragePR ASC (NULL first, as MySQL); GamesPlayed DESC.
+            # Players without a stats row sort last, like the NULLs in the LEFT JOIN.
+            key = (0, -(points or 0), -(wins or 0), -(pr_wins or 0), -(h2h or 0),
+                   avg_pr is not None, avg_pr or 0, -(games or 0))
+            rows.append((key, (name, nickname, games or 0, wins or 0, losses or 0, points or 0,
+                               win_pct or 0, pr_wins or 0, avg_pr, avg_luck, h2h or 0)))
+        rows.sort(key=lambda item: item[0])
+        return [row for _, row in rows]
+
+    def remaining_fixtures(self, match_type_id):
+        """(Player1Name, Player2Name) for fixtures not yet completed, like MatchTypeRemainingFixtures."""
+        return sorted(
+            (self.name(p1), self.name(p2))
+            for _, _, p1, p2, completed in self.fixtures_by_mt.get(match_type_id, [])
+            if not completed and p1 in self.players and p2 in self.players
+        )
+
+    def completed_matches(self, match_type_id):
+        """Rows shaped like the show_cached_matches_completed() query, newest first."""
+        # Same rows as MatchTypeCompletedCache: players in the result's own order, any result with a fixture
+        rows = []
+        for (_, fixture_id, _, p1, p2, p1_pts, p2_pts,
+             p1_pr, p2_pr, p1_luck, p2_luck, date) in self.results_by_mt.get(match_type_id, []):
+            if fixture_id is None or p1 not in self.players or p2 not in self.players:
+                continue
+            p1_name, p2_name = self.name(p1), self.name(p2)
+            winner = p1_name if p1_pts > p2_pts else p2_name if p2_pts > p1_pts else "Draw"
+            rows.append((date, p1_name, p1, p2_name, p2, p1_pts, p2_pts,
+                         p1_pr, p1_luck, p2_pr, p2_luck, winner))
+        rows.sort(key=lambda row: (row[0] is not None, row[0]), reverse=True)
+        return rows
+
+
+@cached_by_data_version("series")
+def load_series_snapshot(series_id):
+    """Bulk-load a SeriesSnapshot; cached until the series' data version changes."""
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s", (series_id,))
+        match_type_ids = [row[0] for row in cursor.fetchall()]
+        if not match_type_ids:
+            return SeriesSnapshot(series_id, [], {}, [], [], [], {})
 
-        for row in matches:
-            (
-                s_id, matchtype_id, fixture_id,
-                p1_id, p2_id, p1_name, p2_name,
-                p1_pts, p2_pts, p1_pr, p2_pr, p1_luck, p2_luck,
-                date, time_completed, match_type_title
-            ) = row
+        placeholders = ", ".join(["%s"] * len(match_type_ids))
+        params = tuple(match_type_ids)
 
-            winner = (
-                p1_name if p1_pts > p2_pts else
-                p2_name if p2_pts > p1_pts else
-                "Draw"
-            )
+        cursor.execute(f"""
+            SELECT FixtureID, MatchTypeID, Player1ID, Player2ID, Completed
+            FROM Fixtures
+            WHERE MatchTypeID IN ({placeholders})
+        """, params)
+        fixtures = cursor.fetchall()
 
-            cursor.execute(insert_query, (
-                s_id, matchtype_id, fixture_id,
-                p1_id, p2_id, p1_name, p2_name,
-                p1_pts, p2_pts,
-                p1_pr, p2_pr,
-                p1_luck, p2_luck,
-                winner, date, time_completed, datetime.datetime.now(),
-                match_type_title
-            ))
+        cursor.execute(f"""
+            SELECT MatchResultID, FixtureID, MatchTypeID, Player1ID, Player2ID,
+                   Player1Points, Player2Points, Player1PR, Player2PR, Player1Luck, Player2Luck, Date
+            FROM MatchResults
+            WHERE MatchTypeID IN ({placeholders})
+        """, params)
+        results = cursor.fetchall()
 
-        conn.commit()
-        print(f"✅ Completed match cache refreshed for Series {series_id}.")
+        cursor.execute(f"""
+            SELECT FixtureID, MatchTypeID, WinnerID, LoserID
+            FROM Walkovers
+            WHERE MatchTypeID IN ({placeholders})
+        """, params)
+        walkovers = cursor.fetchall()
 
-    except Exception as e:
-        print(f"❌ Error in match cache refresh: {e}")
+        cursor.execute(f"""
+            SELECT MatchTypeID, PlayerID, GamesPlayed, Wins, Losses, Points, WinPercentage,
+                   PRWins, AveragePR, AverageLuck, HeadToHeadScore
+            FROM MatchTypePlayerStats
+            WHERE MatchTypeID IN ({placeholders})
+        """, params)
+        stats = {(row[0], row[1]): tuple(row[2:]) for row in cursor.fetchall()}
+
+        player_ids = set()
+        for _, _, p1, p2, _ in fixtures:
+            player_ids.update((p1, p2))
+        for row in results:
+            player_ids.update((row[3], row[4]))
+        players = {}
+        if player_ids:
+            cursor.execute(f"""
+                SELECT PlayerID, Name, Nickname
+                FROM Players
+                WHERE PlayerID IN ({", ".join(["%s"] * len(player_ids))})
+            """, tuple(player_ids))
+            players = {pid: (name, nickname) for pid, name, nickname in cursor.fetchall()}
+
+        return SeriesSnapshot(series_id, match_type_ids, players, fixtures, results, walkovers, stats)
     finally:
         cursor.close()
         conn.close()
 
-def refresh_series_stats(series_id):
-    import datetime
-    from collections import defaultdict
-    conn = create_connection()
-    cursor = conn.cursor()
 
+def get_series_snapshot(series_id):
+    """The current SeriesSnapshot for series_id, loaded from the database only if its data version changed."""
+    return load_series_snapshot(series_id)
+
+# ------------------------------------------------------------------
+# Lazy league navigation
+# league_navigation() shows a series' leagues as one selection instead of
+# st.tabs, which runs every tab's body on every rerun. Only the selected
+# league is rendered, inside an st.fragment so switching league reruns
+# just that part of the page, and the choice is kept in the URL
+# (?series12=B-League) so a league can be linked to directly.
+# prefetch_match_types() then warms the versioned caches of the other
+# leagues in a background thread, so the next switch is served from memory.
+# Set [ui] lazy_tabs = false in secrets to go back to plain tabs.
+# ------------------------------------------------------------------
+_fragment = getattr(st, "fragment", None) or getattr(st, "experimental_fragment", None)
+
+# Match type -> data version its caches were last warmed at, and match types being warmed now
+_prefetched_versions = {}
+_prefetching = set()
+_prefetch_lock = threading.Lock()
+
+def lazy_navigation_enabled():
     try:
-        print(f"⚡ Refreshing Series stats for SeriesID {series_id}...")
+        return bool(st.secrets.get("ui", {}).get("lazy_tabs", True))
+    except Exception:
+        return True
 
-        # Clear existing stats
-        cursor.execute("DELETE FROM SeriesPlayerStats WHERE SeriesID = %s", (series_id,))
+def league_navigation(key, names, render, prefetch_ids=None):
+    """
+    Show names as a navigation bar and call render(name) for the selected one only.
+    prefetch_ids is {name: MatchTypeID}; those leagues are warmed in the background,
+    nearest to the selection first. With lazy navigation off, falls back to st.tabs
+    and renders every name.
+    """
+    if not lazy_navigation_enabled():
+        for tab, name in zip(st.tabs(names), names):
+            with tab:
+                render(name)
+        return
 
-        # Get all MatchTypes in this Series
-        cursor.execute("SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s", (series_id,))
-        match_type_ids = [row[0] for row in cursor.fetchall()]
-        if not match_type_ids:
-            print(f"⚠️ No MatchTypes found for SeriesID {series_id}. Aborting refresh.")
-            return
+    # st.query_params needs Streamlit 1.30; older versions just do not keep the choice in the URL
+    query_params = getattr(st, "query_params", None)
 
-        # Step 1: Aggregate base stats across all match types
-        stats_dict = {}
-        for match_type_id in match_type_ids:
-            cursor.execute("""
-                SELECT
-                    p.PlayerID,
-                    COUNT(DISTINCT mr.MatchResultID) AS GamesPlayed,
-                    SUM(CASE WHEN (p.PlayerID = mr.Player1ID AND mr.Player1Points > mr.Player2Points)
-                              OR (p.PlayerID = mr.Player2ID AND mr.Player2Points > mr.Player1Points)
-                             THEN 1 ELSE 0 END) AS Wins,
-                    SUM(CASE WHEN (p.PlayerID = mr.Player1ID AND mr.Player1Points < mr.Player2Points)
-                              OR (p.PlayerID = mr.Player2ID AND mr.Player2Points < mr.Player1Points)
-                             THEN 1 ELSE 0 END) AS Losses,
-                    AVG(CASE WHEN p.PlayerID = mr.Player1ID THEN mr.Player1PR
-                             WHEN p.PlayerID = mr.Player2ID THEN mr.Player2PR ELSE NULL END) AS AvgPR,
-                    AVG(CASE WHEN p.PlayerID = mr.Player1ID THEN mr.Player1Luck
-                             WHEN p.PlayerID = mr.Player2ID THEN mr.Player2Luck ELSE NULL END) AS AvgLuck,
-                    SUM(CASE WHEN (p.PlayerID = mr.Player1ID AND mr.Player1PR < mr.Player2PR)
-                              OR (p.PlayerID = mr.Player2ID AND mr.Player2PR < mr.Player1PR)
-                             THEN 1 ELSE 0 END) AS PRWins
-                FROM Players p
-                JOIN Fixtures f ON (f.Player1ID = p.PlayerID OR f.Player2ID = p.PlayerID)
-                LEFT JOIN MatchResults mr ON f.FixtureID = mr.FixtureID AND f.MatchTypeID = mr.MatchTypeID
-                WHERE f.MatchTypeID = %s
-                GROUP BY p.PlayerID
-            """, (match_type_id,))
-            player_stats = cursor.fetchall()
+    def show():
+        requested = query_params.get(key) if query_params is not None else None
+        selected = st.radio(
+            "League", names,
+            index=names.index(requested) if requested in names else 0,
+            horizontal=True, label_visibility="collapsed", key=f"nav_{key}"
+        )
+        if query_params is not None:
+            query_params[key] = selected
+        render(selected)
+
+        if prefetch_ids:
+            position = names.index(selected)
+            others = sorted((name for name in names if name in prefetch_ids and name != selected),
+                            key=lambda name: abs(names.index(name) - position))
+            prefetch_match_types([prefetch_ids[name] for name in others])
+
+    if _fragment is not None:
+        _fragment(show)()
+    else:
+        show()
 
-            # Build/aggregate stats_dict
-            for row in player_stats:
-                player_id, games, wins, losses, avg_pr, avg_luck, pr_wins = row
-                points = (wins * 2) + (pr_wins or 0)
-                if player_id not in stats_dict:
-                    stats_dict[player_id] = {
-                        "GamesPlayed": games,
-                        "Wins": wins,
-                        "Losses": losses,
-                        "AvgPR": avg_pr,
-                        "AvgLuck": avg_luck,
-                        "PRWins": pr_wins,
-                        "Points": points,
-                        "WinPct": (wins / games) * 100 if games > 0 else 0,
-                        "HeadToHeadScore": 0
-                    }
-                else:
-                    # Aggregate across multiple match types
-                    s = stats_dict[player_id]
-                    s["GamesPlayed"] += games
-                    s["Wins"] += wins
-                    s["Losses"] += losses
-                    s["PRWins"] += pr_wins or 0
-                    s["Points"] += points
-                    s["AvgPR"] = ((s["AvgPR"] or 0) + (avg_pr or 0)) / 2 if avg_pr is not None else s["AvgPR"]
-                    s["AvgLuck"] = ((s["AvgLuck"] or 0) + (avg_luck or 0)) / 2 if avg_luck is not None else s["AvgLuck"]
-                    s["WinPct"] = (s["Wins"] / s["GamesPlayed"]) * 100 if s["GamesPlayed"] > 0 else 0
-
-        print(f"📊 Base stats collected for {len(stats_dict)} players.")
-
-        # Step 2: Compute H2H for tied clusters
-        clusters = defaultdict(list)
-        for pid, stats in stats_dict.items():
-            key = (stats["Points"], stats["Wins"], stats["PRWins"])
-            clusters[key].append(pid)
+def show_series_page(series_id, render_league):
+    """
+    Render a series page from the series registry: progress header, then the OVERVIEW
+    and one tab per league through league_navigation(). render_league(match_type_id,
+    tab_name, days_left, snapshot) draws one league (league_tab in the public pages).
+    """
+    series = get_series_page(series_id)
+    if series is None:
+        st.error(f"Series {series_id} not found.")
+        return
 
-        for key, player_ids in clusters.items():
-            if len(player_ids) < 2:
-                continue
-            print(f"🔍 Calculating H2H for tied cluster: {key} | Players: {player_ids}")
-            for player_id in player_ids:
-                h2h_score = 0
-                for opponent_id in player_ids:
-                    if player_id == opponent_id:
-                        continue
-                    cursor.execute("""
-                        SELECT 
-                            CASE
-                                WHEN Player1ID = %s AND Player1Points > Player2Points THEN 1
-                                WHEN Player2ID = %s AND Player2Points > Player1Points THEN 1
-                                ELSE 0
-                            END AS Win
-                        FROM MatchResults
-                        WHERE MatchTypeID IN (
-                            SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s
-                        )
-                        AND ((Player1ID = %s AND Player2ID = %s) OR (Player1ID = %s AND Player2ID = %s))
-                    """, (player_id, player_id, series_id, player_id, opponent_id, opponent_id, player_id))
-                    h2h_score += sum(row[0] for row in cursor.fetchall())
-                stats_dict[player_id]["HeadToHeadScore"] = h2h_score
-                print(f"🧮 Player {player_id} H2H Score: {h2h_score}")
+    st.write(f"Loading data for the {series.label} series...")
+    matches_played = get_matchcount_by_series(series_id)
+    total_fixtures = get_fixturescount_by_series(series_id)
+    percentage = (matches_played / total_fixtures) * 100 if total_fixtures else 0
+    metric_value = f"{matches_played}/{total_fixtures} ({percentage:.1f}%)"
+
+    st.title("SABGA Backgammon presents...")
+    col1, col2 = st.columns(2)
+
+    if series.layout == SERIES_LAYOUT_SORTING:
+        col1.title("The Great Sorting!")
+        col2.metric("Progress...", metric_value, 0)
+        st.header("Player Standings - ordered by PR")
+        if series.overview:
+            st.write(series.overview)
+        display_sorting_series_table(series_id)
+        smccc(series_id)
+        return
 
-        # Step 3: Insert into SeriesPlayerStats
-        insert_query = """
-            INSERT INTO SeriesPlayerStats (
-                SeriesID, PlayerID, GamesPlayed, Wins, Losses, Points,
-                WinPercentage, PRWins, AveragePR, AverageLuck, HeadToHeadScore
-            ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-        """
-        for player_id, s in stats_dict.items():
-            cursor.execute(insert_query, (
-                series_id, player_id, s["GamesPlayed"], s["Wins"], s["Losses"], s["Points"],
-                s["WinPct"], s["PRWins"], s["AvgPR"], s["AvgLuck"], s["HeadToHeadScore"]
-            ))
+    yesterday = date_type.today() - timedelta(days=1)
+    match_count_yesterday = get_matchcount_by_date_and_series(yesterday.strftime("%Y-%m-%d"), series_id)
+    col1.title("Round Robin Leagues!")
+    col2.metric(f"{series.short_label} progress:", metric_value, match_count_yesterday)
+    if series.end_date:
+        col2.write(f"Deadline: {series.end_date.day} {series.end_date:%B %Y}")
+    days_left = series.days_left()
+
+    # Players.CurrentLeague is only right for the newest series
+    listed = [page for page in get_listed_series() if page.layout == SERIES_LAYOUT_LEAGUES]
+    is_newest = bool(listed) and listed[0].series_id == series_id
+
+    def show_overview():
+        st.header("Overview")
+        if series.overview:
+            st.markdown(f"**{series.overview}**")
+        if series.rules_url:
+            st.markdown(f"All league information (rules, etc) can be found here: "
+                        f"[{series.rules_label or series.rules_url}]({series.rules_url})", unsafe_allow_html=True)
+        st.write("This tab offers an overview: a table showing all players, recent results and remaining fixtures.")
+
+        if is_newest:
+            fetch_cached_series_standings_with_League(series_id)
+        else:
+            fetch_cached_series_standings(series_id)
+        smccc(series_id)
+        show_cached_remaining_fixtures_by_series(series_id)
+
+    matchtype_ids = series.match_type_ids
+    tab_names = ["OVERVIEW"] + list(matchtype_ids)
+    # Plain tabs render every league, so they share one snapshot; lazy mode reads per league
+    snapshot = None if lazy_navigation_enabled() else get_series_snapshot(series_id)
+
+    def render(name):
+        if name == "OVERVIEW":
+            show_overview()
+        else:
+            render_league(matchtype_ids[name], name, days_left, snapshot)
 
-        # Step 4: Refresh CompletedMatchesCache
-        cursor.execute("DELETE FROM CompletedMatchesCache WHERE SeriesID = %s", (series_id,))
-        cursor.execute("""
-            SELECT 
-                mr.FixtureID, f.MatchTypeID, f.Player1ID, f.Player2ID,
-                p1.Name, p2.Name,
-                mr.Player1Points, mr.Player2Points,
-                mr.Player1PR, mr.Player2PR,
-                mr.Player1Luck, mr.Player2Luck,
-                mr.Date, mr.TimeCompleted
-            FROM MatchResults mr
-            JOIN Fixtures f ON mr.FixtureID = f.FixtureID AND mr.MatchTypeID = f.MatchTypeID
-            JOIN Players p1 ON f.Player1ID = p1.PlayerID
-            JOIN Players p2 ON f.Player2ID = p2.PlayerID
-            WHERE f.MatchTypeID IN (
-                SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s
-            )
-        """, (series_id,))
-        completed_matches = cursor.fetchall()
+    league_navigation(f"series{series_id}", tab_names, render, matchtype_ids)
 
-        insert_completed_query = """
-            INSERT INTO CompletedMatchesCache (
-                SeriesID, FixtureID, MatchTypeID, Player1ID, Player2ID,
-                Player1Name, Player2Name,
-                Player1Points, Player2Points,
-                Player1PR, Player2PR,
-                Player1Luck, Player2Luck,
-                Winner, Date, TimeCompleted, LastUpdated
-            ) VALUES (
-                %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW()
-            )
-        """
-        for row in completed_matches:
-            (
-                fixture_id, match_type_id, p1_id, p2_id, p1_name, p2_name,
-                p1_pts, p2_pts, p1_pr, p2_pr, p1_luck, p2_luck,
-                date, time_completed
-            ) = row
-            winner = p1_name if p1_pts > p2_pts else p2_name if p2_pts > p1_pts else "Draw"
-            cursor.execute(insert_completed_query, (
-                series_id, fixture_id, match_type_id, p1_id, p2_id,
-                p1_name, p2_name,
-                p1_pts, p2_pts, p1_pr, p2_pr, p1_luck, p2_luck,
-                winner, date, time_completed
-            ))
+def _prefetch_worker(due):
+    """
+    Fill the per-league caches straight through _cached_read, so the readers' error
+    fallbacks (st.error) never run in this thread. A match type is marked as warmed
+    at its version only once all its readers have succeeded.
+    """
+    try:
+        for match_type_id, version in due:
+            for reader in (get_matchcount_by_matchtype, get_fixturescount_by_matchtype,
+                           get_averagePR_by_matchtype, _query_matchtype_standings, get_match_grid,
+                           _query_matchtype_remaining_fixtures, _query_matchtype_completed_matches):
+                _cached_read(reader.reader_name, version, (match_type_id,), ())
+            with _prefetch_lock:
+                _prefetched_versions[match_type_id] = version
+    except Exception as e:
+        log_debug(f"League prefetch stopped: {e}")
+    finally:
+        with _prefetch_lock:
+            _prefetching.difference_update(match_type_id for match_type_id, _ in due)
+        # Hand this thread's connection back to the pool now rather than at garbage collection
+        release_rerun_connection()
 
-        conn.commit()
-        print(f"✅ SeriesPlayerStats and CompletedMatchesCache updated for SeriesID {series_id}.")
+def prefetch_match_types(match_type_ids):
+    """
+    Warm the per-league caches of match_type_ids in a background thread.
+    Each match type is warmed once per data version; returns the number queued.
+    """
+    versions = get_data_versions()
+    if versions is None:
+        # Nothing is cached without DataVersion, so there is nothing to warm
+        return 0
 
-    except Exception as e:
-        print(f"❌ Error in refresh_series_stats({series_id}): {e}")
+    due = []
+    with _prefetch_lock:
+        for match_type_id in match_type_ids:
+            version = versions.get(("matchtype", int(match_type_id)), 0)
+            if _prefetched_versions.get(match_type_id) != version and match_type_id not in _prefetching:
+                _prefetching.add(match_type_id)
+                due.append((match_type_id, version))
 
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
+    if due:
+        threading.Thread(target=_prefetch_worker, args=(due,), name="league-prefetch", daemon=True).start()
+    return len(due)
 
 def refresh_series_stats930(series_id):
     import datetime
@@ -3663,9 +4999,6 @@ def fetch_cached_series_standings_with_League(series_id):
     import pandas as pd
 
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-
         query = """
             SELECT 
                 p.Name,
@@ -3683,8 +5016,7 @@ def fetch_cached_series_standings_with_League(series_id):
             JOIN Players p ON sps.PlayerID = p.PlayerID
             WHERE sps.SeriesID = %s
         """
-        cursor.execute(query, (series_id,))
-        rows = cursor.fetchall()
+        rows = fetch_series_rows(series_id, query, (series_id,))
 
         if not rows:
             st.subheader("No stats available for this series.")
@@ -3743,12 +5075,6 @@ def fetch_cached_series_standings_with_League(series_id):
     except Exception as e:
         st.error(f"Error displaying series standings: {e}")
 
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
-
 def fetch_cached_series_standings(series_id):
     """
     Display standings using precomputed stats from SeriesPlayerStats for the given series,
@@ -4558,15 +5884,12 @@ def display_matchtype_standings_withh2h(match_type_id):
         cursor.close()
         conn.close()
 
-def display_cached_matchtype_standings(match_type_id):
-    """
-    Display standings for a match type including players with fixtures but zero matches played.
-    """
+@cached_by_data_version("matchtype")
+def _query_matchtype_standings(match_type_id):
+    """Standings rows for a match type, including players with fixtures but zero matches played."""
+    conn = create_connection()
+    cursor = conn.cursor()
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-
-        # Fetch players with fixtures in this match type
         query = """
             SELECT 
                 p.Name, p.Nickname,
@@ -4588,10 +5911,21 @@ def display_cached_matchtype_standings(match_type_id):
                 s.GamesPlayed DESC
         """
         cursor.execute(query, (match_type_id, match_type_id))
-        rows = cursor.fetchall()
+        return cursor.fetchall()
+    finally:
         cursor.close()
         conn.close()
 
+def display_cached_matchtype_standings(match_type_id, snapshot=None):
+    """
+    Display standings for a match type including players with fixtures but zero matches played.
+    """
+    try:
+        if snapshot is not None:
+            rows = snapshot.standings_rows(match_type_id)
+        else:
+            rows = _query_matchtype_standings(match_type_id)
+
         if not rows:
             st.subheader("No players found for this match type.")
             return
@@ -5376,6 +6710,7 @@ def get_matchcount_by_date_and_matchtype(matchdate, match_type_id):
         cursor.close()
         conn.close()
 
+@cached_by_data_version("series", id_arg=1)
 def get_matchcount_by_date_and_series(matchdate, series_id):
     """
     Returns the count of matches completed on a specific date for a given series.
@@ -5438,16 +6773,21 @@ def get_matchcount_by_date(matchdate):
         cursor.close()
         conn.close()
 
-def get_matchcount_by_matchtype(matchtype_id):
+@cached_by_data_version("matchtype")
+def get_matchcount_by_matchtype(matchtype_id, snapshot=None):
     """
     Returns the count of completed matches for a specific match type.
     
     Args:
         matchtype_id (int): The ID of the match type.
+        snapshot (SeriesSnapshot, optional): Answer from this instead of querying.
     
     Returns:
         int: Number of completed matches.
     """
+    if snapshot is not None:
+        return snapshot.completed_count(matchtype_id)
+
     conn = create_connection()
     cursor = conn.cursor()
 
@@ -5467,6 +6807,7 @@ def get_matchcount_by_matchtype(matchtype_id):
         cursor.close()
         conn.close()
 
+@cached_by_data_version("series")
 def get_matchcount_by_series(series_id):
     """
     Returns the count of completed matches for a specific series.
@@ -5508,16 +6849,21 @@ def get_matchcount_by_series(series_id):
         cursor.close()
         conn.close()
 
-def get_fixturescount_by_matchtype(matchtype_id):
+@cached_by_data_version("matchtype")
+def get_fixturescount_by_matchtype(matchtype_id, snapshot=None):
     """
     Returns the count of matches for a specific match type.
     
     Args:
         matchtype_id (int): The ID of the match type.
+        snapshot (SeriesSnapshot, optional): Answer from this instead of querying.
     
     Returns:
         int: Number of matches.
     """
+    if snapshot is not None:
+        return snapshot.fixture_count(matchtype_id)
+
     conn = create_connection()
     cursor = conn.cursor()
 
@@ -5536,30 +6882,32 @@ def get_fixturescount_by_matchtype(matchtype_id):
         cursor.close()
         conn.close()
 
-def get_averagePR_by_matchtype(matchtype_id):
+@cached_by_data_version("matchtype", fallback=lambda: None, error_message="Error retrieving average PR")
+def get_averagePR_by_matchtype(matchtype_id, snapshot=None):
     """
     Retrieves the average PR (Performance Rating) for a given match type, rounded to 2 decimal places.
     """
+    if snapshot is not None:
+        return snapshot.average_pr(matchtype_id)
+
     query = """
         SELECT AVG((Player1PR + Player2PR) / 2) 
         FROM MatchResults 
         WHERE MatchTypeID = %s;
     """
+    conn = create_connection()  # Ensure you have a valid database connection
     try:
-        conn = create_connection()  # Ensure you have a valid database connection
         with conn.cursor() as cursor:
             cursor.execute(query, (matchtype_id,))
             result = cursor.fetchone()
+    finally:
         conn.close()
 
-        return round(result[0], 2) if result and result[0] is not None else 0.00  # Return 0.00 if no matches found
-
-    except Exception as e:
-        st.error(f"Error retrieving average PR: {e}")
-        return None
+    return round(result[0], 2) if result and result[0] is not None else 0.00  # Return 0.00 if no matches found
 
 
     
+@cached_by_data_version("series")
 def get_fixturescount_by_series(series_id): 
     """
     Returns the count of matches for a specific series.
@@ -5711,103 +7059,55 @@ def get_remaining_fixtures(match_type_id):
         st.error(f"Error retrieving remaining fixtures: {e}")
         return []
 
-def display_match_grid(match_type_id):
-    # Fetch match results for the specified match type
-    match_results = get_match_results_for_grid(match_type_id)
-    #st.write(match_results)
-    if match_results:
-        # Create a list of unique player names
-        player_names = set()
-        for result in match_results:
-            player_names.add(result[1])  # Player 1 Name
-            player_names.add(result[3])  # Player 2 Name
-            #st.write(f"Processing match 1 dmg: {player1_name} vs {player2_name}, {player1_points}-{player2_points}")
-
-        # Sort player names for consistent order
-        player_names = sorted(player_names)
-
-        # Initialize an empty DataFrame with player names as both rows and columns
-        score_df = pd.DataFrame(
-            "–",  # Default value
-            index=player_names,  # Scoring players
-            columns=player_names  # Opponent players
-        )
-
-        # Populate the DataFrame with match results
-        for result in match_results:
-            player1_name = result[1]
-            player2_name = result[3]
-            player1_points = result[4]  # Points scored by Player 1
-            player2_points = result[5]  # Points scored by Player 2
-
-            # Set points in the DataFrame
-            if player1_points is not None:
-                score_df.loc[player2_name, player1_name] = str(player1_points)  # Player 1 scored against Player 2
-            if player2_points is not None:
-                score_df.loc[player1_name, player2_name] = str(player2_points)  # Player 2 scored against Player 1
-
-        def highlight_diagonal(df):
-            # Create a blank style DataFrame with the same shape as the input DataFrame
-            style = pd.DataFrame("", index=df.index, columns=df.columns)
-            # Loop through the diagonal and apply the style
-            for i in range(min(len(df), len(df.columns))):  # Handle rectangular DataFrames gracefully
-                style.iloc[i, i] = "background-color: #505050; color: #505050;"  # Dark gray with invisible text
-
-            return style
+MATCH_GRID_EMPTY = "–"
+MATCH_GRID_DIAGONAL_STYLE = "background-color: #505050; color: #505050;"  # Dark gray with invisible text
 
-        # Apply the styling function
-        styled_df = score_df.style.apply(highlight_diagonal, axis=None)
-
-        # Display the styled DataFrame
-        st.subheader("Match Results Grid:")
-        st.dataframe(styled_df)  # Use st.dataframe for styling support
+def build_match_grid(match_results):
+    """
+    Results grid from get_match_results_for_grid() rows: players (sorted by name) on both axes,
+    cell [row, col] holds the points col scored against row, "–" where unplayed.
+    Players are mapped to integer indices and both sides of every result are written
+    in one NumPy scatter. Returns None when there are no results.
+    """
+    if not match_results:
+        return None
+    rows = np.array(match_results, dtype=object)
+    # A missing player name is a blank label, not "None"
+    names = rows[:, [1, 3]]
+    names[pd.isna(names)] = ""
+    player_names, index = np.unique(names.astype(str), return_inverse=True)
+    index = index.reshape(-1, 2)
+
+    # Scorer's column, opponent's row: Player1's points go in [Player2, Player1] and vice versa,
+    # interleaved in row order so a repeated pairing ends with its last result, as the old loop did
+    points = rows[:, [4, 5]].ravel()
+    opponent = index[:, ::-1].ravel()
+    scorer = index.ravel()
+    played = pd.notna(points)
+
+    grid = np.full((len(player_names), len(player_names)), MATCH_GRID_EMPTY, dtype=object)
+    grid[opponent[played], scorer[played]] = points[played].astype(str)
+    return pd.DataFrame(grid, index=player_names, columns=player_names)
+
+@cached_by_data_version("matchtype", fallback=lambda: None, error_message="Error fetching match results")
+def get_match_grid(match_type_id):
+    """build_match_grid() for a match type, cached until its data version changes."""
+    # The raw reader, so a failed read raises here instead of caching an empty grid
+    return build_match_grid(get_match_results_for_grid.uncached(match_type_id))
+
+@functools.lru_cache(maxsize=64)
+def _diagonal_style(size):
+    return np.where(np.eye(size, dtype=bool), MATCH_GRID_DIAGONAL_STYLE, "")
+
+def display_match_grid(match_type_id, snapshot=None):
+    # The snapshot already holds the results; otherwise use the grid cached per data version
+    if snapshot is not None:
+        score_df = build_match_grid(snapshot.grid_results(match_type_id))
     else:
-        st.write("No match results available for this match type.")
+        score_df = get_match_grid(match_type_id)
 
-
-def display_match_gridddd(match_type_id):
-    # Fetch match results for the specified match type
-    match_results = get_match_results_for_grid(match_type_id)
-    if match_results:
-        # Create a list of unique player names
-        player_names = set()
-        for result in match_results:
-            player_names.add(result[1])  # Player 1 Name
-            player_names.add(result[3])  # Player 2 Name
-
-        # Sort player names for consistent order
-        player_names = sorted(player_names)
-
-        # Initialize an empty DataFrame with player names as both rows and columns
-        score_df = pd.DataFrame(
-            "–",  # Default value
-            index=player_names,  # Scoring players
-            columns=player_names  # Opponent players
-        )
-
-        # Populate the DataFrame with match results
-        for result in match_results:
-            player1_name = result[1]
-            player2_name = result[3]
-            player1_points = result[4]  # Points scored by Player 1
-            player2_points = result[5]  # Points scored by Player 2
-
-            if player1_points is not None:
-                score_df.at[player2_name, player1_name] = str(player1_points)  # Points Player 1 scored against Player 2
-            if player2_points is not None:
-                score_df.at[player1_name, player2_name] = str(player2_points)  # Points Player 2 scored against Player 1
-
-        def highlight_diagonal(df):
-            # Create a blank style DataFrame with the same shape as the input DataFrame
-            style = pd.DataFrame("", index=df.index, columns=df.columns)
-            # Loop through the diagonal and apply the style
-            for i in range(min(len(df), len(df.columns))):  # Handle rectangular DataFrames gracefully
-                style.iloc[i, i] = "background-color: #505050; color: #505050;"  # Dark gray with invisible text
-
-            return style
-
-        # Apply the styling function
-        styled_df = score_df.style.apply(highlight_diagonal, axis=None)
+    if score_df is not None:
+        styled_df = score_df.style.apply(lambda df: _diagonal_style(len(df)), axis=None)
 
         # Display the styled DataFrame
         st.subheader("Match Results Grid:")
@@ -5815,55 +7115,6 @@ def display_match_gridddd(match_type_id):
     else:
         st.write("No match results available for this match type.")
 
-def display_match_gridd(match_type_id):
-    # Fetch match results for the specified match type
-    match_results = get_match_results_for_grid(match_type_id)
-    if match_results:
-        # Create a list of unique player names
-        player_names = set()
-        for result in match_results:
-            player_names.add(result[1])  # Player 1
-            player_names.add(result[3])  # Player 2
-
-        # Sort player names for consistent order
-        player_names = sorted(player_names)
-
-        # Initialize an empty DataFrame with player names as both rows and columns
-        score_df = pd.DataFrame(
-            "–",  # Default value
-            index=player_names,
-            columns=player_names
-        )
-
-        # Populate the DataFrame with match results
-        for result in match_results:
-            player1_name = result[1]
-            player2_name = result[3]
-            player1_points = result[4]
-            player2_points = result[5]
-
-            if player1_points is not None and player2_points is not None:
-                score_df.at[player1_name, player2_name] = f"{player1_points} - {player2_points}"
-                score_df.at[player2_name, player1_name] = f"{player2_points} - {player1_points}"
-
-        def highlight_diagonal(df):
-            # Create a blank style DataFrame with the same shape as the input DataFrame
-            style = pd.DataFrame("", index=df.index, columns=df.columns)
-            # Loop through the diagonal and apply the style
-            for i in range(min(len(df), len(df.columns))):  # Handle rectangular DataFrames gracefully
-                style.iloc[i, i] = "background-color: #505050; color: #505050;"  # Dark gray with invisible text
-
-            return style
-
-        # Apply the styling function
-        styled_df = score_df.style.apply(highlight_diagonal, axis=None)
-
-        # Display the styled DataFrame
-        st.subheader("Match Results Grid:")
-        st.dataframe(styled_df)  # Use st.dataframe for styling support
-    else:
-        st.write("No match results available for this match type.")
-        
 def list_remaining_fixtures(match_type_id):
     # Fetch remaining fixtures for the selected match type
     remaining_fixtures = get_remaining_fixtures(match_type_id)
@@ -6007,17 +7258,13 @@ def display_group_table(match_type_id):
 def smccc(series_id):
     # Connect to the database
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-
         # Step 1: Fetch MatchTypeIDs linked to the Series_ID
         query_match_types = """
         SELECT MatchTypeID
         FROM SeriesMatchTypes
         WHERE SeriesID = %s;
         """
-        cursor.execute(query_match_types, (series_id,))
-        match_type_ids = [row[0] for row in cursor.fetchall()]
+        match_type_ids = [row[0] for row in fetch_series_rows(series_id, query_match_types, (series_id,))]
 
         if not match_type_ids:
             st.warning("No match types found for the given series.")
@@ -6047,8 +7294,7 @@ def smccc(series_id):
           AND Fixtures.Completed = 1
         ORDER BY MatchResults.Date DESC, MatchResults.MatchResultID DESC;
         """
-        cursor.execute(query_matches, tuple(match_type_ids))
-        results = cursor.fetchall()
+        results = fetch_series_rows(series_id, query_matches, tuple(match_type_ids))
 
         if not results:
             st.warning("No completed matches found for this series.")
@@ -6105,11 +7351,8 @@ def smccc(series_id):
             st.dataframe(df.set_index("Date Completed"))
         else:
             st.subheader("No completed matches found.")
-    except Exception as e:
-        st.error(f"Error fetching matches for series: {e}")
-    finally:
-        if conn:
-            conn.close()
+    except Exception as e:
+        st.error(f"Error fetching matches for series: {e}")
 
 def get_series_completed_matches_detailed(series_id, player_id=None):
     """
@@ -6587,16 +7830,15 @@ def show_matches_completed(match_type_id):
     else:
         st.subheader("No completed matches found.")
 
-@st.cache_data(ttl=300)
+@cached_by_data_version("matchtype", fallback=list, error_message="Error fetching match results")
 def get_match_results_for_grid(match_type_id):
     """
     Fetch match results for a given match type, using MatchResults.MatchTypeID
     as the source of truth. Includes player names for grid display.
     """
+    conn = create_connection()
+    cursor = conn.cursor()
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-
         query = """
             SELECT 
                 p1.PlayerID AS Player1ID,
@@ -6612,15 +7854,11 @@ def get_match_results_for_grid(match_type_id):
             ORDER BY p1.Name ASC;
         """
         cursor.execute(query, (match_type_id,))
-        results = cursor.fetchall()
+        return cursor.fetchall()
 
+    finally:
         cursor.close()
         conn.close()
-        return results
-
-    except Exception as e:
-        st.error(f"Error fetching match results: {e}")
-        return []
 
 def get_match_results_for_grid930(match_type_id):
     try:
@@ -6742,6 +7980,8 @@ def reset_fixtures_completed():
         conn = create_connection()
         cursor = conn.cursor()
         cursor.execute("UPDATE Fixtures SET Completed = 0")  # Reset all 'Completed' columns to 0
+        cursor.execute("DELETE FROM SeriesRemainingFixturesCache")
+        cursor.execute(remaining_fixtures_insert_sql("1 = 1"))
         conn.commit()
         conn.close()
         st.success("All 'Completed' columns in Fixtures table have been reset to 0.")
@@ -6850,22 +8090,15 @@ def print_table_structure():
         conn.close()
 
 # Function to check if a result already exists in the MatchResults table
-def check_result_exists(player_1_points, player_1_length, player_2_points, player_2_length):
+def check_result_exists(fixture_id):
+    """True if the fixture already has a result (an index lookup on the unique MatchResults.FixtureID)."""
     try:
         conn = create_connection()
         cursor = conn.cursor()
-
-        # Query to check for existing results
-        query = """
-            SELECT COUNT(*) FROM MatchResults
-            WHERE Player1Points = %s AND Player1MatchLength = %s
-            AND Player2Points = %s AND Player2MatchLength = %s
-        """
-        cursor.execute(query, (player_1_points, player_1_length, player_2_points, player_2_length))
-        count = cursor.fetchone()[0]
-
+        cursor.execute("SELECT 1 FROM MatchResults WHERE FixtureID = %s LIMIT 1", (fixture_id,))
+        exists = cursor.fetchone() is not None
         conn.close()
-        return count > 0  # Returns True if a result already exists
+        return exists
     except mysql.connector.Error as e:
         st.error(f"Database error: {e}")
         return False
@@ -6874,13 +8107,13 @@ def check_result_exists(player_1_points, player_1_length, player_2_points, playe
 def insert_match_result(fixture_id, player1_points, player1_pr, player1_luck,
                         player2_points, player2_pr, player2_luck, match_type_id,
                         player1_id, player2_id):
+    conn = create_connection()
+    cursor = conn.cursor()
     try:
-        conn = create_connection()
-        cursor = conn.cursor()
-
-        # Get the current date and time for insertion
-        current_date = datetime.datetime.now().strftime('%Y-%m-%d')  # Format date as 'YYYY-MM-DD'
-        current_time = (datetime.now(timezone.utc) + timedelta(hours=2)).strftime("%H:%M")
+        # Get the current date and time for insertion (SAST)
+        now_sast = datetime.now(timezone.utc) + timedelta(hours=2)
+        current_date = now_sast.strftime('%Y-%m-%d')  # Format date as 'YYYY-MM-DD'
+        current_time = now_sast.strftime("%H:%M")
         
         # Insert match result
         cursor.execute('''
@@ -6900,36 +8133,631 @@ def insert_match_result(fixture_id, player1_points, player1_pr, player1_luck,
               player1_luck,
               player2_luck,
               fixture_id))
+        match_result_id = cursor.lastrowid
+        sync_player_match_facts(cursor, [match_result_id])
+        append_completed_matches(cursor, [match_result_id])
 
         # Mark fixture as completed
         cursor.execute("UPDATE Fixtures SET Completed = 1 WHERE FixtureID = %s", (fixture_id,))
+        sync_remaining_fixtures(cursor, [fixture_id])
+
+        # Fold the new result into the cached standings in the same transaction
+        result = {
+            "Player1ID": player1_id, "Player2ID": player2_id,
+            "Player1Points": player1_points, "Player2Points": player2_points,
+            "Player1PR": player1_pr, "Player2PR": player2_pr,
+            "Player1Luck": player1_luck, "Player2Luck": player2_luck,
+        }
+        apply_match_result_to_standings(match_type_id, result, conn=conn)
+        bump_data_version(cursor, [match_type_id])
+        enqueue_refresh(cursor, [match_type_id])
 
         conn.commit()
-        conn.close()
         st.success("Match result successfully added and fixture marked as completed.")
     except Exception as e:
+        conn.rollback()
         st.error(f"Error inserting match result or updating fixture: {e}")
+        return False
+    finally:
+        cursor.close()
+        conn.close()
+    return True
         
+# ------------------------------------------------------------------
+# Refresh queue
+# Result writes enqueue (Kind, TargetID) rows in RefreshQueue in the same
+# transaction; repeated enqueues of one key only move LastEnqueuedAt, so
+# a burst of results collapses to one entry per match type and series.
+# process_refresh_queue() (refresh_worker.py, or the admin page) runs an
+# entry once it has been quiet for the debounce window, or has waited
+# max_wait_seconds in total. The table is created by migration 8.
+# ------------------------------------------------------------------
+REFRESH_DEBOUNCE_SECONDS = 20
+REFRESH_MAX_WAIT_SECONDS = 120
+
+def enqueue_refresh(cursor, match_type_ids=(), series_ids=()):
+    """
+    Queue a standings refresh for the given match types, every series containing them
+    and the given series. Runs in the caller's transaction; does not commit.
+    """
+    match_type_ids = sorted({int(mt_id) for mt_id in match_type_ids if mt_id is not None})
+    series_ids = {int(s_id) for s_id in series_ids if s_id is not None}
+    try:
+        if match_type_ids:
+            placeholders = ", ".join(["%s"] * len(match_type_ids))
+            cursor.execute(
+                f"SELECT DISTINCT SeriesID FROM SeriesMatchTypes WHERE MatchTypeID IN ({placeholders})",
+                tuple(match_type_ids)
+            )
+            series_ids.update(row[0] for row in cursor.fetchall())
+
+        keys = [("matchtype", mt_id) for mt_id in match_type_ids] + [("series", s_id) for s_id in sorted(series_ids)]
+        if not keys:
+            return
+        cursor.execute(
+            "INSERT INTO RefreshQueue (Kind, TargetID) VALUES "
+            + ", ".join(["(%s, %s)"] * len(keys))
+            + " ON DUPLICATE KEY UPDATE LastEnqueuedAt = CURRENT_TIMESTAMP(3)",
+            [value for key in keys for value in key]
+        )
+    except mysql.connector.Error as e:
+        # A missing RefreshQueue table must not block the write itself
+        if e.errno != ER_NO_SUCH_TABLE:
+            raise
+        log_debug(f"Could not enqueue refresh: {e}")
+
+def get_refresh_queue():
+    """Pending refreshes as (Kind, TargetID, FirstEnqueuedAt, LastEnqueuedAt), oldest first."""
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            SELECT Kind, TargetID, FirstEnqueuedAt, LastEnqueuedAt
+            FROM RefreshQueue
+            ORDER BY FirstEnqueuedAt
+        """)
+        return cursor.fetchall()
+    except mysql.connector.Error as e:
+        log_debug(f"RefreshQueue unavailable: {e}")
+        return []
+    finally:
+        cursor.close()
+        conn.close()
+
+def _run_refresh(kind, target_id):
+    """Run one queued refresh; raises if it fails so the entry stays queued."""
+    if kind == "matchtype":
+        refresh_matchtype_stats(target_id)
+    elif kind == "series":
+        refresh_series_stats(target_id)
+    else:
+        log_debug(f"Unknown refresh kind '{kind}' for {target_id}; dropped.")
+
+def process_refresh_queue(debounce_seconds=REFRESH_DEBOUNCE_SECONDS, max_wait_seconds=REFRESH_MAX_WAIT_SECONDS):
+    """
+    Run every due refresh once (match types before series) and remove it from the queue
+    once it has succeeded. An entry re-enqueued while its refresh runs, or whose refresh
+    failed, stays queued for the next pass.
+    Only one process drains the queue at a time. Returns the number of refreshes run.
+    """
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT GET_LOCK('sabga_refresh_queue', 0)")
+        if not cursor.fetchone()[0]:
+            return 0
+        try:
+            cursor.execute("""
+                SELECT Kind, TargetID, LastEnqueuedAt
+                FROM RefreshQueue
+                WHERE LastEnqueuedAt <= NOW(3) - INTERVAL %s SECOND
+                   OR FirstEnqueuedAt <= NOW(3) - INTERVAL %s SECOND
+                ORDER BY Kind = 'series', FirstEnqueuedAt
+            """, (debounce_seconds, max_wait_seconds))
+            due = cursor.fetchall()
+            conn.commit()
+
+            ran = 0
+            for kind, target_id, last_enqueued_at in due:
+                try:
+                    _run_refresh(kind, target_id)
+                except Exception as e:
+                    log_debug(f"Refresh {kind} {target_id} failed, left queued: {e}")
+                    continue
+                cursor.execute("""
+                    DELETE FROM RefreshQueue
+                    WHERE Kind = %s AND TargetID = %s AND LastEnqueuedAt = %s
+                """, (kind, target_id, last_enqueued_at))
+                conn.commit()
+                ran += 1
+            return ran
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK('sabga_refresh_queue')")
+            cursor.fetchall()
+    except mysql.connector.Error as e:
+        log_debug(f"Refresh queue not processed: {e}")
+        return 0
+    finally:
+        cursor.close()
+        conn.close()
+
+# ------------------------------------------------------------------
+# Batch ingestion of emailed results
+# resolve_result_batch() looks up every identifier, nickname and fixture
+# of a batch with one IN (...) query each, and insert_match_results_batch()
+# writes all accepted results in one transaction, instead of four lookups
+# and one connection plus commit per email.
+# Each ingested email is recorded in IngestedMessages under its
+# (Message-ID, FixtureID), and MatchResults.FixtureID is unique
+# (migration 6), so re-reading a mailbox, or the PHP and Python
+# ingesters racing each other, cannot insert a result twice.
+# Emails that fail to parse or resolve are kept in FailedIngestions
+# (migration 7) with their reason, for the admin page to replay.
+# ------------------------------------------------------------------
+REJECT_UNKNOWN_IDENTIFIER = "unknown_identifier"
+REJECT_UNKNOWN_NICKNAME = "unknown_nickname"
+REJECT_NO_FIXTURE = "no_fixture"
+REJECT_FIXTURE_COMPLETED = "fixture_completed"
+REJECT_DUPLICATE = "duplicate_in_batch"
+
+MATCH_RESULT_INSERT_COLUMNS = [
+    "Date", "TimeCompleted", "MatchTypeID", "Player1ID", "Player2ID",
+    "Player1Points", "Player2Points", "Player1PR", "Player2PR", "Player1Luck", "Player2Luck", "FixtureID"
+]
+
+def _lookup_in(cursor, query, values):
+    """{lowercased key: id} for a "SELECT key, id ... IN ({placeholders})" query (matches the ci collation)."""
+    values = sorted(set(values))
+    if not values:
+        return {}
+    cursor.execute(query.format(placeholders=", ".join(["%s"] * len(values))), tuple(values))
+    return {str(key).lower(): row_id for key, row_id in cursor.fetchall()}
+
+def get_ingested_message_keys(message_keys):
+    """The subset of message_keys (Message-IDs) already recorded in IngestedMessages."""
+    message_keys = sorted(set(message_keys))
+    if not message_keys:
+        return set()
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(message_keys))
+        cursor.execute(f"SELECT DISTINCT MessageID FROM IngestedMessages WHERE MessageID IN ({placeholders})",
+                       tuple(message_keys))
+        return {row[0] for row in cursor.fetchall()}
+    finally:
+        cursor.close()
+        conn.close()
+
+def record_failed_ingestions(failures):
+    """
+    Store emails that could not be ingested in FailedIngestions, one row per message.
+    failures is a list of (RawEmail, reason, detail); a message that fails again gets its
+    reason updated, its attempt count bumped and is reopened if it had been resolved.
+    """
+    failures = list(failures)
+    if not failures:
+        return
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute(
+            "INSERT INTO FailedIngestions (MessageID, Subject, ToAddress, Body, Reason, Detail, LastFailedAt) VALUES "
+            + ", ".join(["(%s, %s, %s, %s, %s, %s, NOW())"] * len(failures))
+            + """ ON DUPLICATE KEY UPDATE Reason = VALUES(Reason), Detail = VALUES(Detail),
+                  Attempts = Attempts + 1, LastFailedAt = NOW(), ResolvedAt = NULL""",
+            [value for raw, reason, detail in failures
+             for value in (raw.message_key, raw.subject, raw.to[:255], raw.body, reason, str(detail)[:512])]
+        )
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+def resolve_failed_ingestions(message_keys):
+    """Mark the dead letters for these messages resolved (they have been ingested or need nothing more)."""
+    message_keys = sorted(set(message_keys))
+    if not message_keys:
+        return
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(message_keys))
+        cursor.execute(f"""
+            UPDATE FailedIngestions SET ResolvedAt = NOW()
+            WHERE MessageID IN ({placeholders}) AND ResolvedAt IS NULL
+        """, tuple(message_keys))
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+def dismiss_failed_ingestions(failed_ingestion_ids):
+    """Mark dead letters resolved by hand, e.g. after entering the result in AdminOnly."""
+    failed_ingestion_ids = [int(i) for i in failed_ingestion_ids]
+    if not failed_ingestion_ids:
+        return
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(failed_ingestion_ids))
+        cursor.execute(f"UPDATE FailedIngestions SET ResolvedAt = NOW() WHERE FailedIngestionID IN ({placeholders})",
+                       tuple(failed_ingestion_ids))
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+def get_failed_ingestions():
+    """Unresolved dead letters as a list of dicts, grouped by Reason, newest first."""
+    conn = create_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute("""
+            SELECT FailedIngestionID, MessageID, Subject, ToAddress, Body, Reason, Detail,
+                   Attempts, FirstFailedAt, LastFailedAt
+            FROM FailedIngestions
+            WHERE ResolvedAt IS NULL
+            ORDER BY Reason, LastFailedAt DESC
+        """)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+def resolve_result_batch(results):
+    """
+    Resolve parsed result emails (result_parser.ParsedResult) to MatchTypeID, PlayerIDs and the open fixture.
+    Returns (accepted, rejected): accepted is a list of (result, resolved) with resolved a dict of
+    MatchTypeID, Player1ID, Player2ID and FixtureID; rejected is a list of (result, reason, detail).
+    """
+    results = list(results)
+    if not results:
+        return [], []
+
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        match_types = _lookup_in(
+            cursor, "SELECT Identifier, MatchTypeID FROM MatchType WHERE Identifier IN ({placeholders})",
+            [r.identifier for r in results]
+        )
+        players = _lookup_in(
+            cursor, "SELECT Nickname, PlayerID FROM Players WHERE Nickname IN ({placeholders})",
+            [n for r in results for n in (r.player1_nickname, r.player2_nickname)]
+        )
+
+        # Every fixture between the batch's players in the batch's match types, in one query
+        match_type_ids = sorted(set(match_types.values()))
+        player_ids = sorted(set(players.values()))
+        fixtures = {}
+        if match_type_ids and player_ids:
+            mt_placeholders = ", ".join(["%s"] * len(match_type_ids))
+            p_placeholders = ", ".join(["%s"] * len(player_ids))
+            cursor.execute(f"""
+                SELECT FixtureID, MatchTypeID, Player1ID, Player2ID, Completed
+                FROM Fixtures
+                WHERE MatchTypeID IN ({mt_placeholders})
+                  AND Player1ID IN ({p_placeholders}) AND Player2ID IN ({p_placeholders})
+                ORDER BY Completed, FixtureID
+            """, tuple(match_type_ids) + tuple(player_ids) * 2)
+            for fixture_id, mt_id, p1_id, p2_id, completed in cursor.fetchall():
+                # Open fixtures sort first, so an open one wins over a completed duplicate
+                fixtures.setdefault((mt_id, frozenset((p1_id, p2_id))), (fixture_id, completed))
+    finally:
+        cursor.close()
+        conn.close()
+
+    accepted, rejected = [], []
+    seen_fixtures = set()
+    for result in results:
+        match_type_id = match_types.get(result.identifier.lower())
+        if match_type_id is None:
+            rejected.append((result, REJECT_UNKNOWN_IDENTIFIER, result.identifier))
+            continue
+        player1_id = players.get(result.player1_nickname.lower())
+        player2_id = players.get(result.player2_nickname.lower())
+        if player1_id is None or player2_id is None:
+            missing = [n for n, pid in ((result.player1_nickname, player1_id), (result.player2_nickname, player2_id)) if pid is None]
+            rejected.append((result, REJECT_UNKNOWN_NICKNAME, ", ".join(missing)))
+            continue
+        fixture = fixtures.get((match_type_id, frozenset((player1_id, player2_id))))
+        if fixture is None:
+            rejected.append((result, REJECT_NO_FIXTURE, f"MatchTypeID {match_type_id}, players {player1_id} and {player2_id}"))
+            continue
+        fixture_id, completed = fixture
+        if completed:
+            rejected.append((result, REJECT_FIXTURE_COMPLETED, f"FixtureID {fixture_id}"))
+            continue
+        if fixture_id in seen_fixtures:
+            rejected.append((result, REJECT_DUPLICATE, f"FixtureID {fixture_id}"))
+            continue
+        seen_fixtures.add(fixture_id)
+        accepted.append((result, {
+            "MatchTypeID": match_type_id, "Player1ID": player1_id,
+            "Player2ID": player2_id, "FixtureID": fixture_id,
+        }))
+    return accepted, rejected
+
+def insert_match_results_batch(accepted, source="python"):
+    """
+    Insert resolved results (from resolve_result_batch), record their emails in IngestedMessages
+    and mark their fixtures completed in one transaction, folding each into the cached standings.
+    Raises on a database error after rolling back, so nothing of the batch is written.
+    Returns the MatchTypeID of each inserted result.
+    """
+    if not accepted:
+        return []
+
+    # Date and time of insertion (SAST)
+    now_sast = datetime.now(timezone.utc) + timedelta(hours=2)
+    current_date = now_sast.strftime('%Y-%m-%d')
+    current_time = now_sast.strftime("%H:%M")
+
+    rows = [
+        (current_date, current_time, ids["MatchTypeID"], ids["Player1ID"], ids["Player2ID"],
+         result.player1_score, result.player2_score, result.player1_pr, result.player2_pr,
+         result.player1_luck, result.player2_luck, ids["FixtureID"])
+        for result, ids in accepted
+    ]
+    fixture_ids = [ids["FixtureID"] for _, ids in accepted]
+    match_type_ids = [ids["MatchTypeID"] for _, ids in accepted]
+    placeholders = ", ".join(["%s"] * len(fixture_ids))
+
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        # Build any standings that do not exist yet before the insert, so that each
+        # result of the batch is counted once, by its deltas below
+        unique_match_type_ids = sorted(set(match_type_ids))
+        for mt_id in unique_match_type_ids:
+            if not _standings_exist(cursor, "MatchTypePlayerStats", "MatchTypeID", mt_id):
+                refresh_matchtype_stats(mt_id, conn)
+        mt_placeholders = ", ".join(["%s"] * len(unique_match_type_ids))
+        cursor.execute(f"SELECT DISTINCT SeriesID FROM SeriesMatchTypes WHERE MatchTypeID IN ({mt_placeholders})",
+                       tuple(unique_match_type_ids))
+        for (series_id,) in cursor.fetchall():
+            if not _standings_exist(cursor, "SeriesPlayerStats", "SeriesID", series_id):
+                refresh_series_stats(series_id, conn)
+
+        # A concurrent insert for the same fixture fails here on uq_mr_fixture and rolls back the batch
+        bulk_insert(cursor, "MatchResults", MATCH_RESULT_INSERT_COLUMNS, rows)
+        cursor.execute(f"SELECT FixtureID, MatchResultID FROM MatchResults WHERE FixtureID IN ({placeholders})",
+                       tuple(fixture_ids))
+        result_ids = dict(cursor.fetchall())
+        sync_player_match_facts(cursor, result_ids.values())
+        append_completed_matches(cursor, result_ids.values())
+        bulk_insert(cursor, "IngestedMessages", ["MessageID", "FixtureID", "MatchResultID", "Source"], [
+            (result.message_key, ids["FixtureID"], result_ids.get(ids["FixtureID"]), source)
+            for result, ids in accepted
+        ])
+        cursor.execute(f"UPDATE Fixtures SET Completed = 1 WHERE FixtureID IN ({placeholders})",
+                       tuple(fixture_ids))
+        sync_remaining_fixtures(cursor, fixture_ids)
+        for (_, ids), row in zip(accepted, rows):
+            apply_match_result_to_standings(ids["MatchTypeID"], dict(zip(MATCH_RESULT_INSERT_COLUMNS, row)), conn=conn)
+        bump_data_version(cursor, match_type_ids)
+        enqueue_refresh(cursor, match_type_ids)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+    return match_type_ids
+
+# Update an existing match result and move its delta in the cached standings
+def update_match_result(match_result_id, date, time_completed, match_type_id, player1_id, player2_id,
+                        player1_points, player2_points, player1_pr, player2_pr, player1_luck, player2_luck):
+    conn = create_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute('''
+            SELECT MatchTypeID, Player1ID, Player2ID, Player1Points, Player2Points,
+                   Player1PR, Player2PR, Player1Luck, Player2Luck
+            FROM MatchResults
+            WHERE MatchResultID = %s
+        ''', (match_result_id,))
+        old = cursor.fetchone()
+
+        cursor.execute('''
+            UPDATE MatchResults
+            SET Date = %s, TimeCompleted = %s, MatchTypeID = %s, Player1ID = %s, Player2ID = %s,
+                Player1Points = %s, Player2Points = %s, Player1PR = %s, Player2PR = %s, Player1Luck = %s, Player2Luck = %s
+            WHERE MatchResultID = %s
+        ''', (date, time_completed, match_type_id, player1_id, player2_id, player1_points, player2_points,
+              player1_pr, player2_pr, player1_luck, player2_luck, match_result_id))
+        sync_player_match_facts(cursor, [match_result_id])
+        sync_completed_matches(cursor, [match_result_id])
+
+        new = {
+            "Player1ID": player1_id, "Player2ID": player2_id,
+            "Player1Points": player1_points, "Player2Points": player2_points,
+            "Player1PR": player1_pr, "Player2PR": player2_pr,
+            "Player1Luck": player1_luck, "Player2Luck": player2_luck,
+        }
+        if old:
+            apply_match_result_to_standings(old["MatchTypeID"], old, sign=-1, conn=conn)
+        apply_match_result_to_standings(match_type_id, new, sign=1, conn=conn)
+        bump_data_version(cursor, [match_type_id, old["MatchTypeID"] if old else None])
+        enqueue_refresh(cursor, [match_type_id, old["MatchTypeID"] if old else None])
+
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
+# Delete a match result, reopen its fixture and take it out of the cached standings
+def delete_match_result(match_result_id):
+    conn = create_connection()
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute('''
+            SELECT FixtureID, MatchTypeID, Player1ID, Player2ID, Player1Points, Player2Points,
+                   Player1PR, Player2PR, Player1Luck, Player2Luck
+            FROM MatchResults
+            WHERE MatchResultID = %s
+        ''', (match_result_id,))
+        old = cursor.fetchone()
+        if old is None:
+            return False
+
+        cursor.execute("DELETE FROM MatchResults WHERE MatchResultID = %s", (match_result_id,))
+        sync_player_match_facts(cursor, [match_result_id])
+        remove_completed_matches(cursor, [old["FixtureID"]])
+        if old["FixtureID"] is not None:
+            cursor.execute("UPDATE Fixtures SET Completed = 0 WHERE FixtureID = %s", (old["FixtureID"],))
+            sync_remaining_fixtures(cursor, [old["FixtureID"]])
+
+        apply_match_result_to_standings(old["MatchTypeID"], old, sign=-1, conn=conn)
+        bump_data_version(cursor, [old["MatchTypeID"]])
+        enqueue_refresh(cursor, [old["MatchTypeID"]])
+
+        conn.commit()
+        return True
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+def circle_method_rounds(player_ids):
+    """
+    Round-robin schedule by the circle method: n-1 rounds (n for an odd n, one player
+    sitting out each round) in which everyone plays at most once.
+    Returns [[(Player1ID, Player2ID), ...] for each round].
+    """
+    players = list(player_ids)
+    if len(players) % 2:
+        players.append(None)  # bye
+    n = len(players)
+
+    rounds = []
+    for round_index in range(n - 1):
+        pairs = []
+        for i in range(n // 2):
+            home, away = players[i], players[n - 1 - i]
+            if home is None or away is None:
+                continue
+            # The fixed player swaps sides every round so Player1/Player2 is spread evenly
+            if i == 0 and round_index % 2:
+                home, away = away, home
+            pairs.append((home, away))
+        rounds.append(pairs)
+        # Keep the first player fixed and rotate the rest one place
+        players = [players[0], players[-1]] + players[1:-1]
+    return rounds
+
+FIXTURE_INSERT_COLUMNS = ["MatchTypeID", "Player1ID", "Player2ID", "Completed", "RoundNumber"]
+
+def _fixture_rows(match_type_id, player_ids):
+    return [
+        (match_type_id, player1_id, player2_id, 0, round_number)
+        for round_number, pairs in enumerate(circle_method_rounds(player_ids), start=1)
+        for player1_id, player2_id in pairs
+    ]
+
 # Generating Fixtures in table from MatchTypeID and PlayerIDs
 def generate_fixture_entries(match_type_id, player_ids):
     conn = create_connection()
     cursor = conn.cursor()
 
-    # Generate fixtures for each unique pair of players
-    for i in range(len(player_ids)):
-        for j in range(i + 1, len(player_ids)):
-            player1_id = player_ids[i]
-            player2_id = player_ids[j]
+    try:
+        # Every pairing once, scheduled into rounds, in one multi-row insert
+        rows = _fixture_rows(match_type_id, player_ids)
+        bulk_insert(cursor, "Fixtures", FIXTURE_INSERT_COLUMNS, rows, chunk_size=max(len(rows), 1))
+
+        cursor.execute("SELECT FixtureID FROM Fixtures WHERE MatchTypeID = %s AND Completed = 0", (match_type_id,))
+        sync_remaining_fixtures(cursor, [row[0] for row in cursor.fetchall()])
+        bump_data_version(cursor, [match_type_id])
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+def setup_series_leagues(leagues, series_id=None, series_title=None, start_date=None, active=True, end_date=None):
+    """
+    Set up a series from a league allocation table in one transaction: the Series (if
+    series_title is given instead of series_id, with its dates for the series registry),
+    one MatchType per league with its SeriesMatchTypes link in allocation (tab) order,
+    and every league's round-robin fixtures with round numbers in one multi-row insert.
+    leagues is [(MatchTypeTitle, Identifier, [PlayerID, ...]), ...].
+    Raises ValueError for a bad allocation. Returns (SeriesID, {Identifier: MatchTypeID}).
+    """
+    if series_id is None and not series_title:
+        raise ValueError("Give either a series_id or a series_title")
+    if not leagues:
+        raise ValueError("The allocation has no leagues")
+
+    identifiers = [identifier for _, identifier, _ in leagues]
+    # MatchType.Identifier has a case-insensitive collation, so 'ALeague' and 'aleague' clash
+    lowered = [i.lower() for i in identifiers]
+    duplicates = sorted({i for i in identifiers if lowered.count(i.lower()) > 1})
+    if duplicates:
+        raise ValueError(f"Identifiers used by more than one league: {', '.join(duplicates)}")
+    league_of_player = {}
+    for title, _, player_ids in leagues:
+        if len(player_ids) < 2:
+            raise ValueError(f"{title} needs at least 2 players")
+        if len(set(player_ids)) != len(player_ids):
+            raise ValueError(f"{title} lists a player twice")
+        for player_id in player_ids:
+            if player_id in league_of_player:
+                raise ValueError(f"PlayerID {player_id} is in both {league_of_player[player_id]} and {title}")
+            league_of_player[player_id] = title
+
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        placeholders = ", ".join(["%s"] * len(identifiers))
+        cursor.execute(f"SELECT Identifier FROM MatchType WHERE Identifier IN ({placeholders})", tuple(identifiers))
+        taken = [row[0] for row in cursor.fetchall()]
+        if taken:
+            raise ValueError(f"Identifiers already in use: {', '.join(taken)}")
+
+        if series_id is None:
             cursor.execute(
-                """
-                INSERT INTO Fixtures (MatchTypeID, Player1ID, Player2ID, Completed)
-                VALUES (%s, %s, %s, %s)
-                """,
-                (match_type_id, player1_id, player2_id, 0),  # Set Completed to 0 by default
+                "INSERT INTO Series (SeriesTitle, PageTitle, StartDate, EndDate) VALUES (%s, %s, %s, %s)",
+                (series_title, series_title, start_date, end_date)
             )
+            series_id = cursor.lastrowid
 
-    conn.commit()
-    conn.close()
+        match_type_ids = {}
+        fixture_rows = []
+        for title, identifier, player_ids in leagues:
+            cursor.execute('''
+                INSERT INTO MatchType (MatchTypeTitle, Identifier, Active, StartDate)
+                VALUES (%s, %s, %s, %s)
+            ''', (title, identifier, active, start_date))
+            match_type_ids[identifier] = cursor.lastrowid
+            fixture_rows.extend(_fixture_rows(cursor.lastrowid, player_ids))
+
+        bulk_insert(cursor, "SeriesMatchTypes", ["SeriesID", "MatchTypeID", "TabOrder"],
+                    [(series_id, mt_id, order) for order, mt_id in enumerate(match_type_ids.values(), start=1)])
+        bulk_insert(cursor, "Fixtures", FIXTURE_INSERT_COLUMNS, fixture_rows, chunk_size=len(fixture_rows))
+
+        mt_placeholders = ", ".join(["%s"] * len(match_type_ids))
+        cursor.execute(remaining_fixtures_insert_sql(f"f.MatchTypeID IN ({mt_placeholders})"),
+                       tuple(match_type_ids.values()))
+        bump_data_version(cursor, match_type_ids.values(), series_ids=[series_id], reference=True)
+        # Builds the (all-zero) standings so every player shows before the first result
+        enqueue_refresh(cursor, match_type_ids.values(), [series_id])
+
+        conn.commit()
+        log_debug(f"✅ Series {series_id}: {len(match_type_ids)} leagues and {len(fixture_rows)} fixtures created.")
+        return series_id, match_type_ids
+
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
 
 def add_series(series_title):
     conn = create_connection()
@@ -6938,6 +8766,7 @@ def add_series(series_title):
         INSERT INTO Series (SeriesTitle)
         VALUES (%s)
     ''', (series_title,))
+    bump_data_version(cursor, reference=True)
     conn.commit()
     conn.close()
 
@@ -6978,6 +8807,8 @@ def remove_match_type_from_series(series_id, match_type_id):
             DELETE FROM SeriesMatchTypes 
             WHERE SeriesID = %s AND MatchTypeID = %s
         """, (series_id, match_type_id))
+        sync_match_type_facts(cursor, [match_type_id])
+        bump_data_version(cursor, [match_type_id], series_ids=[series_id], reference=True)
         
         conn.commit()
         conn.close()
@@ -6992,6 +8823,8 @@ def add_match_type_to_series(series_id, match_type_id):
         INSERT INTO SeriesMatchTypes (SeriesID, MatchTypeID)
         VALUES (%s, %s)
     ''', (series_id, match_type_id))
+    sync_match_type_facts(cursor, [match_type_id])
+    bump_data_version(cursor, [match_type_id], series_ids=[series_id], reference=True)
     conn.commit()
     conn.close()
 
@@ -7003,17 +8836,26 @@ def update_player(player_id, name, nickname, email):
         SET Name = %s, Nickname = %s, Email = %s
         WHERE PlayerID = %s
     ''', (name, nickname, email, player_id))
+    cursor.execute(
+        "SELECT DISTINCT MatchTypeID FROM Fixtures WHERE Player1ID = %s OR Player2ID = %s",
+        (player_id, player_id)
+    )
+    bump_data_version(cursor, [row[0] for row in cursor.fetchall()], reference=True)
     conn.commit()
     conn.close()
 
 def update_match_type_in_series(series_id, match_type_id):
     conn = create_connection()
     cursor = conn.cursor()
+    cursor.execute("SELECT MatchTypeID FROM SeriesMatchTypes WHERE SeriesID = %s", (series_id,))
+    old_match_type_ids = [row[0] for row in cursor.fetchall()]
     cursor.execute('''
         UPDATE SeriesMatchTypes
         SET MatchTypeID = %s
         WHERE SeriesID = %s
     ''', (match_type_id, series_id))
+    sync_match_type_facts(cursor, old_match_type_ids + [match_type_id])
+    bump_data_version(cursor, [match_type_id, *old_match_type_ids], series_ids=[series_id], reference=True)
     conn.commit()
     conn.close()
 
@@ -7025,9 +8867,55 @@ def update_series_title(series_id, series_title):
         SET SeriesTitle = %s
         WHERE SeriesID = %s
     ''', (series_title, series_id))
+    bump_data_version(cursor, reference=True)
     conn.commit()
     conn.close()
 
+def update_series_page(series_id, page_title, start_date, end_date, rules_url, rules_label, overview,
+                       layout=SERIES_LAYOUT_LEAGUES, listed=True):
+    """Save the series registry's page settings for one series."""
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            UPDATE Series
+            SET PageTitle = %s, StartDate = %s, EndDate = %s, RulesUrl = %s, RulesLabel = %s,
+                Overview = %s, PageLayout = %s, Listed = %s
+            WHERE SeriesID = %s
+        """, (page_title or None, start_date, end_date, rules_url or None, rules_label or None,
+              overview or None, layout, int(bool(listed)), series_id))
+        bump_data_version(cursor, series_ids=[series_id], reference=True)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
+def update_series_tabs(series_id, tabs):
+    """
+    Set the league tabs of a series: tabs is [(MatchTypeID, TabName, TabOrder, ShowTab)]
+    for match types already linked to it. A blank TabName falls back to the MatchTypeTitle.
+    """
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.executemany("""
+            UPDATE SeriesMatchTypes
+            SET TabName = %s, TabOrder = %s, ShowTab = %s
+            WHERE SeriesID = %s AND MatchTypeID = %s
+        """, [(tab_name or None, tab_order, int(bool(show_tab)), series_id, match_type_id)
+              for match_type_id, tab_name, tab_order, show_tab in tabs])
+        bump_data_version(cursor, series_ids=[series_id], reference=True)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+        conn.close()
+
 # Check for new emails
 def check_for_new_emails():
     # Get email credentials from Streamlit Secrets
@@ -7056,32 +8944,55 @@ def check_for_new_emails():
         st.write("No emails found with this search term in the subject.")
     # Logout from the email server
     mail.logout()
-    
+
+# IMAP watermark: (UIDValidity, LastUID) for a mailbox, or (None, 0) if it has not been read yet
+def get_ingestion_watermark(mailbox):
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("SELECT UIDValidity, LastUID FROM IngestionState WHERE Mailbox = %s", (mailbox,))
+        row = cursor.fetchone()
+        return (row[0], row[1]) if row else (None, 0)
+    finally:
+        cursor.close()
+        conn.close()
+
+# Record the last processed UID for a mailbox
+def set_ingestion_watermark(mailbox, uid_validity, last_uid):
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        cursor.execute("""
+            INSERT INTO IngestionState (Mailbox, UIDValidity, LastUID)
+            VALUES (%s, %s, %s)
+            ON DUPLICATE KEY UPDATE UIDValidity = VALUES(UIDValidity), LastUID = VALUES(LastUID)
+        """, (mailbox, uid_validity, last_uid))
+        conn.commit()
+    finally:
+        cursor.close()
+        conn.close()
+
 # Retrieve the email checker status
 def get_email_checker_status():
+    status = load_reference_data()["email_checker_enabled"]
+    if status is not None:
+        return status
+
+    # AppSettings is empty: insert the default value (enabled)
     conn = create_connection()
     cursor = conn.cursor()
-    
-    # Ensure the AppSettings table has at least one row
-    cursor.execute("SELECT EmailCheckerEnabled FROM AppSettings LIMIT 1")
-    result = cursor.fetchone()
-    
-    # If no row is found, insert default value (enabled) into AppSettings
-    if result is None:
-        cursor.execute("INSERT INTO AppSettings (EmailCheckerEnabled) VALUES (TRUE)")
-        conn.commit()
-        status = True  # Default to enabled if no record exists
-    else:
-        status = result[0]
-    
+    cursor.execute("INSERT INTO AppSettings (EmailCheckerEnabled) VALUES (TRUE)")
+    bump_data_version(cursor, reference=True)
+    conn.commit()
     conn.close()
-    return status
+    return True
 
 # Update the email checker status
 def set_email_checker_status(status):
     conn = create_connection()
     cursor = conn.cursor()
     cursor.execute("UPDATE AppSettings SET EmailCheckerEnabled = %s", (status,))
+    bump_data_version(cursor, reference=True)
     conn.commit()
     conn.close()
 
@@ -7245,6 +9156,7 @@ def add_player(name, nickname, email):
         INSERT INTO Players (Name, Nickname, Email) 
         VALUES (%s, %s, %s)
     ''', (name, nickname, email))
+    bump_data_version(cursor, reference=True)
     conn.commit()
     conn.close()
 
@@ -7257,6 +9169,7 @@ def add_match_type(match_type_title, match_type_identifier, active, start_date):
         INSERT INTO MatchType (MatchTypeTitle, Identifier, Active, StartDate)
         VALUES (%s, %s, %s,%s)
     ''', (match_type_title, match_type_identifier, active, start_date))
+    bump_data_version(cursor, reference=True)
     
     conn.commit()
     cursor.close()
@@ -7286,6 +9199,9 @@ def add_match_result(player1_id, player2_id, player1_points, player2_points, mat
                 (Date, Player1ID, Player2ID, Player1Points, Player2Points, MatchTypeID) 
                 VALUES (NOW(), %s, %s, %s, %s, %s)
             ''', (player1_id, player2_id, player1_points, player2_points, match_type_id))
+            sync_player_match_facts(cursor, [cursor.lastrowid])
+            bump_data_version(cursor, [match_type_id])
+            enqueue_refresh(cursor, [match_type_id])
             conn.commit()
             st.success("Match result added successfully!")
         
@@ -7318,6 +9234,8 @@ def add_fixture(match_type_id, player1_id, player2_id):
                 "INSERT INTO Fixtures (MatchTypeID, Player1ID, Player2ID, Completed) VALUES (%s, %s, %s, %s)",
                 (match_type_id, player1_id, player2_id, 0)  # Set Completed to 0 by default
             )
+            sync_remaining_fixtures(cursor, [cursor.lastrowid])
+            bump_data_version(cursor, [match_type_id])
             conn.commit()
             st.success("Fixture added successfully!")
         
@@ -7724,11 +9642,16 @@ def update_fixture(fixture_id, match_type_id, player1_id, player2_id, completed)
         cursor = conn.cursor()
         
         # Update the fixture details
+        cursor.execute("SELECT MatchTypeID FROM Fixtures WHERE FixtureID = %s", (fixture_id,))
+        previous = cursor.fetchone()
+
         cursor.execute('''
             UPDATE Fixtures 
             SET MatchTypeID = %s, Player1ID = %s, Player2ID = %s, Completed = %s 
             WHERE FixtureID = %s
         ''', (match_type_id, player1_id, player2_id, int(completed), fixture_id))
+        sync_remaining_fixtures(cursor, [fixture_id])
+        bump_data_version(cursor, [match_type_id, previous[0] if previous else None])
         
         conn.commit()
         conn.close()
@@ -7745,6 +9668,7 @@ def update_match_type_status(match_type_id, active, identifier):
             SET Active = %s, Identifier = %s 
             WHERE MatchTypeID = %s
         ''', (active, identifier, match_type_id))
+        bump_data_version(cursor, reference=True)
         conn.commit()
         conn.close()
     except Exception as e:
@@ -0,0 +1,206 @@
+"""
+Long-running result-ingestion worker, replacing the checknparse_emails.php cron loop.
+
+Holds an IMAP IDLE connection to the results mailbox and ingests each new
+result email within seconds, using the same parsing and watermark as
+PublicApp.check_for_new_emails (mail_ingest.py). Inserted results queue
+their standings refresh, which the refresh worker (refresh_worker.py, run
+here in a background thread unless --no-refresh) runs once per burst.
+The AppSettings.EmailCheckerEnabled switch pauses ingestion without
+stopping the worker. Dropped connections are retried with exponential backoff.
+
+Credentials come from .streamlit/secrets.toml ([imap] and [database]), so run
+it from the repository root:
+
+    python ingest_worker.py                      # mail.sabga.co.za:993 over SSL
+    python ingest_worker.py --once               # one ingestion pass, then exit
+    python ingest_worker.py --host localhost --port 1143 --no-ssl   # local IMAP stand-in
+"""
+import argparse
+import imaplib
+import select
+import threading
+import time
+from datetime import datetime
+
+import mysql.connector
+import streamlit as st
+
+from database import get_email_checker_status, log_debug, reset_data_versions
+from mail_ingest import ingest_new_messages, process_result_batch
+from refresh_worker import start_refresh_thread
+
+DEFAULT_HOST = "mail.sabga.co.za"
+DEFAULT_PORT = 993
+
+# Re-issue IDLE before the 29-minute server limit (RFC 2177)
+IDLE_SECONDS = 25 * 60
+
+# Used instead of IDLE if the server does not support it
+POLL_SECONDS = 60
+
+# How often to re-check EmailCheckerEnabled while ingestion is switched off
+DISABLED_CHECK_SECONDS = 60
+
+BACKOFF_INITIAL_SECONDS = 2
+BACKOFF_MAX_SECONDS = 300
+
+
+def log(message):
+    print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {message}", flush=True)
+    log_debug(f"ingest_worker: {message}")
+
+
+def connect(host, port, user, password, use_ssl=True):
+    mail = imaplib.IMAP4_SSL(host, port) if use_ssl else imaplib.IMAP4(host, port)
+    mail.login(user, password)
+    return mail
+
+
+def _data_waiting(mail, timeout):
+    sock = mail.sock
+    # Decrypted bytes already held by the SSL layer do not show up in select()
+    if hasattr(sock, "pending") and sock.pending():
+        return True
+    ready, _, _ = select.select([sock], [], [], max(timeout, 0))
+    return bool(ready)
+
+
+def idle_wait(mail, timeout, stop=None):
+    """
+    Block in IMAP IDLE until the server announces new mail, timeout seconds pass
+    or stop is set. Returns True if new mail was announced.
+    """
+    tag = mail._new_tag()
+    mail.send(tag + b" IDLE\r\n")
+    line = mail.readline()
+    if not line.startswith(b"+"):
+        raise imaplib.IMAP4.error(f"IDLE refused: {line!r}")
+
+    arrived = False
+    deadline = time.monotonic() + timeout
+    while not arrived and time.monotonic() < deadline and not (stop and stop.is_set()):
+        # Wake up at least once a second so stop is noticed promptly
+        if not _data_waiting(mail, min(1.0, deadline - time.monotonic())):
+            continue
+        line = mail.readline()
+        if not line:
+            raise imaplib.IMAP4.abort("Connection closed during IDLE")
+        if line.startswith(b"* BYE"):
+            raise imaplib.IMAP4.abort(line.decode(errors="replace").strip())
+        arrived = line.rstrip().endswith((b"EXISTS", b"RECENT"))
+
+    mail.send(b"DONE\r\n")
+    while True:
+        line = mail.readline()
+        if not line:
+            raise imaplib.IMAP4.abort("Connection closed ending IDLE")
+        if line.startswith(tag):
+            if b" OK" not in line:
+                raise imaplib.IMAP4.error(f"IDLE failed: {line!r}")
+            return arrived
+
+
+def wait_for_mail(mail, stop=None):
+    if "IDLE" in mail.capabilities:
+        return idle_wait(mail, IDLE_SECONDS, stop)
+    _sleep(POLL_SECONDS, stop)
+    mail.noop()
+    return True
+
+
+def _sleep(seconds, stop=None):
+    if stop is None:
+        time.sleep(seconds)
+    else:
+        stop.wait(seconds)
+
+
+def ingest_once(mail, user):
+    """One ingestion pass over everything above the watermark. Returns the number of results inserted."""
+    inserted = []
+
+    def handle(messages):
+        inserted.extend(process_result_batch(messages, log=log, error=log))
+
+    ingest_new_messages(mail, user, handle, log=log)
+    if inserted:
+        log(f"✅ {len(inserted)} result(s) inserted; standings refresh queued.")
+    return len(inserted)
+
+
+def run_worker(host, port, user, password, use_ssl=True, once=False, stop=None):
+    """
+    Ingest until stop is set (a threading.Event), reconnecting with exponential backoff.
+    With once=True, run a single pass and return.
+    """
+    backoff = BACKOFF_INITIAL_SECONDS
+    was_enabled = None
+    while not (stop and stop.is_set()):
+        mail = None
+        try:
+            mail = connect(host, port, user, password, use_ssl)
+            log(f"📬 Connected to {host}:{port} as {user}.")
+            backoff = BACKOFF_INITIAL_SECONDS
+
+            while not (stop and stop.is_set()):
+                # Pick up writes made by the apps (including the enable switch)
+                reset_data_versions()
+                enabled = get_email_checker_status()
+                if enabled != was_enabled:
+                    log("▶️ Email checker enabled." if enabled else "⏸️ Email checker disabled; waiting.")
+                    was_enabled = enabled
+
+                if not enabled:
+                    if once:
+                        return
+                    _sleep(DISABLED_CHECK_SECONDS, stop)
+                    mail.noop()
+                    continue
+
+                ingest_once(mail, user)
+                if once:
+                    return
+                wait_for_mail(mail, stop)
+
+        except (imaplib.IMAP4.error, OSError, mysql.connector.Error) as e:
+            # The watermark only moves past committed batches, so the retry picks up where this failed
+            log(f"⚠️ {type(e).__name__}: {e}; reconnecting in {backoff}s.")
+            if once:
+                raise
+            _sleep(backoff, stop)
+            backoff = min(backoff * 2, BACKOFF_MAX_SECONDS)
+
+        finally:
+            if mail is not None:
+                try:
+                    mail.logout()
+                except (imaplib.IMAP4.error, OSError):
+                    pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingest emailed match results as they arrive.")
+    parser.add_argument("--host", default=None)
+    parser.add_argument("--port", type=int, default=None)
+    parser.add_argument("--no-ssl", action="store_true", help="plain IMAP, e.g. for a local test server")
+    parser.add_argument("--once", action="store_true", help="run one ingestion pass and exit")
+    parser.add_argument("--no-refresh", action="store_true", help="leave the refresh queue to refresh_worker.py")
+    args = parser.parse_args(argv)
+
+    imap = st.secrets["imap"]
+    host = args.host or imap.get("host", DEFAULT_HOST)
+    port = args.port or int(imap.get("port", DEFAULT_PORT))
+
+    stop = threading.Event()
+    if not args.once and not args.no_refresh:
+        start_refresh_thread(stop)
+    try:
+        run_worker(host, port, imap["email"], imap["password"], use_ssl=not args.no_ssl, once=args.once, stop=stop)
+    except KeyboardInterrupt:
+        stop.set()
+        log("👋 Stopped.")
+
+
+if __name__ == "__main__":
+    main()
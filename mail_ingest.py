@@ -0,0 +1,211 @@
+"""
+Incremental IMAP fetching for result emails.
+
+The last processed UID (and the mailbox's UIDVALIDITY) are stored in the
+IngestionState table, so each run only asks the server for newer UIDs and
+fetches just the headers and first text part of those messages, in batches.
+Each batch is resolved and inserted as a whole (process_result_batch); emails
+that cannot be ingested are kept in FailedIngestions for replay.
+"""
+import email
+import imaplib
+import re
+from collections import namedtuple
+from email.message import Message
+
+from database import (
+    REJECT_DUPLICATE, REJECT_FIXTURE_COMPLETED, get_failed_ingestions, get_ingested_message_keys,
+    get_ingestion_watermark, insert_match_results_batch, record_failed_ingestions, resolve_failed_ingestions,
+    resolve_result_batch, set_ingestion_watermark
+)
+from result_parser import RESULT_SUBJECT, ParseError, RawEmail, parse_raw, raw_email
+
+# UIDs per FETCH round trip
+FETCH_BATCH_SIZE = 50
+
+HEADER_FIELDS = "SUBJECT FROM TO DATE MESSAGE-ID CONTENT-TYPE CONTENT-TRANSFER-ENCODING"
+
+FetchedMessage = namedtuple("FetchedMessage", ["uid", "headers", "body"])
+
+_UID_RE = re.compile(rb"UID (\d+)")
+_ITEM_RE = re.compile(rb"(BODY\[[^\]]*\])")
+_MESSAGE_START_RE = re.compile(rb"^\d+ \(")
+
+
+def mailbox_key(user, mailbox="INBOX"):
+    return f"{user}/{mailbox}"
+
+
+def select_mailbox(mail, mailbox="INBOX"):
+    """SELECT the mailbox (read-only) and return its UIDVALIDITY."""
+    status, _ = mail.select(mailbox, readonly=True)
+    if status != "OK":
+        raise imaplib.IMAP4.error(f"Cannot select {mailbox}")
+    _, data = mail.response("UIDVALIDITY")
+    return int(data[0]) if data and data[0] else None
+
+
+def search_new_uids(mail, last_uid, subject=RESULT_SUBJECT):
+    """UIDs above last_uid whose subject contains `subject` (so Fwd:/Re: copies match too), ascending."""
+    status, data = mail.uid("SEARCH", None, f"UID {last_uid + 1}:*", "SUBJECT", f'"{subject}"')
+    if status != "OK" or not data or not data[0]:
+        return []
+    # "n:*" always matches the highest UID, even when it is below n
+    return sorted(uid for uid in (int(u) for u in data[0].split()) if uid > last_uid)
+
+
+def _decode_part(headers, mime_headers, payload):
+    """Decode the first text part using its own MIME headers, or the message's if it is not multipart."""
+    if mime_headers and mime_headers.strip():
+        part = email.message_from_bytes(mime_headers.rstrip(b"\r\n") + b"\r\n\r\n" + payload)
+    else:
+        part = Message()
+        for name in ("Content-Type", "Content-Transfer-Encoding"):
+            if headers[name]:
+                part[name] = headers[name]
+        part.set_payload(payload)
+    decoded = part.get_payload(decode=True)
+    if decoded is None:
+        decoded = payload
+    charset = part.get_content_charset() or "utf-8"
+    try:
+        return decoded.decode(charset, errors="replace")
+    except LookupError:
+        return decoded.decode("utf-8", errors="replace")
+
+
+def _parse_fetch_response(data):
+    """Split an imaplib UID FETCH response into {uid: {item: bytes}}."""
+    messages = {}
+    current = None
+    for piece in data:
+        meta, literal = (piece[0], piece[1]) if isinstance(piece, tuple) else (piece, None)
+        if meta is None:
+            continue
+        if _MESSAGE_START_RE.match(meta):
+            current = {}
+        if current is None:
+            continue
+        uid = _UID_RE.search(meta)
+        if uid:
+            messages[int(uid.group(1))] = current
+        if literal is not None:
+            items = _ITEM_RE.findall(meta)
+            if items:
+                current[items[-1].decode().upper()] = literal
+    return messages
+
+
+def fetch_message_batches(mail, uids):
+    """
+    Yield lists of FetchedMessage with the headers and first body part of `uids`,
+    FETCH_BATCH_SIZE per round trip. BODY.PEEK leaves the messages unread for other clients.
+    """
+    for start in range(0, len(uids), FETCH_BATCH_SIZE):
+        batch = uids[start:start + FETCH_BATCH_SIZE]
+        status, data = mail.uid(
+            "FETCH", ",".join(str(uid) for uid in batch),
+            f"(UID BODY.PEEK[HEADER.FIELDS ({HEADER_FIELDS})] BODY.PEEK[1.MIME] BODY.PEEK[1])"
+        )
+        if status != "OK":
+            raise imaplib.IMAP4.error(f"FETCH failed for UIDs {batch[0]}-{batch[-1]}")
+
+        fetched = []
+        for uid, items in sorted(_parse_fetch_response(data).items()):
+            header_bytes = next((v for k, v in items.items() if k.startswith("BODY[HEADER.FIELDS")), b"")
+            headers = email.message_from_bytes(header_bytes)
+            body = _decode_part(headers, items.get("BODY[1.MIME]"), items.get("BODY[1]", b""))
+            fetched.append(FetchedMessage(uid, headers, body))
+        yield batch, fetched
+
+
+def to_raw_email(message):
+    return raw_email(message.headers["Subject"], str(message.headers["To"] or ""), message.body,
+                     message_id=message.headers["Message-ID"])
+
+
+def ingest_raw_emails(emails, log=print, error=print):
+    """
+    Parse a batch of RawEmails, resolve them with one query per entity and insert every accepted
+    result in one transaction. Emails an admin needs to look at (unparseable, unknown identifier or
+    nickname, no fixture) are stored in FailedIngestions; emails that went in, or need nothing more,
+    have their dead letters resolved. Returns (MatchTypeID of each inserted result, number failed).
+    """
+    emails = {raw.message_key: raw for raw in emails}
+    failures = []
+    parsed = []
+    for raw in emails.values():
+        try:
+            parsed.append(parse_raw(raw))
+        except ParseError as e:
+            failures.append((raw, e.reason, e.detail))
+
+    # Emails already recorded in IngestedMessages are skipped before any lookups
+    done = get_ingested_message_keys(r.message_key for r in parsed)
+    parsed = [r for r in parsed if r.message_key not in done]
+
+    accepted, rejected = resolve_result_batch(parsed)
+    for result, reason, detail in rejected:
+        # Re-sent or re-read emails for a finished fixture are the normal case, not a failure
+        if reason in (REJECT_FIXTURE_COMPLETED, REJECT_DUPLICATE):
+            done.add(result.message_key)
+        else:
+            failures.append((emails[result.message_key], reason, detail))
+
+    inserted = insert_match_results_batch(accepted)
+    for result, ids in accepted:
+        done.add(result.message_key)
+        log(f"Match result added: {result.player1_nickname} v {result.player2_nickname} (FixtureID {ids['FixtureID']})")
+
+    for raw, reason, detail in failures:
+        error(f"Could not ingest '{raw.subject}': {reason}, {detail}")
+    record_failed_ingestions(failures)
+    resolve_failed_ingestions(done)
+    return inserted, len(failures)
+
+
+def process_result_batch(messages, log=print, error=print):
+    """Ingest a batch of FetchedMessages. Returns the MatchTypeID of each inserted result."""
+    inserted, _ = ingest_raw_emails([to_raw_email(m) for m in messages], log, error)
+    return inserted
+
+
+def replay_failed_ingestions(log=print, error=print):
+    """
+    Re-run every unresolved dead letter through the parser and batch resolver, e.g. after a
+    nickname or identifier has been fixed. Returns (results inserted, emails still failing).
+    """
+    emails = [RawEmail(row["MessageID"], row["Subject"] or "", row["ToAddress"] or "", row["Body"] or "")
+              for row in get_failed_ingestions()]
+    if not emails:
+        return 0, 0
+    inserted, failed = ingest_raw_emails(emails, log, error)
+    return len(inserted), failed
+
+
+def ingest_new_messages(mail, user, handle_batch, mailbox="INBOX", log=print):
+    """
+    Process every result email newer than the stored watermark with handle_batch(list of FetchedMessage),
+    one FETCH batch at a time in UID order, advancing the watermark after each batch. If the server's
+    UIDVALIDITY changed, the watermark is reset and the mailbox is scanned again from the start.
+    Returns the number of messages handled.
+    """
+    key = mailbox_key(user, mailbox)
+    uid_validity = select_mailbox(mail, mailbox)
+    stored_validity, last_uid = get_ingestion_watermark(key)
+    if stored_validity is not None and stored_validity != uid_validity:
+        log(f"UIDVALIDITY changed for {key} ({stored_validity} -> {uid_validity}); rescanning.")
+        last_uid = 0
+
+    uids = search_new_uids(mail, last_uid)
+    if not uids:
+        if stored_validity != uid_validity:
+            set_ingestion_watermark(key, uid_validity, last_uid)
+        return 0
+
+    handled = 0
+    for batch_uids, messages in fetch_message_batches(mail, uids):
+        handle_batch(messages)
+        handled += len(messages)
+        set_ingestion_watermark(key, uid_validity, batch_uids[-1])
+    return handled
@@ -0,0 +1,521 @@
+"""
+Versioned schema migrations for the SABGA Round Robin database.
+
+Each migration has a version number and a list of steps. Applied versions
+are recorded in the SchemaVersion table, so running the migrations again
+only applies the new ones.
+
+Run from CreateDBApp.py or from the command line:
+
+    python migrations.py             # apply pending migrations
+    python migrations.py --dry-run   # print pending DDL and current EXPLAIN plans
+    python migrations.py --explain   # apply, printing EXPLAIN before and after
+    python migrations.py --backfill-facts   # rebuild PlayerMatchFacts from MatchResults
+    python migrations.py --rebuild-completed   # rebuild the completed-match caches (repair)
+"""
+import sys
+
+import mysql.connector
+
+from database import (
+    backfill_player_match_facts,
+    create_connection,
+    rebuild_completed_match_caches,
+)
+
+
+def add_index(table, name, columns, unique=False):
+    return {"kind": "index", "table": table, "name": name, "columns": columns, "unique": unique}
+
+
+def run_sql(statement, params=None):
+    return {"kind": "sql", "statement": statement, "params": params}
+
+
+def add_column(table, name, definition):
+    """ALTER TABLE ... ADD COLUMN, skipped if the column is already there."""
+    return {"kind": "add_column", "table": table, "name": name, "definition": definition}
+
+
+def drop_index(table, name):
+    return {"kind": "drop_index", "table": table, "name": name}
+
+
+def require_empty(query, message):
+    """Stop the migration (before anything in it is applied) if query returns any rows."""
+    return {"kind": "require_empty", "query": query, "message": message}
+
+
+# Append new migrations to the end; never edit or renumber an applied one.
+MIGRATIONS = [
+    {
+        "version": 1,
+        "description": "Indexes on hot MatchResults and Fixtures columns",
+        "steps": [
+            add_index("MatchResults", "idx_mr_matchtype_date", ["MatchTypeID", "Date"]),
+            add_index("MatchResults", "idx_mr_player1_date", ["Player1ID", "Date"]),
+            add_index("MatchResults", "idx_mr_player2_date", ["Player2ID", "Date"]),
+            add_index("MatchResults", "idx_mr_fixture", ["FixtureID"]),
+            # Covers the H2H tiebreak scan without touching the table rows
+            add_index("MatchResults", "idx_mr_matchtype_players_points",
+                      ["MatchTypeID", "Player1ID", "Player2ID", "Player1Points", "Player2Points"]),
+            add_index("Fixtures", "idx_fx_matchtype_completed", ["MatchTypeID", "Completed"]),
+            add_index("Fixtures", "idx_fx_player1", ["Player1ID"]),
+            add_index("Fixtures", "idx_fx_player2", ["Player2ID"]),
+            add_index("Walkovers", "idx_wo_matchtype", ["MatchTypeID"]),
+            add_index("SeriesMatchTypes", "idx_smt_series_matchtype", ["SeriesID", "MatchTypeID"]),
+            add_index("SeriesMatchTypes", "idx_smt_matchtype", ["MatchTypeID"]),
+        ],
+    },
+    {
+        "version": 2,
+        "description": "Indexes on the stats and cache tables",
+        "steps": [
+            add_index("MatchTypePlayerStats", "idx_mtps_matchtype_player", ["MatchTypeID", "PlayerID"]),
+            add_index("SeriesPlayerStats", "idx_sps_series_player", ["SeriesID", "PlayerID"]),
+            add_index("MatchTypeCompletedCache", "idx_mtcc_matchtype_date", ["MatchTypeID", "Date"]),
+            add_index("CompletedMatchesCache", "idx_cmc_series_date", ["SeriesID", "Date"]),
+            add_index("SeriesRemainingFixturesCache", "idx_srfc_series", ["SeriesID"]),
+            add_index("MatchTypeRemainingFixtures", "idx_mtrf_matchtype", ["MatchTypeID"]),
+        ],
+    },
+    {
+        "version": 3,
+        "description": "PlayerMatchFacts: one row per player per match result",
+        "steps": [
+            run_sql("""
+                CREATE TABLE IF NOT EXISTS PlayerMatchFacts (
+                    PlayerID INT NOT NULL,
+                    OpponentID INT NOT NULL,
+                    MatchResultID INT NOT NULL,
+                    MatchTypeID INT,
+                    SeriesID INT,
+                    SeasonID INT,
+                    Date DATE,
+                    Points INT,
+                    OppPoints INT,
+                    PR FLOAT,
+                    OppPR FLOAT,
+                    Luck FLOAT,
+                    Won TINYINT NOT NULL DEFAULT 0,
+                    PRWon TINYINT NOT NULL DEFAULT 0,
+                    PRIMARY KEY (PlayerID, MatchResultID),
+                    KEY idx_pmf_player_date (PlayerID, Date),
+                    KEY idx_pmf_result (MatchResultID),
+                    KEY idx_pmf_matchtype_player (MatchTypeID, PlayerID),
+                    KEY idx_pmf_series_player (SeriesID, PlayerID),
+                    KEY idx_pmf_season_player (SeasonID, PlayerID)
+                )
+            """),
+            # Frozen copy of database.player_match_facts_insert_sql() as it was for this migration
+            run_sql("""
+                INSERT INTO PlayerMatchFacts (PlayerID, OpponentID, MatchResultID, MatchTypeID, SeriesID, SeasonID,
+                                              Date, Points, OppPoints, PR, OppPR, Luck, Won, PRWon)
+                SELECT mr.Player1ID, mr.Player2ID, mr.MatchResultID, mr.MatchTypeID,
+                       smt.SeriesID, ss.SeasonID, mr.Date,
+                       mr.Player1Points, mr.Player2Points, mr.Player1PR, mr.Player2PR, mr.Player1Luck,
+                       mr.Player1Points > mr.Player2Points,
+                       COALESCE(mr.Player1PR < mr.Player2PR, 0)
+                FROM MatchResults mr
+                LEFT JOIN (SELECT MatchTypeID, MIN(SeriesID) AS SeriesID
+                           FROM SeriesMatchTypes GROUP BY MatchTypeID) smt ON smt.MatchTypeID = mr.MatchTypeID
+                LEFT JOIN (SELECT SeriesID, MIN(SeasonID) AS SeasonID
+                           FROM SeasonSeries GROUP BY SeriesID) ss ON ss.SeriesID = smt.SeriesID
+                WHERE mr.MatchResultID NOT IN (SELECT MatchResultID FROM PlayerMatchFacts)
+                UNION ALL
+                SELECT mr.Player2ID, mr.Player1ID, mr.MatchResultID, mr.MatchTypeID,
+                       smt.SeriesID, ss.SeasonID, mr.Date,
+                       mr.Player2Points, mr.Player1Points, mr.Player2PR, mr.Player1PR, mr.Player2Luck,
+                       mr.Player2Points > mr.Player1Points,
+                       COALESCE(mr.Player2PR < mr.Player1PR, 0)
+                FROM MatchResults mr
+                LEFT JOIN (SELECT MatchTypeID, MIN(SeriesID) AS SeriesID
+                           FROM SeriesMatchTypes GROUP BY MatchTypeID) smt ON smt.MatchTypeID = mr.MatchTypeID
+                LEFT JOIN (SELECT SeriesID, MIN(SeasonID) AS SeasonID
+                           FROM SeasonSeries GROUP BY SeriesID) ss ON ss.SeriesID = smt.SeriesID
+                WHERE mr.MatchResultID NOT IN (SELECT MatchResultID FROM PlayerMatchFacts)
+            """),
+        ],
+    },
+    {
+        "version": 4,
+        "description": "DataVersion counters for the read cache",
+        "steps": [
+            run_sql("""
+                CREATE TABLE IF NOT EXISTS DataVersion (
+                    Scope VARCHAR(16) NOT NULL,
+                    ScopeID INT NOT NULL,
+                    Version BIGINT NOT NULL DEFAULT 0,
+                    UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+                    PRIMARY KEY (Scope, ScopeID)
+                )
+            """),
+        ],
+    },
+    {
+        "version": 5,
+        "description": "IngestionState: IMAP UID watermark per mailbox",
+        "steps": [
+            run_sql("""
+                CREATE TABLE IF NOT EXISTS IngestionState (
+                    Mailbox VARCHAR(255) NOT NULL PRIMARY KEY,
+                    UIDValidity BIGINT,
+                    LastUID BIGINT NOT NULL DEFAULT 0,
+                    UpdatedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+                )
+            """),
+        ],
+    },
+    {
+        "version": 6,
+        "description": "Idempotent ingestion: IngestedMessages and one result per fixture",
+        "steps": [
+            require_empty(
+                "SELECT FixtureID, COUNT(*) FROM MatchResults WHERE FixtureID IS NOT NULL "
+                "GROUP BY FixtureID HAVING COUNT(*) > 1",
+                "MatchResults has several results for the same FixtureID; delete the duplicates first"
+            ),
+            run_sql("""
+                CREATE TABLE IF NOT EXISTS IngestedMessages (
+                    IngestedMessageID INT PRIMARY KEY AUTO_INCREMENT,
+                    MessageID VARCHAR(255) NOT NULL,
+                    FixtureID INT NOT NULL,
+                    MatchResultID INT,
+                    Source VARCHAR(16),
+                    IngestedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    UNIQUE KEY uq_im_message_fixture (MessageID, FixtureID)
+                )
+            """),
+            add_index("MatchResults", "uq_mr_fixture", ["FixtureID"], unique=True),
+            # Superseded by uq_mr_fixture
+            drop_index("MatchResults", "idx_mr_fixture"),
+        ],
+    },
+    {
+        "version": 7,
+        "description": "FailedIngestions: dead letters for result emails",
+        "steps": [
+            run_sql("""
+                CREATE TABLE IF NOT EXISTS FailedIngestions (
+                    FailedIngestionID INT PRIMARY KEY AUTO_INCREMENT,
+                    MessageID VARCHAR(255) NOT NULL,
+                    Subject TEXT,
+                    ToAddress VARCHAR(255),
+                    Body MEDIUMTEXT,
+                    Reason VARCHAR(32) NOT NULL,
+                    Detail VARCHAR(512),
+                    Attempts INT NOT NULL DEFAULT 1,
+                    FirstFailedAt TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    LastFailedAt DATETIME,
+                    ResolvedAt DATETIME,
+                    UNIQUE KEY uq_fi_message (MessageID),
+                    KEY idx_fi_resolved_reason (ResolvedAt, Reason)
+                )
+            """),
+        ],
+    },
+    {
+        "version": 8,
+        "description": "RefreshQueue: debounced standings refreshes",
+        "steps": [
+            run_sql("""
+                CREATE TABLE IF NOT EXISTS RefreshQueue (
+                    Kind VARCHAR(16) NOT NULL,
+                    TargetID INT NOT NULL,
+                    FirstEnqueuedAt DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+                    LastEnqueuedAt DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+                    PRIMARY KEY (Kind, TargetID)
+                )
+            """),
+        ],
+    },
+    {
+        "version": 9,
+        "description": "Completed-match caches keyed by FixtureID for incremental writes",
+        "steps": [
+            add_index("MatchTypeCompletedCache", "idx_mtcc_fixture", ["FixtureID"]),
+            add_index("CompletedMatchesCache", "idx_cmc_fixture", ["FixtureID"]),
+            add_index("CompletedMatchesCache", "idx_cmc_matchtype", ["MatchTypeID"]),
+            # Rebuild once with the same rows the incremental writes produced at the time
+            # (frozen copy of database.completed_cache_insert_sql())
+            run_sql("DELETE FROM MatchTypeCompletedCache"),
+            run_sql("DELETE FROM CompletedMatchesCache"),
+            run_sql("""
+                INSERT INTO MatchTypeCompletedCache
+                    (MatchTypeID, FixtureID, Player1ID, Player2ID, Player1Name, Player2Name,
+                     Player1Points, Player2Points, Player1PR, Player2PR, Player1Luck, Player2Luck,
+                     Winner, Date, TimeCompleted, LastUpdated)
+                SELECT mr.MatchTypeID, mr.FixtureID, mr.Player1ID, mr.Player2ID, p1.Name, p2.Name,
+                       mr.Player1Points, mr.Player2Points, mr.Player1PR, mr.Player2PR,
+                       mr.Player1Luck, mr.Player2Luck,
+                       CASE WHEN mr.Player1Points > mr.Player2Points THEN p1.Name
+                            WHEN mr.Player2Points > mr.Player1Points THEN p2.Name
+                            ELSE 'Draw' END,
+                       mr.Date, mr.TimeCompleted, NOW()
+                FROM MatchResults mr
+                JOIN Players p1 ON p1.PlayerID = mr.Player1ID
+                JOIN Players p2 ON p2.PlayerID = mr.Player2ID
+                WHERE mr.FixtureID IS NOT NULL
+            """),
+            run_sql("""
+                INSERT INTO CompletedMatchesCache
+                    (SeriesID, MatchTypeID, FixtureID, Player1ID, Player2ID, Player1Name, Player2Name,
+                     Player1Points, Player2Points, Player1PR, Player2PR, Player1Luck, Player2Luck,
+                     Winner, Date, TimeCompleted, LastUpdated, MatchTypeTitle)
+                SELECT smt.SeriesID, mr.MatchTypeID, mr.FixtureID, mr.Player1ID, mr.Player2ID, p1.Name, p2.Name,
+                       mr.Player1Points, mr.Player2Points, mr.Player1PR, mr.Player2PR,
+                       mr.Player1Luck, mr.Player2Luck,
+                       CASE WHEN mr.Player1Points > mr.Player2Points THEN p1.Name
+                            WHEN mr.Player2Points > mr.Player1Points THEN p2.Name
+                            ELSE 'Draw' END,
+                       mr.Date, mr.TimeCompleted, NOW(), mt.MatchTypeTitle
+                FROM MatchResults mr
+                JOIN Players p1 ON p1.PlayerID = mr.Player1ID
+                JOIN Players p2 ON p2.PlayerID = mr.Player2ID
+                JOIN SeriesMatchTypes smt ON smt.MatchTypeID = mr.MatchTypeID
+                JOIN MatchType mt ON mt.MatchTypeID = mr.MatchTypeID
+                WHERE mr.FixtureID IS NOT NULL
+            """),
+        ],
+    },
+    {
+        "version": 10,
+        "description": "SeriesRemainingFixturesCache keyed by FixtureID",
+        "steps": [
+            add_column("SeriesRemainingFixturesCache", "FixtureID", "INT AFTER MatchTypeID"),
+            add_index("SeriesRemainingFixturesCache", "idx_srfc_fixture", ["FixtureID"]),
+            # Refill so every row carries its FixtureID (frozen copy of database.remaining_fixtures_insert_sql())
+            run_sql("DELETE FROM SeriesRemainingFixturesCache"),
+            run_sql("""
+                INSERT INTO SeriesRemainingFixturesCache
+                    (SeriesID, MatchTypeID, FixtureID, Player1Name, Player2Name, LastUpdated)
+                SELECT smt.SeriesID, f.MatchTypeID, f.FixtureID, p1.Name, p2.Name, NOW()
+                FROM Fixtures f
+                JOIN SeriesMatchTypes smt ON smt.MatchTypeID = f.MatchTypeID
+                JOIN Players p1 ON f.Player1ID = p1.PlayerID
+                JOIN Players p2 ON f.Player2ID = p2.PlayerID
+                WHERE f.Completed = 0
+            """),
+        ],
+    },
+    {
+        "version": 11,
+        "description": "Fixtures.RoundNumber from the circle-method scheduler",
+        "steps": [
+            add_column("Fixtures", "RoundNumber", "INT NULL"),
+        ],
+    },
+    {
+        "version": 12,
+        "description": "Series page settings (dates, rules, overview, tabs) for the series registry",
+        "steps": [
+            add_column("Series", "PageTitle", "VARCHAR(100) NULL"),
+            add_column("Series", "StartDate", "DATE NULL"),
+            add_column("Series", "EndDate", "DATE NULL"),
+            add_column("Series", "RulesUrl", "VARCHAR(255) NULL"),
+            add_column("Series", "RulesLabel", "VARCHAR(255) NULL"),
+            add_column("Series", "Overview", "TEXT NULL"),
+            add_column("Series", "PageLayout", "VARCHAR(20) NOT NULL DEFAULT 'leagues'"),
+            add_column("Series", "Listed", "TINYINT(1) NOT NULL DEFAULT 0"),
+            add_column("SeriesMatchTypes", "TabName", "VARCHAR(50) NULL"),
+            add_column("SeriesMatchTypes", "TabOrder", "INT NULL"),
+            add_column("SeriesMatchTypes", "ShowTab", "TINYINT(1) NOT NULL DEFAULT 1"),
+            # Series dates that SABGARRLive.py hard-coded, so the season labels ("2025") taken from
+            # EndDate are right before seed_series_pages.py runs. Only the year of the 2024 Sorting League is known.
+            *[run_sql("UPDATE Series SET StartDate = %s, EndDate = %s WHERE SeriesID = %s AND EndDate IS NULL",
+                      (start_date, end_date, series_id))
+              for series_id, start_date, end_date in [
+                  (4, None, "2024-12-31"),
+                  (5, "2025-01-11", "2025-04-01"),
+                  (6, "2025-04-02", "2025-06-30"),
+                  (7, "2025-07-02", "2025-09-30"),
+                  (8, "2025-10-02", "2025-12-31"),
+                  (10, "2026-01-11", "2026-04-02"),
+                  (11, "2026-04-03", "2026-06-23"),
+                  (12, "2026-06-24", "2026-09-13"),
+              ]],
+            # Page content is filled in from the admin page (or once with seed_series_pages.py).
+            # Drop cached registries read before the new columns existed
+            run_sql("UPDATE DataVersion SET Version = Version + 1 WHERE Scope = 'reference'"),
+        ],
+    },
+]
+
+# Representative hot queries, EXPLAINed before/after to show the effect of the indexes.
+# {match_type_id}, {series_id} and {player_id} are filled with sample IDs from the database.
+HOT_QUERIES = [
+    ("Results for a league by date",
+     "SELECT * FROM MatchResults WHERE MatchTypeID = {match_type_id} ORDER BY Date DESC"),
+    ("Player history (as Player1)",
+     "SELECT * FROM MatchResults WHERE Player1ID = {player_id} ORDER BY Date"),
+    ("Player history (as Player2)",
+     "SELECT * FROM MatchResults WHERE Player2ID = {player_id} ORDER BY Date"),
+    ("Remaining fixtures for a league",
+     "SELECT FixtureID FROM Fixtures WHERE MatchTypeID = {match_type_id} AND Completed = 0"),
+    ("H2H scan for a league",
+     "SELECT Player1ID, Player2ID, Player1Points, Player2Points FROM MatchResults WHERE MatchTypeID = {match_type_id}"),
+    ("Series standings",
+     "SELECT * FROM SeriesPlayerStats WHERE SeriesID = {series_id}"),
+    ("League completed matches",
+     "SELECT * FROM MatchTypeCompletedCache WHERE MatchTypeID = {match_type_id} ORDER BY Date DESC"),
+    ("Player history (facts)",
+     "SELECT * FROM PlayerMatchFacts WHERE PlayerID = {player_id} ORDER BY Date DESC"),
+]
+
+
+def ensure_version_table(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS SchemaVersion (
+            Version INT PRIMARY KEY,
+            Description VARCHAR(255),
+            AppliedAt DATETIME DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+
+def get_applied_versions(cursor):
+    ensure_version_table(cursor)
+    cursor.execute("SELECT Version FROM SchemaVersion")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def get_schema_version(cursor):
+    applied = get_applied_versions(cursor)
+    return max(applied) if applied else 0
+
+
+def _table_exists(cursor, table):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.tables
+        WHERE table_schema = DATABASE() AND table_name = %s
+    """, (table,))
+    return cursor.fetchone()[0] > 0
+
+
+def _index_exists(cursor, table, name):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.statistics
+        WHERE table_schema = DATABASE() AND table_name = %s AND index_name = %s
+    """, (table, name))
+    return cursor.fetchone()[0] > 0
+
+
+def _column_exists(cursor, table, name):
+    cursor.execute("""
+        SELECT COUNT(*) FROM information_schema.columns
+        WHERE table_schema = DATABASE() AND table_name = %s AND column_name = %s
+    """, (table, name))
+    return cursor.fetchone()[0] > 0
+
+
+def _step_sql(cursor, step):
+    """DDL for one step, or None if there is nothing to do (index or column already there, table missing)."""
+    if step["kind"] == "sql":
+        return step["statement"]
+
+    if not _table_exists(cursor, step["table"]):
+        return None
+    if step["kind"] == "add_column":
+        if _column_exists(cursor, step["table"], step["name"]):
+            return None
+        return f"ALTER TABLE {step['table']} ADD COLUMN {step['name']} {step['definition']}"
+    if step["kind"] == "drop_index":
+        if not _index_exists(cursor, step["table"], step["name"]):
+            return None
+        return f"DROP INDEX {step['name']} ON {step['table']}"
+    if _index_exists(cursor, step["table"], step["name"]):
+        return None
+    unique = "UNIQUE " if step["unique"] else ""
+    return f"CREATE {unique}INDEX {step['name']} ON {step['table']} ({', '.join(step['columns'])})"
+
+
+def _sample_ids(cursor):
+    cursor.execute("SELECT MAX(MatchTypeID) FROM MatchResults")
+    match_type_id = cursor.fetchone()[0] or 0
+    cursor.execute("SELECT MAX(SeriesID) FROM SeriesMatchTypes")
+    series_id = cursor.fetchone()[0] or 0
+    cursor.execute("SELECT MAX(Player1ID) FROM MatchResults")
+    player_id = cursor.fetchone()[0] or 0
+    return {"match_type_id": int(match_type_id), "series_id": int(series_id), "player_id": int(player_id)}
+
+
+def explain_hot_queries(cursor, log=print):
+    ids = _sample_ids(cursor)
+    for label, template in HOT_QUERIES:
+        sql = template.format(**ids)
+        try:
+            cursor.execute("EXPLAIN " + sql)
+            columns = cursor.column_names
+            plans = [dict(zip(columns, row)) for row in cursor.fetchall()]
+        except mysql.connector.Error as e:
+            log(f"  {label}: EXPLAIN failed ({e})")
+            continue
+        for plan in plans:
+            log(f"  {label}: table={plan.get('table')} type={plan.get('type')} "
+                f"key={plan.get('key')} rows={plan.get('rows')} extra={plan.get('Extra')}")
+
+
+def run_migrations(dry_run=False, explain=False, log=print):
+    """
+    Apply every migration newer than the recorded schema version.
+    dry_run prints the pending DDL (and current EXPLAIN plans) without changing anything.
+    explain prints EXPLAIN plans for the hot queries before and after applying.
+    Returns the list of versions applied (or that would be applied).
+    """
+    conn = create_connection()
+    cursor = conn.cursor()
+    try:
+        applied = get_applied_versions(cursor)
+        pending = [m for m in MIGRATIONS if m["version"] not in applied]
+        log(f"Schema version: {max(applied) if applied else 0}; {len(pending)} migration(s) pending.")
+
+        if dry_run or explain:
+            log("EXPLAIN before:")
+            explain_hot_queries(cursor, log)
+
+        for migration in pending:
+            log(f"Migration {migration['version']}: {migration['description']}")
+            for step in migration["steps"]:
+                if step["kind"] == "require_empty":
+                    cursor.execute(step["query"])
+                    rows = cursor.fetchall()
+                    if rows:
+                        raise RuntimeError(f"Migration {migration['version']} stopped: {step['message']} "
+                                           f"({len(rows)} found, e.g. {rows[:5]})")
+                    continue
+                sql = _step_sql(cursor, step)
+                if sql is None:
+                    log(f"  skip {step.get('name') or 'statement'} (already present or table missing)")
+                    continue
+                params = step.get("params")
+                log(f"  {sql}" + (f" {params}" if params else ""))
+                if not dry_run:
+                    cursor.execute(sql, params)
+
+            if not dry_run:
+                cursor.execute(
+                    "INSERT INTO SchemaVersion (Version, Description) VALUES (%s, %s)",
+                    (migration["version"], migration["description"])
+                )
+                conn.commit()
+
+        if explain and not dry_run:
+            log("EXPLAIN after:")
+            explain_hot_queries(cursor, log)
+        elif dry_run and pending:
+            log("Dry run: nothing applied. Run with --explain to apply and see the plans after.")
+
+        return [m["version"] for m in pending]
+
+    finally:
+        cursor.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    if "--backfill-facts" in sys.argv:
+        backfill_player_match_facts(full=True)
+    elif "--rebuild-completed" in sys.argv:
+        rebuild_completed_match_caches()
+    else:
+        run_migrations(dry_run="--dry-run" in sys.argv, explain="--explain" in sys.argv)
@@ -0,0 +1,68 @@
+"""
+Debounced standings refresh worker.
+
+Result writes (insert_match_result, the ingesters, edits, walkovers and red
+cards) enqueue their match types and series in RefreshQueue. This worker
+polls the queue and runs refresh_matchtype_stats and refresh_series_stats
+once per burst of writes (see process_refresh_queue in database.py). ingest_worker.py runs it in a
+background thread; it can also run on its own from the repository root:
+
+    python refresh_worker.py          # poll until interrupted
+    python refresh_worker.py --once   # run whatever is due now, then exit
+"""
+import argparse
+import threading
+import time
+from datetime import datetime
+
+from database import log_debug, process_refresh_queue, reset_data_versions
+
+# How often to look for due entries
+POLL_SECONDS = 5
+
+
+def log(message):
+    print(f"[{datetime.now():%Y-%m-%d %H:%M:%S}] {message}", flush=True)
+    log_debug(f"refresh_worker: {message}")
+
+
+def run_refresh_worker(stop=None, once=False):
+    """Process the refresh queue every POLL_SECONDS until stop (a threading.Event) is set."""
+    while not (stop and stop.is_set()):
+        try:
+            reset_data_versions()
+            ran = process_refresh_queue()
+            if ran:
+                log(f"🔄 Ran {ran} queued refresh(es).")
+        except Exception as e:
+            # Keep polling; failed refreshes stay in RefreshQueue and are retried on the next pass
+            log(f"❌ Refresh queue error: {e}")
+        if once:
+            return
+        if stop is None:
+            time.sleep(POLL_SECONDS)
+        else:
+            stop.wait(POLL_SECONDS)
+
+
+def start_refresh_thread(stop):
+    thread = threading.Thread(target=run_refresh_worker, args=(stop,), name="refresh-worker", daemon=True)
+    thread.start()
+    return thread
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run queued standings refreshes.")
+    parser.add_argument("--once", action="store_true", help="run the due refreshes and exit")
+    args = parser.parse_args(argv)
+
+    stop = threading.Event()
+    try:
+        run_refresh_worker(stop, once=args.once)
+    except KeyboardInterrupt:
+        stop.set()
+        log("👋 Stopped.")
+
+
+if __name__ == "__main__":
+    main()
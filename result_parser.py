@@ -0,0 +1,183 @@
+"""
+Parser for emailed match results.
+
+Turns a result email into a ParsedResult without touching the database or
+Streamlit, so the Streamlit page, ingest_worker.py and bench_parser.py all
+share one set of patterns. A result email looks like:
+
+    Subject: Admin: A league match was played between Nick (7 7 5.21 1.30) and Bob (3 7 8.04 -1.30)
+    To: matchresults+sort4@sabga.co.za
+
+Each bracket holds points, match length, PR and luck. The league identifier
+is the "+identifier@" part of the To address, or of the To: line quoted in
+the body when the email was forwarded.
+"""
+import email
+import hashlib
+import re
+from collections import namedtuple
+from email.header import decode_header, make_header
+from email.message import Message
+
+RESULT_SUBJECT = "Admin: A league match was played"
+
+# Failure reasons (ParseError.reason)
+REASON_NOT_A_RESULT = "not_a_result"
+REASON_NO_IDENTIFIER = "no_identifier"
+REASON_NO_MATCH_DATA = "no_match_data"
+REASON_BAD_STATS = "bad_stats"
+
+_PREFIX_RE = re.compile(r"^(?:(?:fwd?|fw|re)\s*:\s*)+", re.IGNORECASE)
+_IDENTIFIER_RE = re.compile(r"\+([\w.-]+)@")
+_FORWARDED_TO_RE = re.compile(r"^[>\s]*To:[^\n]*?\+([\w.-]+)@", re.IGNORECASE | re.MULTILINE)
+_MATCH_RE = re.compile(r"between\s+([^()]+?)\s*\(([^)]*)\)\s*and\s+([^()]+?)\s*\(([^)]*)\)")
+_NUMBER_RE = re.compile(r"^-?\d+(?:\.\d+)?$")
+
+
+class ParseError(ValueError):
+    def __init__(self, reason, detail):
+        super().__init__(f"{reason}: {detail}")
+        self.reason = reason
+        self.detail = detail
+
+
+class ParsedResult(namedtuple("ParsedResult", [
+    "message_id", "subject", "identifier",
+    "player1_nickname", "player1_points", "player1_length", "player1_pr", "player1_luck",
+    "player2_nickname", "player2_points", "player2_length", "player2_pr", "player2_luck",
+])):
+    __slots__ = ()
+
+    # Points are capped at the match length (a gammon in the last game can overshoot)
+    @property
+    def player1_score(self):
+        return min(self.player1_points, self.player1_length)
+
+    @property
+    def player2_score(self):
+        return min(self.player2_points, self.player2_length)
+
+    @property
+    def message_key(self):
+        """Dedup key: the Message-ID, or a digest of the league and subject for emails without one."""
+        return message_key(self.message_id, self.identifier, self.subject)
+
+
+# The parts of an email the parser needs, as stored in FailedIngestions for replay
+RawEmail = namedtuple("RawEmail", ["message_key", "subject", "to", "body"])
+
+
+def message_key(message_id, *parts):
+    """The Message-ID (trimmed to fit the key columns), or a digest of parts if there is none."""
+    if message_id and message_id.strip():
+        return message_id.strip()[:255]
+    digest = hashlib.sha1("|".join(p or "" for p in parts).encode("utf-8")).hexdigest()
+    return f"<sha1:{digest}>"
+
+
+def raw_email(subject, to, body, message_id=None):
+    subject, to, body = subject or "", to or "", body or ""
+    return RawEmail(message_key(message_id, subject, to, body), subject, to, body)
+
+
+def clean_subject(subject):
+    """Decode RFC 2047 words, unfold, and strip any Fwd:/Re: prefixes."""
+    if not subject:
+        return ""
+    if "=?" in subject:
+        subject = str(make_header(decode_header(subject)))
+    subject = " ".join(subject.split())
+    return _PREFIX_RE.sub("", subject)
+
+
+def find_identifier(to="", body=""):
+    """League identifier from the To address, else from a forwarded To: line in the body."""
+    match = _IDENTIFIER_RE.search(to or "")
+    if match is None and body:
+        match = _FORWARDED_TO_RE.search(body)
+    return match.group(1) if match else None
+
+
+def _number(text):
+    return float(text) if "." in text else int(text)
+
+
+def _parse_stats(nickname, text):
+    values = text.split()
+    if len(values) != 4 or not all(_NUMBER_RE.match(v) for v in values):
+        raise ParseError(REASON_BAD_STATS, f"expected 'points length PR luck' for {nickname}, got '{text}'")
+    points, length, pr, luck = values
+    return _number(points), _number(length), float(pr), float(luck)
+
+
+def parse_result(subject, body="", to="", message_id=None):
+    """Parse one result email from its subject, first text part and To header. Raises ParseError."""
+    cleaned = clean_subject(subject)
+    start = cleaned.find(RESULT_SUBJECT)
+    if start < 0:
+        raise ParseError(REASON_NOT_A_RESULT, cleaned or "(no subject)")
+
+    match = _MATCH_RE.search(cleaned, start + len(RESULT_SUBJECT))
+    if match is None:
+        raise ParseError(REASON_NO_MATCH_DATA, cleaned)
+
+    identifier = find_identifier(to, body)
+    if identifier is None:
+        raise ParseError(REASON_NO_IDENTIFIER, f"no '+identifier@' address in To ({to}) or body")
+
+    player1, stats1, player2, stats2 = match.groups()
+    return ParsedResult(
+        message_id, cleaned, identifier,
+        player1, *_parse_stats(player1, stats1),
+        player2, *_parse_stats(player2, stats2),
+    )
+
+
+def _first_text_part(msg):
+    part = next((p for p in msg.walk() if p.get_content_type() == "text/plain"), None)
+    if part is None:
+        return ""
+    payload = part.get_payload(decode=True) or b""
+    return payload.decode(part.get_content_charset() or "utf-8", errors="replace")
+
+
+def parse_message(message):
+    """
+    Parse a raw email (bytes or str), an email.message.Message, or a fetched message
+    with .headers and .body (mail_ingest.FetchedMessage). Raises ParseError.
+    """
+    if hasattr(message, "headers") and hasattr(message, "body"):
+        headers, body = message.headers, message.body
+    else:
+        if isinstance(message, bytes):
+            message = email.message_from_bytes(message)
+        elif isinstance(message, str):
+            message = email.message_from_string(message)
+        elif not isinstance(message, Message):
+            raise TypeError(f"Cannot parse {type(message).__name__} as an email")
+        headers, body = message, _first_text_part(message)
+
+    return parse_result(
+        headers["Subject"] or "", body,
+        to=str(headers["To"] or ""), message_id=headers["Message-ID"]
+    )
+
+
+def parse_raw(raw):
+    """Parse a RawEmail; the result's message_id is the RawEmail's key. Raises ParseError."""
+    return parse_result(raw.subject, raw.body, to=raw.to, message_id=raw.message_key)
+
+
+def parse_many(messages):
+    """
+    Parse a batch of messages. Returns (parsed, failed): the ParsedResults in input order,
+    and (message, ParseError) pairs for the rest.
+    """
+    parsed = []
+    failed = []
+    for message in messages:
+        try:
+            parsed.append(parse_message(message))
+        except ParseError as e:
+            failed.append((message, e))
+    return parsed, failed
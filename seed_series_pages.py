@@ -0,0 +1,95 @@
+"""
+One-off seed of the series page settings that SABGARRLive.py used to hard-code.
+
+Migration 12 adds the Series/SeriesMatchTypes page columns; this copies the
+pages of the series that existed then into them. New series are set up from
+the admin page instead. Safe to re-run: it overwrites the same rows.
+
+    python seed_series_pages.py
+"""
+from database import get_series_match_types, update_series_page, update_series_tabs
+
+RULES_2025_V4 = ("https://www.sabga.co.za/wp-content/uploads/2025/01/SABGA-Round-Robin-Leagues-2025-rules-etc-v4dot1.pdf",
+                 "SABGA Round Robin Leagues 2025 - rules etc v4.1.pdf")
+RULES_2025_V5 = ("https://www.sabga.co.za/wp-content/uploads/2025/07/SABGA-Round-Robin-Leagues-2025-rules-etc-v5dot2.pdf",
+                 "SABGA Round Robin Leagues 2025 - rules etc v5.2.pdf")
+RULES_2026_V1 = ("https://www.sabga.co.za/wp-content/uploads/2025/12/SABGA-Online-Backgammon-Round-Robin-Leagues-2026-rules-etc-v1.pdf",
+                 "SABGA Round Robin Leagues 2026 - rules etc v1.1.pdf")
+RULES_2026_V6 = ("https://www.sabga.co.za/wp-content/uploads/2026/03/SABGA-Round-Robin-Online-Leagues-2026-rules-etc-v6.1.pdf",
+                 "SABGA Round Robin Leagues 2026 - rules etc v6.1.pdf")
+
+LEAGUES_A_TO_F = ["A-League", "B-League", "C-League", "D-League", "E-League", "F-League"]
+
+# Page settings of the series that were hard-coded in SABGARRLive.py before migration 12:
+# (SeriesID, PageTitle, StartDate, EndDate, (RulesUrl, RulesLabel), Overview, PageLayout, [(TabName, MatchTypeID)])
+# The Sorting League's EndDate only carries its season's year (2024); the sorting page shows no dates.
+SERIES_PAGES = [
+    (4, "2024 - Sorting League", None, "2024-12-31", (None, None),
+     "Standings to sort players into Round Robin Leagues (A-F) for 2025 RR League: Series 1.",
+     "sorting",
+     [(f"Group {n}", mt_id) for n, mt_id in enumerate([4, 5, 6, 7, 8, 9, 10, 11, 12, 13, 15, 16, 17, 18, 25, 26], start=1)]),
+    (5, "2025 - Series 1", "2025-01-11", "2025-04-01", RULES_2025_V4,
+     "The 2025 Round Robin leagues kicked-off with Series 1, which ran 11 Jan 2025 - April 2025, with 64 players "
+     "competing in six leagues (A-F). The top four leagues have ten players each, with matches played to 11 points. "
+     "The bottom two leagues, E and F, have twelve players each, and play to 9 points.",
+     "leagues",
+     list(zip(LEAGUES_A_TO_F, [19, 20, 21, 23, 24, 28]))),
+    (6, "2025 - Series 2", "2025-04-02", "2025-06-30", RULES_2025_V5,
+     "The 2025 Round Robin leagues Series 2, took place 2 Apr 2025 - 30 June 2025, with 74 players competing in "
+     "eight leagues (A-G). The top four leagues had ten players each, with matches played to 11 points. The next two "
+     "leagues, E and F, had twelve players each, and played to 9 points. There were also two 'Guppy' groups for new players.",
+     "leagues",
+     list(zip(LEAGUES_A_TO_F + ["Guppy Group 1", "Guppy Group 2"], [30, 31, 32, 33, 34, 35, 36, 37]))),
+    (7, "2025 - Series 3", "2025-07-02", "2025-09-30", RULES_2025_V5,
+     "The 2025 Round Robin leagues continues with Series 3, taking place 2 July 2025 - 30 September 2025, with 74 "
+     "players competing in eight leagues (A-G). The top five leagues play matches to 11 points. The next two leagues, "
+     "E and F, play to 9 points. There are also two 'Guppy' groups for new players.",
+     "leagues",
+     list(zip(LEAGUES_A_TO_F + ["Guppy Group 1", "Guppy Group 2"], [39, 40, 41, 42, 44, 45, 46, 47]))),
+    (8, "2025 - Series 4", "2025-10-02", "2025-12-31", RULES_2025_V5,
+     "The 2025 Round Robin leagues continues with Series 4, taking place 2 October 2025 - 31 December 2025, with 74 "
+     "players competing in eight leagues (A-G). The top five leagues play matches to 11 points. The next two leagues, "
+     "E and F, play to 9 points. There are also two 'Guppy' groups for new players.",
+     "leagues",
+     list(zip(LEAGUES_A_TO_F + ["Guppy Group 1", "Guppy Group 2"], [48, 49, 50, 51, 52, 53, 54, 55]))),
+    (10, "2026 - Series 1", "2026-01-11", "2026-04-02", RULES_2026_V1,
+     "The 2026 Round Robin leagues kick off with Series 1, taking place 11 January 2026 - 2 April 2026, with 85 "
+     "players competing in nine league groups (A-F and 3 Guppy Groups). The top five leagues play matches to 11 points. "
+     "The next two leagues, E and F, play to 9 points. There are also three 'Guppy' groups for new players.",
+     "leagues",
+     list(zip(LEAGUES_A_TO_F + ["Guppy Group Yellow", "Guppy Group Blue", "Guppy Group Red"],
+              [56, 57, 58, 59, 60, 61, 62, 63, 64]))),
+    (11, "2026 - Series 2", "2026-04-03", "2026-06-23", RULES_2026_V6,
+     "The 2026 Round Robin leagues resumes with Series 2, taking place 3 April 2026 - 23 June 2026, with 96 players "
+     "competing across ten league groups (A-G and 3 Guppy Groups). The top five leagues play matches to 11 points. "
+     "The next three leagues, E, F and G play to 9 points. There are also three 'Guppy' groups for new players.",
+     "leagues",
+     list(zip(LEAGUES_A_TO_F + ["G-League", "Guppy Group Yellow", "Guppy Group Blue", "Guppy Group Red"],
+              [66, 67, 68, 69, 70, 71, 76, 72, 74, 73]))),
+    (12, "2026 - Series 3", "2026-06-24", "2026-09-13", RULES_2026_V6,
+     "The 2026 Round Robin leagues continues with Series 3, taking place 24 June 2026 - 13 Sept 2026, with 102 players "
+     "competing across ten league groups (A-G and 4 Guppy Groups). The top five leagues play matches to 11 points. "
+     "The next three leagues, E, F and G play to 9 points. There are also three 'Guppy' groups for new players.",
+     "leagues",
+     list(zip(LEAGUES_A_TO_F + ["G-League", "Guppy Group Yellow", "Guppy Group Blue", "Guppy Group Red", "Guppy Group Green"],
+              [78, 80, 81, 82, 83, 85, 86, 90, 87, 89, 75]))),
+]
+
+
+def seed_series_pages(log=print):
+    """Write SERIES_PAGES into Series and SeriesMatchTypes through the admin page's writers."""
+    for series_id, page_title, start_date, end_date, (rules_url, rules_label), overview, layout, tabs in SERIES_PAGES:
+        update_series_page(series_id, page_title, start_date, end_date, rules_url, rules_label, overview,
+                           layout=layout, listed=True)
+
+        tab_order = {match_type_id: (tab_name, order) for order, (tab_name, match_type_id) in enumerate(tabs, start=1)}
+        # Leagues linked to the series but never shown on its page stay hidden
+        update_series_tabs(series_id, [
+            (match_type_id, *tab_order.get(match_type_id, (None, None)), match_type_id in tab_order)
+            for match_type_id, _ in get_series_match_types(series_id)
+        ])
+        log(f"Series {series_id}: {page_title} ({len(tabs)} tabs)")
+
+
+if __name__ == "__main__":
+    seed_series_pages()
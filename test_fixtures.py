@@ -0,0 +1,52 @@
+"""
+Tests for the round-robin fixture schedule in database.py (no database connection is opened).
+Run with: python -m pytest test_fixtures.py
+"""
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+from database import _fixture_rows, circle_method_rounds
+
+LEAGUE_SIZES = range(2, 14)
+
+
+@pytest.mark.parametrize("n", LEAGUE_SIZES)
+def test_every_pairing_is_played_exactly_once(n):
+    players = list(range(101, 101 + n))
+    played = Counter(frozenset(pair) for pairs in circle_method_rounds(players) for pair in pairs)
+    assert set(played) == {frozenset(pair) for pair in combinations(players, 2)}
+    assert set(played.values()) == {1}
+
+
+@pytest.mark.parametrize("n", LEAGUE_SIZES)
+def test_nobody_plays_twice_in_a_round(n):
+    rounds = circle_method_rounds(range(1, n + 1))
+    assert len(rounds) == (n - 1 if n % 2 == 0 else n)
+    for pairs in rounds:
+        assert len(pairs) == n // 2
+        in_round = [player for pair in pairs for player in pair]
+        assert len(in_round) == len(set(in_round))
+
+
+@pytest.mark.parametrize("n", [size for size in LEAGUE_SIZES if size % 2])
+def test_odd_league_sits_each_player_out_once(n):
+    players = set(range(1, n + 1))
+    sitting_out = [players - {player for pair in pairs for player in pair} for pairs in circle_method_rounds(players)]
+    assert sorted(player for byes in sitting_out for player in byes) == sorted(players)
+
+
+@pytest.mark.parametrize("n", LEAGUE_SIZES)
+def test_player1_side_is_spread_evenly(n):
+    player1_counts = Counter(p1 for pairs in circle_method_rounds(range(1, n + 1)) for p1, _ in pairs)
+    counts = [player1_counts[player] for player in range(1, n + 1)]
+    assert max(counts) - min(counts) <= 1
+
+
+def test_fixture_rows_number_rounds_from_one():
+    rows = _fixture_rows(7, [1, 2, 3, 4])
+    assert len(rows) == 6
+    assert {row[0] for row in rows} == {7}
+    assert {row[3] for row in rows} == {0}
+    assert sorted({row[4] for row in rows}) == [1, 2, 3]
@@ -0,0 +1,95 @@
+"""
+Tests for result_parser.py, against the sample_emails/ corpus that bench_parser.py checks.
+Run with: python -m pytest test_result_parser.py
+"""
+import glob
+import json
+import os
+
+import pytest
+
+from result_parser import (
+    REASON_BAD_STATS, REASON_NO_IDENTIFIER, REASON_NO_MATCH_DATA, REASON_NOT_A_RESULT,
+    ParseError, clean_subject, find_identifier, message_key, parse_many, parse_message,
+    parse_raw, parse_result, raw_email,
+)
+
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "sample_emails")
+
+with open(os.path.join(CORPUS_DIR, "expected.json"), encoding="utf-8") as f:
+    EXPECTED = json.load(f)
+
+SUBJECT = "Admin: A league match was played between Nick (9 7 5.21 1.30) and Bob (3 7 8.04 -1.30)"
+TO = "results+sort4@sabga.co.za"
+
+
+def test_corpus_files_all_have_an_expected_result():
+    names = {os.path.basename(path) for path in glob.glob(os.path.join(CORPUS_DIR, "*.eml"))}
+    assert names == set(EXPECTED)
+
+
+@pytest.mark.parametrize("name", sorted(EXPECTED))
+def test_parse_message_matches_expected(name):
+    with open(os.path.join(CORPUS_DIR, name), "rb") as f:
+        raw = f.read()
+    try:
+        outcome = parse_message(raw)._asdict()
+    except ParseError as e:
+        outcome = {"error": e.reason}
+    assert outcome == EXPECTED[name]
+
+
+def test_parse_result_reads_both_players():
+    result = parse_result(SUBJECT, to=TO, message_id="<m1>")
+    assert result.identifier == "sort4"
+    assert (result.player1_nickname, result.player1_points, result.player1_length) == ("Nick", 9, 7)
+    assert (result.player1_pr, result.player1_luck) == (5.21, 1.3)
+    assert (result.player2_nickname, result.player2_points, result.player2_length) == ("Bob", 3, 7)
+    assert (result.player2_pr, result.player2_luck) == (8.04, -1.3)
+
+
+def test_score_is_capped_at_match_length():
+    result = parse_result(SUBJECT, to=TO)
+    assert result.player1_score == 7
+    assert result.player2_score == 3
+
+
+def test_prefixes_and_folding_are_stripped():
+    assert clean_subject("Fwd: RE:  " + SUBJECT.replace(" and ", "\n and ")) == SUBJECT
+
+
+def test_identifier_falls_back_to_forwarded_to_line():
+    body = "---------- Forwarded message ---------\n> To: results+guppy1@sabga.co.za\n"
+    assert find_identifier("admin@sabga.co.za", body) == "guppy1"
+    assert find_identifier("admin@sabga.co.za", "no address here") is None
+
+
+@pytest.mark.parametrize("subject, to, reason", [
+    ("Weekly newsletter", TO, REASON_NOT_A_RESULT),
+    ("Admin: A league match was played", TO, REASON_NO_MATCH_DATA),
+    (SUBJECT, "admin@sabga.co.za", REASON_NO_IDENTIFIER),
+    (SUBJECT.replace("(3 7 8.04 -1.30)", "(3 7 8.04)"), TO, REASON_BAD_STATS),
+])
+def test_parse_errors_carry_their_reason(subject, to, reason):
+    with pytest.raises(ParseError) as excinfo:
+        parse_result(subject, to=to)
+    assert excinfo.value.reason == reason
+
+
+def test_message_key_without_message_id_is_a_stable_digest():
+    assert message_key("  <m1>  ") == "<m1>"
+    assert message_key(None, "a", "b") == message_key("", "a", "b")
+    assert message_key(None, "a", "b") != message_key(None, "a", "c")
+
+
+def test_parse_raw_uses_the_stored_key():
+    raw = raw_email(SUBJECT, TO, "")
+    assert parse_raw(raw).message_key == raw.message_key
+
+
+def test_parse_many_keeps_input_order_and_failures():
+    good = f"Message-ID: <good>\nTo: {TO}\nSubject: {SUBJECT}\n\nbody\n"
+    bad = f"Message-ID: <bad>\nTo: {TO}\nSubject: Weekly newsletter\n\nbody\n"
+    parsed, failed = parse_many([good, bad, good])
+    assert [result.message_id for result in parsed] == ["<good>", "<good>"]
+    assert [(message, e.reason) for message, e in failed] == [(bad, REASON_NOT_A_RESULT)]
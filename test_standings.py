@@ -0,0 +1,138 @@
+"""
+Tests for the pure standings logic in database.py (no database connection is opened).
+Run with: python -m pytest test_standings.py
+"""
+from database import (
+    _apply_player_delta, aggregate_player_stats, match_result_deltas, resolve_all_h2h_clusters,
+    resolve_h2h_tiebreak, walkover_deltas,
+)
+
+
+def result(p1, p2, p1_pts, p2_pts, p1_pr=None, p2_pr=None, p1_luck=None, p2_luck=None):
+    return {
+        "Player1ID": p1, "Player2ID": p2,
+        "Player1Points": p1_pts, "Player2Points": p2_pts,
+        "Player1PR": p1_pr, "Player2PR": p2_pr,
+        "Player1Luck": p1_luck, "Player2Luck": p2_luck,
+    }
+
+
+def test_match_result_deltas_winner_with_better_pr():
+    deltas = match_result_deltas(result(1, 2, 7, 3, 4.5, 8.0, 1.2, -1.2))
+    assert deltas[1] == {"GamesPlayed": 1, "Wins": 1, "Losses": 0, "PRWins": 1, "Points": 3, "PR": 4.5, "Luck": 1.2}
+    assert deltas[2] == {"GamesPlayed": 1, "Wins": 0, "Losses": 1, "PRWins": 0, "Points": 0, "PR": 8.0, "Luck": -1.2}
+
+
+def test_match_result_deltas_loser_can_take_the_pr_point():
+    deltas = match_result_deltas(result(1, 2, 7, 5, 9.0, 6.0))
+    assert (deltas[1]["Points"], deltas[1]["PRWins"]) == (2, 0)
+    assert (deltas[2]["Points"], deltas[2]["PRWins"]) == (1, 1)
+
+
+def test_match_result_deltas_without_pr_awards_no_pr_point():
+    deltas = match_result_deltas(result(1, 2, 7, 5, 4.0, None))
+    assert deltas[1]["PRWins"] == 0
+    assert deltas[2]["PRWins"] == 0
+
+
+def test_match_result_deltas_draw_counts_neither_win_nor_loss():
+    deltas = match_result_deltas(result(1, 2, 5, 5, 6.0, 6.0))
+    for delta in deltas.values():
+        assert (delta["Wins"], delta["Losses"], delta["PRWins"], delta["Points"]) == (0, 0, 0, 0)
+
+
+def test_walkover_deltas():
+    deltas = walkover_deltas(1, 2)
+    assert deltas[1] == {"GamesPlayed": 1, "Wins": 0, "Losses": 0, "PRWins": 0, "Points": 2, "PR": None, "Luck": None}
+    assert deltas[2]["GamesPlayed"] == 1
+    assert deltas[2]["Points"] == 0
+
+
+def test_applying_and_removing_a_delta_restores_the_row():
+    row = {"GamesPlayed": 3, "Wins": 2, "Losses": 1, "PRWins": 1, "Points": 5}
+    delta = match_result_deltas(result(1, 2, 7, 3, 4.5, 8.0))[1]
+    _apply_player_delta(row, delta, 1)
+    assert row == {"GamesPlayed": 4, "Wins": 3, "Losses": 1, "PRWins": 2, "Points": 8}
+    _apply_player_delta(row, delta, -1)
+    assert row == {"GamesPlayed": 3, "Wins": 2, "Losses": 1, "PRWins": 1, "Points": 5}
+
+
+# H2H results are (Player1ID, Player2ID, Player1Points, Player2Points); a score is the number of
+# tied players finishing below that player
+def test_h2h_two_way_tie_goes_to_the_winner_of_their_match():
+    assert resolve_h2h_tiebreak([(1, 2, 3, 7)], [1, 2]) == {1: 0, 2: 1}
+
+
+def test_h2h_single_player_scores_zero():
+    assert resolve_h2h_tiebreak([], [1]) == {1: 0}
+
+
+def test_h2h_three_way_order():
+    results = [(1, 2, 7, 3), (1, 3, 7, 5), (2, 3, 7, 1)]
+    assert resolve_h2h_tiebreak(results, [3, 2, 1]) == {1: 2, 2: 1, 3: 0}
+
+
+def test_h2h_cycle_stays_level():
+    results = [(1, 2, 7, 3), (2, 3, 7, 3), (3, 1, 7, 3)]
+    assert resolve_h2h_tiebreak(results, [1, 2, 3]) == {1: 0, 2: 0, 3: 0}
+
+
+def test_h2h_level_groups_are_resolved_by_their_own_results():
+    # 1 and 2 have two wins each, 3 and 4 one each; within each pair only their own match counts
+    results = [(1, 3, 7, 0), (1, 4, 7, 0), (2, 1, 7, 0), (2, 4, 7, 0), (3, 2, 7, 0), (4, 3, 7, 0)]
+    assert resolve_h2h_tiebreak(results, [1, 2, 3, 4]) == {2: 3, 1: 2, 4: 1, 3: 0}
+
+
+def test_h2h_ignores_results_against_players_outside_the_tie():
+    results = [(1, 9, 0, 7), (2, 9, 0, 7), (9, 1, 7, 0), (1, 2, 7, 5)]
+    assert resolve_h2h_tiebreak(results, [1, 2]) == {1: 1, 2: 0}
+
+
+def test_h2h_draw_between_two_players_stays_level():
+    assert resolve_h2h_tiebreak([(1, 2, 5, 5)], [1, 2]) == {1: 0, 2: 0}
+
+
+def test_resolve_all_h2h_clusters_only_touches_tied_players():
+    stats = {
+        1: {"Points": 3, "Wins": 1, "PRWins": 1, "HeadToHeadScore": 0},
+        2: {"Points": 3, "Wins": 1, "PRWins": 1, "HeadToHeadScore": 0},
+        3: {"Points": 0, "Wins": 0, "PRWins": 0, "HeadToHeadScore": 0},
+    }
+    results = [(1, 3, 7, 0), (2, 1, 7, 0), (3, 2, 7, 0)]
+    assert resolve_all_h2h_clusters(stats, results) == 1
+    assert {pid: s["HeadToHeadScore"] for pid, s in stats.items()} == {1: 0, 2: 1, 3: 0}
+
+
+# aggregate_player_stats rows are (Player1ID, Player2ID, Player1Points, Player2Points,
+#                                  Player1PR, Player2PR, Player1Luck, Player2Luck)
+def test_aggregate_averages_are_weighted_by_games():
+    # One game at PR 2 in one league and three at PR 6 in another: 5, not the mean of league averages (4)
+    results = [(1, 2, 7, 3, 2.0, 9.0, 1.0, -1.0)] + [(1, 3, 7, 3, 6.0, 9.0, 0.0, 0.0)] * 3
+    stats = aggregate_player_stats([1, 2, 3], results)
+    assert stats[1]["AvgPR"] == 5.0
+    assert stats[1]["AvgLuck"] == 0.25
+    assert (stats[1]["GamesPlayed"], stats[1]["Wins"], stats[1]["PRWins"], stats[1]["Points"]) == (4, 4, 4, 12)
+    assert stats[1]["WinPct"] == 100
+
+
+def test_aggregate_skips_missing_pr_like_sql_avg():
+    results = [(1, 2, 7, 3, 4.0, 8.0, None, None), (1, 2, 3, 7, None, 5.0, None, None)]
+    stats = aggregate_player_stats([1, 2], results)
+    assert stats[1]["AvgPR"] == 4.0
+    assert stats[1]["AvgLuck"] is None
+    assert (stats[1]["PRWins"], stats[2]["PRWins"]) == (1, 0)
+    assert (stats[1]["Points"], stats[2]["Points"]) == (3, 2)
+
+
+def test_aggregate_walkovers_add_games_and_points_but_not_wins():
+    stats = aggregate_player_stats([1, 2], [(1, 2, 3, 7, 9.0, 5.0, 0, 0)], walkovers=[(1, 2)])
+    assert (stats[1]["GamesPlayed"], stats[1]["Wins"], stats[1]["Losses"], stats[1]["Points"]) == (2, 0, 1, 2)
+    assert (stats[2]["GamesPlayed"], stats[2]["Wins"], stats[2]["Losses"], stats[2]["Points"]) == (2, 1, 0, 3)
+    # WinPct is over played games only
+    assert stats[2]["WinPct"] == 100
+
+
+def test_aggregate_lists_players_without_games():
+    stats = aggregate_player_stats([1, 2, 3], [(1, 2, 7, 3, None, None, None, None)])
+    assert stats[3] == {"GamesPlayed": 0, "Wins": 0, "Losses": 0, "AvgPR": None, "AvgLuck": None,
+                        "PRWins": 0, "Points": 0, "WinPct": 0, "HeadToHeadScore": 0}